@@ -0,0 +1,362 @@
+"""
+Benchmarks for request signing, request preparation, response decoding and
+end-to-end throughput against the local stand-in server.
+
+Run with:
+
+    uv run python benchmarks/run.py --output benchmark-results.json
+
+and compare against an earlier run with `--compare old-results.json`.
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlencode
+
+import requests
+
+from wattmaven_solarnetwork_tools.core.authentication import (
+    Snws2Signer,
+    canonical_query_string,
+    generate_auth_header,
+    generate_canonical_request_message,
+    get_x_sn_date,
+    order_query_parameters,
+)
+from wattmaven_solarnetwork_tools.core.csv_stream import (
+    iter_csv_batches,
+    iter_csv_rows,
+)
+from wattmaven_solarnetwork_tools.core.retry import RetryPolicy
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+)
+from wattmaven_solarnetwork_tools.testing.stub_server import (
+    DATUM_LIST_PATH,
+    StubServer,
+    synthetic_datum,
+)
+
+PARAMETER_COUNTS = (1, 5, 20)
+CONCURRENCY_LEVELS = (1, 4, 16)
+PAGE_SIZE = 10_000
+
+DT = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+HEADERS = {
+    "accept": "application/json",
+    "host": "data.solarnetwork.net",
+    "x-sn-date": get_x_sn_date(DT),
+}
+
+
+def make_params(count: int) -> Dict[str, str]:
+    """Realistic datum query parameters, padded with extra filters."""
+    params = {
+        "nodeId": "123",
+        "sourceId": "/meter/*/**",
+        "startDate": "2025-01-01T00:00",
+        "endDate": "2025-02-01T00:00",
+        "aggregation": "Hour",
+        "max": "1000",
+        "offset": "0",
+    }
+    for i in range(len(params), count):
+        params[f"filter{i}"] = f"value {i}"
+    return dict(list(params.items())[:count])
+
+
+def measure(
+    name: str,
+    fn: Callable[[], Any],
+    params: Optional[Dict[str, Any]] = None,
+    min_time: float = 0.5,
+) -> Dict[str, Any]:
+    """
+    Time a function, repeating it until `min_time` seconds have passed.
+
+    Args:
+        name: The benchmark name.
+        fn: The function to time.
+        params: The benchmark parameters, recorded with the result.
+        min_time: The minimum total time to run for.
+
+    Returns:
+        The benchmark result.
+    """
+    fn()  # Warm up
+    timings = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time or len(timings) < 5:
+        t = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t)
+
+    mean = statistics.fmean(timings)
+    result = {
+        "name": name,
+        "params": params or {},
+        "iterations": len(timings),
+        "mean_us": mean * 1e6,
+        "median_us": statistics.median(timings) * 1e6,
+        "ops_per_sec": 1 / mean if mean else float("inf"),
+    }
+    print(f"{name:<40} {json.dumps(params or {}):<28} {result['mean_us']:>12.2f} us")
+    return result
+
+
+def bench_signing() -> List[Dict[str, Any]]:
+    results = []
+    signer = Snws2Signer("token", "secret")
+    for count in PARAMETER_COUNTS:
+        params = make_params(count)
+        query = urlencode(params)
+        p = {"parameters": count}
+        results.append(
+            measure(
+                "order_query_parameters",
+                lambda: order_query_parameters(query),
+                p,
+            )
+        )
+        results.append(
+            measure("canonical_query_string", lambda: canonical_query_string(params), p)
+        )
+        results.append(
+            measure(
+                "generate_canonical_request_message",
+                lambda: generate_canonical_request_message(
+                    "GET", DATUM_LIST_PATH, query, HEADERS, ""
+                ),
+                p,
+            )
+        )
+        results.append(
+            measure(
+                "generate_auth_header",
+                lambda: generate_auth_header(
+                    "token", "secret", "GET", DATUM_LIST_PATH, query, HEADERS, "", DT
+                ),
+                p,
+            )
+        )
+        results.append(
+            measure(
+                "Snws2Signer.sign",
+                lambda: signer.sign("GET", DATUM_LIST_PATH, params, HEADERS, None, DT),
+                p,
+            )
+        )
+    return results
+
+
+def bench_prepare_request() -> List[Dict[str, Any]]:
+    results = []
+    client = SolarNetworkClient(SolarNetworkCredentials("token", "secret"))
+    for count in PARAMETER_COUNTS:
+        params = make_params(count)
+        results.append(
+            measure(
+                "SolarNetworkClient._prepare_request",
+                lambda: client._prepare_request("GET", DATUM_LIST_PATH, params),
+                {"parameters": count},
+            )
+        )
+        results.append(
+            measure(
+                "SolarNetworkClient._prepare_request+prepare",
+                lambda: client._prepare_request(
+                    "GET", DATUM_LIST_PATH, params
+                ).prepare(),
+                {"parameters": count},
+            )
+        )
+    return results
+
+
+def bench_decoding() -> List[Dict[str, Any]]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    page = [
+        synthetic_datum(1, "/meter/1", start + timedelta(minutes=5 * i))
+        for i in range(PAGE_SIZE)
+    ]
+    json_body = json.dumps({"success": True, "data": {"results": page}}).encode()
+    csv_body = (
+        "created,nodeId,sourceId,localDate,localTime,watts,wattHours\r\n"
+        + "".join(
+            f"{d['created']},{d['nodeId']},{d['sourceId']},{d['localDate']},"
+            f"{d['localTime']},{d['watts']},{d['wattHours']}\r\n"
+            for d in page
+        )
+    ).encode()
+
+    def response(body: bytes) -> requests.Response:
+        r = requests.Response()
+        r.status_code = 200
+        r.raw = io.BytesIO(body)
+        return r
+
+    p = {"datum": PAGE_SIZE}
+    results = [
+        measure("json.loads", lambda: json.loads(json_body), p),
+        measure(
+            "csv rows", lambda: sum(1 for _ in iter_csv_rows(response(csv_body))), p
+        ),
+        measure(
+            "csv column batches",
+            lambda: list(iter_csv_batches(response(csv_body), batch_size=PAGE_SIZE)),
+            p,
+        ),
+    ]
+
+    try:
+        from wattmaven_solarnetwork_tools.core.datum_frame import DatumFrame
+    except ImportError:
+        return results
+
+    results.append(
+        measure(
+            "DatumFrame.from_records",
+            lambda: DatumFrame.from_records(json.loads(json_body)["data"]["results"]),
+            p,
+        )
+    )
+    results.append(
+        measure(
+            "DatumFrame.from_columns",
+            lambda: DatumFrame.from_columns(
+                next(iter_csv_batches(response(csv_body), batch_size=PAGE_SIZE))
+            ),
+            p,
+        )
+    )
+    return results
+
+
+def bench_end_to_end(requests_per_level: int) -> List[Dict[str, Any]]:
+    results = []
+    params = {
+        "nodeId": 1,
+        "startDate": "2025-01-01",
+        "endDate": "2025-01-02",
+        "max": 100,
+    }
+    with StubServer() as server:
+        for concurrency in CONCURRENCY_LEVELS:
+            with SolarNetworkClient(
+                server.credentials(), retry=RetryPolicy(max_retries=0)
+            ) as client:
+
+                def timed_request(_: int) -> float:
+                    t = time.perf_counter()
+                    client.request("GET", DATUM_LIST_PATH, params).json()
+                    return time.perf_counter() - t
+
+                timed_request(0)  # Warm up the connection pool
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                    latencies = sorted(
+                        executor.map(timed_request, range(requests_per_level))
+                    )
+                elapsed = time.perf_counter() - start
+
+            result = {
+                "name": "end_to_end",
+                "params": {"concurrency": concurrency, "requests": requests_per_level},
+                "requests_per_sec": requests_per_level / elapsed,
+                "p50_ms": latencies[len(latencies) // 2] * 1e3,
+                "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                * 1e3,
+                "connections_opened": client.pool_stats.connections_opened,
+            }
+            print(
+                f"{'end_to_end':<40} concurrency={concurrency:<16} "
+                f"{result['requests_per_sec']:>9.1f} req/s "
+                f"p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms"
+            )
+            results.append(result)
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    """Print the change of each result against a baseline run."""
+    with open(baseline_path) as f:
+        baseline = {
+            (r["name"], json.dumps(r["params"], sort_keys=True)): r
+            for r in json.load(f)["results"]
+        }
+
+    print(f"\nCompared to {baseline_path}:")
+    for result in results:
+        old = baseline.get(
+            (result["name"], json.dumps(result["params"], sort_keys=True))
+        )
+        if old is None:
+            continue
+        metric = "mean_us" if "mean_us" in result else "p50_ms"
+        change = (result[metric] - old[metric]) / old[metric] * 100
+        print(
+            f"{result['name']:<40} {json.dumps(result['params']):<28} "
+            f"{metric} {change:+.1f}%"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the benchmarks.")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="A previous results file to compare to")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument(
+        "--only",
+        choices=["signing", "prepare", "decoding", "end_to_end"],
+        action="append",
+    )
+    args = parser.parse_args(argv)
+
+    suites = {
+        "signing": bench_signing,
+        "prepare": bench_prepare_request,
+        "decoding": bench_decoding,
+        "end_to_end": lambda: bench_end_to_end(args.requests),
+    }
+    results = []
+    for name, suite in suites.items():
+        if not args.only or name in args.only:
+            results.extend(suite())
+
+    try:
+        package_version = version("wattmaven-solarnetwork-tools")
+    except PackageNotFoundError:
+        package_version = "unknown"
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "meta": {
+                    "version": package_version,
+                    "python": sys.version.split()[0],
+                    "platform": platform.platform(),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                },
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"\nWrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,491 @@
+"""
+Export datum from SolarNetwork as CSV, JSON lines or a columnar store.
+
+Credentials are read from the SOLARNETWORK_TOKEN and SOLARNETWORK_SECRET
+environment variables, and the API host from SOLARNETWORK_HOST (defaults to
+data.solarnetwork.net). For example:
+
+    solarnetwork-export --node-id 123 --source-id '/meter/*' \\
+        --start 2025-01-01 --end 2025-02-01 --output january.csv
+
+With `--progress`, the last completed time window is recorded, and running
+the same command again resumes from there, appending to the output after
+discarding any rows of an interrupted window.
+"""
+
+# Only the standard library and dependency-free modules are imported up front,
+# so `--help` and usage errors return immediately; the client and `requests`
+# are imported once there is something to export.
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import IO, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from wattmaven_solarnetwork_tools.core.instrumentation import RequestSpan
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "jsonl", "columnar")
+
+# The leading CSV columns; sample properties follow in name order.
+CSV_LEADING_COLUMNS = ["created", "nodeId", "sourceId", "localDate", "localTime"]
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r}") from None
+    # Query dates are UTC
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def _parse_node_ids(value: str) -> List[int]:
+    try:
+        return [int(n) for n in value.split(",") if n]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid node IDs: {value!r}") from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser.
+
+    Returns:
+        The parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="solarnetwork-export",
+        description=__doc__.strip().splitlines()[0],
+        epilog="\n".join(__doc__.strip().splitlines()[2:]),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    selectors = parser.add_argument_group("selectors")
+    selectors.add_argument(
+        "--node-id",
+        dest="node_ids",
+        type=_parse_node_ids,
+        action="append",
+        required=True,
+        help="node IDs to export, comma separated or repeated",
+    )
+    selectors.add_argument(
+        "--source-id",
+        dest="source_ids",
+        action="append",
+        help="source IDs or patterns to export, repeated (default: all sources)",
+    )
+    selectors.add_argument(
+        "--start", type=_parse_date, required=True, help="start date (inclusive)"
+    )
+    selectors.add_argument(
+        "--end", type=_parse_date, required=True, help="end date (exclusive)"
+    )
+    selectors.add_argument(
+        "--aggregation", help="aggregation, e.g. Hour or Day (default: none)"
+    )
+
+    output = parser.add_argument_group("output")
+    output.add_argument("--format", choices=FORMATS, default="csv")
+    output.add_argument(
+        "--output",
+        "-o",
+        default="-",
+        help="output file, or directory for columnar output (default: stdout)",
+    )
+    output.add_argument(
+        "--columns",
+        help="comma separated CSV columns (default: inferred from the first rows)",
+    )
+
+    tuning = parser.add_argument_group("tuning")
+    tuning.add_argument(
+        "--workers", type=int, default=4, help="time windows fetched concurrently"
+    )
+    tuning.add_argument(
+        "--window-days", type=float, default=7.0, help="size of each time window"
+    )
+    tuning.add_argument(
+        "--page-size", type=int, default=1000, help="datum requested per page"
+    )
+
+    progress = parser.add_argument_group("progress")
+    progress.add_argument(
+        "--progress", help="file recording the completed windows, to resume from"
+    )
+    progress.add_argument(
+        "--report-interval",
+        type=float,
+        default=10.0,
+        help="seconds between throughput reports, or 0 for a final report only",
+    )
+    progress.add_argument(
+        "--quiet", "-q", action="store_true", help="do not report throughput"
+    )
+
+    connection = parser.add_argument_group("connection")
+    connection.add_argument(
+        "--host",
+        default=os.environ.get("SOLARNETWORK_HOST", "data.solarnetwork.net"),
+        help="API host (default: $SOLARNETWORK_HOST or data.solarnetwork.net)",
+    )
+    connection.add_argument(
+        "--scheme",
+        choices=("https", "http"),
+        default="https",
+        help="use http only for a local stand-in server",
+    )
+    return parser
+
+
+class ProgressFile:
+    """
+    Records how far an export has completed, to resume it.
+
+    The file is replaced atomically, so an interrupted export leaves either the
+    previous or the new progress, never a partial file. Along with the end of
+    the last completed window, it records the size of a CSV or JSON lines
+    output file at that point, so rows of a window that was interrupted can be
+    truncated before resuming.
+    """
+
+    def __init__(self, path: str, selector: Dict[str, Any]):
+        """
+        Open the progress file.
+
+        Args:
+            path: The file path.
+            selector: Identifies the export; progress of a different export is
+                not resumed.
+
+        Raises:
+            ValueError: If the file records progress of a different export.
+        """
+        self.path = path
+        self.selector = selector
+        self.completed_until: Optional[datetime] = None
+        self.output_size: Optional[int] = None
+
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+
+        if state.get("selector") != selector:
+            raise ValueError(f"{path} records the progress of a different export")
+        self.completed_until = datetime.fromisoformat(state["completedUntil"])
+        self.output_size = state.get("outputSize")
+
+    def save(self, completed_until: datetime, output_size: Optional[int]) -> None:
+        """
+        Record that everything before a time has been exported.
+
+        Args:
+            completed_until: The end of the last completed window.
+            output_size: The size of the output file in bytes, or None if the
+                output is not a single file.
+        """
+        self.completed_until = completed_until
+        self.output_size = output_size
+        state = {
+            "selector": self.selector,
+            "completedUntil": completed_until.isoformat(),
+            "outputSize": output_size,
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary, self.path)
+
+
+class ThroughputReporter:
+    """Reports exported rows and received bytes per second, usable as a hook."""
+
+    def __init__(self, stream: IO[str], interval: float):
+        """
+        Initialize the reporter.
+
+        Args:
+            stream: Where to write the reports.
+            interval: Seconds between reports, or 0 for a final report only.
+        """
+        self.stream = stream
+        self.interval = interval
+        self.rows = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._last_report = self._start
+
+    def __call__(self, span: RequestSpan) -> None:
+        # Spans finish on the export worker threads
+        with self._lock:
+            self.bytes_received += span.bytes_received
+
+    def add_rows(self, count: int) -> None:
+        """
+        Count exported rows, and report if the interval has passed.
+
+        Args:
+            count: The number of rows.
+        """
+        self.rows += count
+        now = time.monotonic()
+        if self.interval and now - self._last_report >= self.interval:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> None:
+        """Write the throughput so far."""
+        elapsed = max(time.monotonic() - self._start, 1e-9)
+        self.stream.write(
+            f"{self.rows:,} rows, {self.bytes_received / 1e6:,.2f} MB in "
+            f"{elapsed:.1f}s ({self.rows / elapsed:,.0f} rows/s, "
+            f"{self.bytes_received / 1e6 / elapsed:,.2f} MB/s)\n"
+        )
+        self.stream.flush()
+
+
+def _csv_value(value: Any) -> Any:
+    return json.dumps(value) if isinstance(value, (list, dict)) else value
+
+
+class CsvWriter:
+    """Writes datum as CSV rows, with a fixed header."""
+
+    def __init__(self, file: IO[str], columns: Optional[List[str]], header: bool):
+        """
+        Initialize the writer.
+
+        Args:
+            file: The output file.
+            columns: The columns, or None to infer them from the first rows.
+            header: If True, write the header row first.
+        """
+        self.file = file
+        self.columns = columns
+        self.header = header
+        self._writer: Optional[csv.DictWriter] = None
+        self._dropped: Set[str] = set()
+
+    def write(self, datum: List[Dict[str, Any]]) -> None:
+        if not datum:
+            return
+        if self._writer is None:
+            if self.columns is None:
+                names = {key for d in datum for key in d}
+                leading = [c for c in CSV_LEADING_COLUMNS if c in names]
+                self.columns = leading + sorted(names - set(leading))
+            self._writer = csv.DictWriter(
+                self.file, self.columns, extrasaction="ignore"
+            )
+            if self.header:
+                self._writer.writeheader()
+
+        for d in datum:
+            extra = d.keys() - self._writer.fieldnames - self._dropped
+            if extra:
+                logger.warning("Dropping properties not in the CSV columns: %s", extra)
+                self._dropped.update(extra)
+            self._writer.writerow({k: _csv_value(v) for k, v in d.items()})
+
+    def flush(self) -> None:
+        self.file.flush()
+
+
+class JsonLinesWriter:
+    """Writes datum as JSON objects, one per line."""
+
+    def __init__(self, file: IO[str]):
+        self.file = file
+
+    def write(self, datum: List[Dict[str, Any]]) -> None:
+        self.file.writelines(json.dumps(d, separators=(",", ":")) + "\n" for d in datum)
+
+    def flush(self) -> None:
+        self.file.flush()
+
+
+class ColumnarWriter:
+    """
+    Appends datum to a `DatumStore`, one column file per sample property.
+
+    Datum at or before the last stored row of their stream are skipped, so a
+    window written again after an interruption is not duplicated.
+    """
+
+    def __init__(self, root: str):
+        from wattmaven_solarnetwork_tools.core.datum_store import DatumStore
+
+        self.store = DatumStore(root)
+
+    def write(self, datum: List[Dict[str, Any]]) -> None:
+        from wattmaven_solarnetwork_tools.core.records import parse_created
+
+        streams: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+        for d in datum:
+            streams.setdefault((d["nodeId"], d["sourceId"]), []).append(d)
+
+        for (node_id, source_id), rows in streams.items():
+            stored = self.store.query(node_id, source_id).timestamps
+            if len(stored):
+                rows = [d for d in rows if parse_created(d["created"]) > stored[-1]]
+            self.store.append_datum(node_id, source_id, rows)
+
+    def flush(self) -> None:
+        pass
+
+
+def _read_csv_header(path: str) -> Optional[List[str]]:
+    try:
+        with open(path, newline="") as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+
+def _truncate_output(output: IO[str], size: int) -> None:
+    # Drop the rows written after the last completed window
+    actual = os.fstat(output.fileno()).st_size
+    if actual < size:
+        raise ValueError(
+            f"{output.name} is shorter than its recorded progress; "
+            "remove the progress file to export again"
+        )
+    output.truncate(size)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the export command.
+
+    Args:
+        argv: The command line arguments, defaults to `sys.argv[1:]`.
+
+    Returns:
+        The exit status.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(format="%(levelname)s %(message)s", stream=sys.stderr)
+
+    token = os.environ.get("SOLARNETWORK_TOKEN")
+    secret = os.environ.get("SOLARNETWORK_SECRET")
+    if not token or not secret:
+        parser.error("SOLARNETWORK_TOKEN and SOLARNETWORK_SECRET must be set")
+    if args.start >= args.end:
+        parser.error("--start must be before --end")
+    if args.workers < 1 or args.page_size < 1 or args.window_days <= 0:
+        parser.error("--workers, --page-size and --window-days must be positive")
+    if args.format == "columnar" and args.output == "-":
+        parser.error("columnar output requires an --output directory")
+    if args.progress and args.output == "-":
+        # Rows already written to stdout can't be checked or truncated
+        parser.error("--progress requires an --output file")
+
+    node_ids = sorted({n for ids in args.node_ids for n in ids})
+    params: Dict[str, Any] = {"nodeIds": ",".join(map(str, node_ids))}
+    if args.source_ids:
+        params["sourceIds"] = ",".join(args.source_ids)
+    if args.aggregation:
+        params["aggregation"] = args.aggregation
+
+    start = args.start
+    progress = None
+    if args.progress:
+        selector = {
+            **params,
+            "start": args.start.isoformat(),
+            "end": args.end.isoformat(),
+            "format": args.format,
+        }
+        try:
+            progress = ProgressFile(args.progress, selector)
+        except ValueError as e:
+            parser.error(str(e))
+        if progress.completed_until is not None:
+            start = max(start, progress.completed_until)
+    resuming = start > args.start
+
+    if start >= args.end:
+        logger.info("Nothing to export; %s is complete", args.progress)
+        return 0
+
+    import requests
+
+    from wattmaven_solarnetwork_tools.core.exceptions import SolarNetworkError
+    from wattmaven_solarnetwork_tools.core.export import export_windows
+    from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+        SolarNetworkClient,
+        SolarNetworkCredentials,
+    )
+
+    reporter = ThroughputReporter(sys.stderr, 0 if args.quiet else args.report_interval)
+    credentials = SolarNetworkCredentials(
+        token=token, secret=secret, host=args.host, scheme=args.scheme
+    )
+
+    output: Optional[IO[str]] = None
+    if args.format == "columnar":
+        writer: Any = ColumnarWriter(args.output)
+    else:
+        if args.output == "-":
+            output = sys.stdout
+        else:
+            output = open(args.output, "a" if resuming else "w", newline="")
+            if resuming and progress.output_size is not None:
+                try:
+                    _truncate_output(output, progress.output_size)
+                except ValueError as e:
+                    output.close()
+                    parser.error(str(e))
+
+        if args.format == "csv":
+            columns = args.columns.split(",") if args.columns else None
+            existing = _read_csv_header(args.output) if resuming else None
+            writer = CsvWriter(output, existing or columns, header=existing is None)
+        else:
+            writer = JsonLinesWriter(output)
+
+    try:
+        with SolarNetworkClient(credentials, hooks=[reporter]) as client:
+            for _, window_end, datum in export_windows(
+                client,
+                params,
+                start,
+                args.end,
+                window=timedelta(days=args.window_days),
+                max_workers=args.workers,
+                page_size=args.page_size,
+            ):
+                writer.write(datum)
+                writer.flush()
+                if progress is not None:
+                    size = None if output is None else os.fstat(output.fileno()).st_size
+                    progress.save(window_end, size)
+                reporter.add_rows(len(datum))
+    except (SolarNetworkError, requests.RequestException) as e:
+        logger.error("Export failed: %s", e)
+        return 1
+    except BrokenPipeError:
+        # The reader went away, e.g. `| head`; silence the final flush of stdout
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+
+    if not args.quiet:
+        reporter.report()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
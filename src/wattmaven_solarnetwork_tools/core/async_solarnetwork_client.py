@@ -0,0 +1,209 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from wattmaven_solarnetwork_tools.core.authentication import (
+    Snws2Signer,
+    expand_query_parameters,
+)
+from wattmaven_solarnetwork_tools.core.coalescing import (
+    AsyncSingleFlight,
+    request_key,
+)
+from wattmaven_solarnetwork_tools.core.compression import accept_encoding
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    HTTPMethod,
+    SolarNetworkCredentials,
+    encode_body,
+    method_value,
+    response_json,
+    signed_headers,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depends on the installed extras
+    httpx = None
+
+
+@dataclass
+class RequestSpec:
+    """A single request to run with `AsyncSolarNetworkClient.gather`."""
+
+    method: Union[str, HTTPMethod]
+    path: str
+    params: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None
+    accept: Optional[str] = "application/json"
+
+
+class AsyncSolarNetworkClient:
+    """Asyncio client for interacting with the SolarNetwork API."""
+
+    def __init__(
+        self,
+        credentials: SolarNetworkCredentials,
+        max_in_flight: int = 100,
+        max_connections: int = 100,
+        max_keepalive_connections: Optional[int] = None,
+        timeout: Optional[float] = 30.0,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+        coalesce: bool = False,
+        compression: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initialize the asyncio SolarNetwork client.
+
+        Args:
+            credentials: SolarNetwork authentication credentials
+            max_in_flight: The maximum number of requests in flight at once
+            max_connections: The maximum number of pooled connections
+            max_keepalive_connections: The maximum number of idle keep-alive
+                connections, defaults to max_connections
+            timeout: The request timeout in seconds, or None for no timeout
+            transport: An optional httpx transport, e.g. for testing
+            coalesce: If True, concurrent identical `get_json` calls share one
+                request and its parsed result
+            compression: The response encodings to accept, in order of
+                preference, defaults to all supported encodings; an empty
+                sequence disables compression
+
+        Raises:
+            ImportError: If httpx is not installed.
+            ValueError: If max_in_flight is less than 1, or a compression
+                encoding is not supported.
+        """
+        if httpx is None:
+            raise ImportError(
+                "AsyncSolarNetworkClient requires httpx; install it with "
+                "`pip install wattmaven-solarnetwork-tools[async]`"
+            )
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.credentials = credentials
+        self.accept_encoding = accept_encoding(compression)
+        self._signer = Snws2Signer(credentials.token, credentials.secret)
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._flights = AsyncSingleFlight() if coalesce else None
+        self._client = httpx.AsyncClient(
+            base_url=credentials.base_url,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=(
+                    max_keepalive_connections
+                    if max_keepalive_connections is not None
+                    else max_connections
+                ),
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def request(
+        self,
+        method: Union[str, HTTPMethod],
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        accept: Optional[str] = "application/json",
+    ) -> "httpx.Response":
+        """
+        Make an authenticated request to the SolarNetwork API.
+
+        Args:
+            method: HTTP method
+            path: API endpoint path
+            params: Query parameters
+            data: Request body data
+            accept: Accept header value, defaults to application/json
+
+        Returns:
+            API response
+        """
+        method_str = method_value(method)
+        body = encode_body(data)
+
+        async with self._semaphore:
+            # Sign once a slot is free, so x-sn-date is close to the send time
+            headers = signed_headers(
+                self.credentials,
+                self._signer,
+                method_str,
+                path,
+                params,
+                body,
+                accept,
+                accept_encoding=self.accept_encoding,
+            )
+            return await self._client.request(
+                method_str,
+                path,
+                params=expand_query_parameters(params),
+                headers={k: v for k, v in headers.items() if v is not None},
+                content=body,
+            )
+
+    async def get_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Make an authenticated GET request and parse the JSON response.
+
+        When the client coalesces requests, concurrent callers of an identical
+        request (same path, parameters in any order) wait for one upstream call
+        and share its parsed result, which must then be treated as read-only.
+
+        Args:
+            path: API endpoint path
+            params: Query parameters
+
+        Returns:
+            The parsed response JSON
+
+        Raises:
+            SolarNetworkError: If the response is not successful.
+        """
+
+        async def fetch() -> Any:
+            return response_json(await self.request(HTTPMethod.GET, path, params))
+
+        if self._flights is None:
+            return await fetch()
+
+        key = request_key("GET", path, params, "application/json")
+        return await self._flights.do(key, fetch)
+
+    async def gather(
+        self, requests: Iterable[RequestSpec], return_exceptions: bool = False
+    ) -> List[Union["httpx.Response", BaseException]]:
+        """
+        Run many requests concurrently, bounded by max_in_flight.
+
+        Args:
+            requests: The requests to run
+            return_exceptions: If True, failed requests are returned as their
+                exception instead of raising the first failure
+
+        Returns:
+            The responses, in the same order as the requests
+        """
+        return await asyncio.gather(
+            *(
+                self.request(r.method, r.path, r.params, r.data, r.accept)
+                for r in requests
+            ),
+            return_exceptions=return_exceptions,
+        )
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
@@ -3,8 +3,13 @@
 import datetime
 import hashlib
 import hmac
+from collections.abc import Mapping
+from typing import Any, Optional, Union
 from urllib.parse import parse_qs, quote_plus, urlencode
 
+# The hex SHA-256 digest of an empty request body.
+EMPTY_BODY_DIGEST = hashlib.sha256(b"").hexdigest()
+
 
 def get_x_sn_date(dt: datetime.datetime) -> str:
     """
@@ -153,18 +158,88 @@ def generate_canonical_request_message(
     Returns:
         The canonical request message with ordered parameters
     """
-    output = ""
-    output += f"{method}\n{path}\n"
-    output += f"{order_query_parameters(parameters)}\n"
+    digest = hashlib.sha256(bytes(body, "latin-1")).hexdigest()
+    return _build_canonical_request_message(
+        method, path, order_query_parameters(parameters), signed_headers, digest
+    )
 
-    for k, v in sorted(signed_headers.items()):
-        output += f"{k}:{v}\n"
 
-    output += ";".join(sorted(signed_headers.keys())) + "\n"
+def _build_canonical_request_message(
+    method: str,
+    path: str,
+    ordered_parameters: str,
+    signed_headers: Mapping[str, str],
+    body_digest: str,
+) -> str:
+    """
+    Build the canonical request message from already-ordered parts.
 
-    digest = hashlib.sha256(bytes(body, "latin-1")).hexdigest()
-    output += digest
-    return output
+    Args:
+        method: The HTTP method
+        path: The request path
+        ordered_parameters: The query string, already ordered by key
+        signed_headers: Headers to include in signature
+        body_digest: The hex SHA-256 digest of the request body
+
+    Returns:
+        The canonical request message
+    """
+    names = sorted(signed_headers)
+    lines = [method, path, ordered_parameters]
+    lines.extend(f"{k}:{signed_headers[k]}" for k in names)
+    lines.append(";".join(names))
+    lines.append(body_digest)
+    return "\n".join(lines)
+
+
+def expand_query_parameters(
+    params: Optional[Mapping[str, Any]],
+) -> list[tuple[Any, Any]]:
+    """
+    Expand query parameters into (key, value) pairs, sorted by key.
+
+    Values are expanded the same way ``requests`` encodes them on the wire:
+    sequences become repeated keys and ``None`` values are dropped.
+
+    Args:
+        params: The query parameters, or None
+
+    Returns:
+        The expanded (key, value) pairs, sorted by key
+    """
+    if not params:
+        return []
+
+    pairs = []
+    for key in sorted(params, key=str):
+        value = params[key]
+        if isinstance(value, (str, bytes)) or not hasattr(value, "__iter__"):
+            value = (value,)
+        for v in value:
+            if v is not None:
+                pairs.append((key, v))
+
+    return pairs
+
+
+def canonical_query_string(params: Optional[Mapping[str, Any]]) -> str:
+    """
+    Build the ordered query string for structured query parameters.
+
+    This is equivalent to ``order_query_parameters(urlencode(params))`` but works
+    directly on the mapping, without a parse/encode round-trip.
+
+    Args:
+        params: The query parameters, or None
+
+    Returns:
+        An ordered query string with parameters sorted by key
+
+    Example:
+        >>> canonical_query_string({"foo": 1, "bar": [2, 3]})
+        'bar=2&bar=3&foo=1'
+    """
+    return urlencode(expand_query_parameters(params), safe="", quote_via=quote_plus)
 
 
 def generate_signature(message: bytes, key: bytes) -> str:
@@ -228,3 +303,86 @@ def generate_auth_header(
     output += f",Signature={sig}"
 
     return output
+
+
+class Snws2Signer:
+    """
+    Reusable SNWS2 request signer.
+
+    The derived signing key only depends on the secret and the UTC date, so it is
+    computed once per day and reused for every request signed on that day.
+    """
+
+    def __init__(self, token: str, secret: str):
+        """
+        Initialize the signer.
+
+        Args:
+            token: The token to sign requests with.
+            secret: The token secret.
+        """
+        self.token = token
+        self._secret = secret
+        # (year, month, day) -> signing key; only the current day is kept.
+        self._key_cache: Optional[tuple[tuple[int, int, int], bytes]] = None
+
+    def signing_key(self, dt: datetime.datetime) -> bytes:
+        """
+        Get the signing key for the given datetime, deriving it if the day changed.
+
+        Args:
+            dt: The (UTC) datetime of the request.
+
+        Returns:
+            The signing key.
+        """
+        day = (dt.year, dt.month, dt.day)
+        cached = self._key_cache
+        if cached is not None and cached[0] == day:
+            return cached[1]
+
+        key = generate_signing_key(self._secret, dt, "snws2_request")
+        self._key_cache = (day, key)
+        return key
+
+    def sign(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Mapping[str, Any]],
+        signed_headers: Mapping[str, str],
+        body: Union[bytes, str, None],
+        dt: datetime.datetime,
+    ) -> str:
+        """
+        Generate the authentication header for a request.
+
+        Args:
+            method: The HTTP method.
+            path: The request path.
+            params: The query parameters, as passed to the HTTP library.
+            signed_headers: Headers to include in signature.
+            body: The exact request body bytes (or None for no body).
+            dt: The datetime of the request, matching the x-sn-date header.
+
+        Returns:
+            The authentication header.
+        """
+        if body:
+            if isinstance(body, str):
+                body = bytes(body, "latin-1")
+            body_digest = hashlib.sha256(body).hexdigest()
+        else:
+            body_digest = EMPTY_BODY_DIGEST
+
+        canonical = _build_canonical_request_message(
+            method, path, canonical_query_string(params), signed_headers, body_digest
+        )
+        msg = generate_signing_message(dt, canonical)
+        sig = generate_signature(bytes(msg, "latin-1"), self.signing_key(dt))
+
+        return (
+            f"SNWS2 Credential={self.token},"
+            f"SignedHeaders={';'.join(sorted(signed_headers))},"
+            f"Signature={sig}"
+        )
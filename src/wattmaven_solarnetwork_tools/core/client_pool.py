@@ -0,0 +1,246 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import requests
+
+from wattmaven_solarnetwork_tools.core.connection_pool import (
+    PoolOptions,
+    PoolStats,
+    create_session,
+)
+from wattmaven_solarnetwork_tools.core.instrumentation import RequestHook
+from wattmaven_solarnetwork_tools.core.response_cache import ResponseCache
+from wattmaven_solarnetwork_tools.core.retry import AdaptiveRateLimiter, RetryPolicy
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    HTTPMethod,
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+)
+
+
+@dataclass
+class TenantLimits:
+    """Limits applied to each credential in a client pool, independently."""
+
+    # The maximum number of requests in flight, or None for no limit
+    max_in_flight: Optional[int] = 4
+    # The maximum requests per second, or None for no limit; the rate backs off
+    # when the tenant is throttled and recovers up to this limit
+    rate: Optional[float] = None
+    # The token bucket size, defaults to one second's worth of requests
+    burst: Optional[float] = None
+
+    def rate_limiter(self) -> Optional[AdaptiveRateLimiter]:
+        """
+        Create a rate limiter enforcing these limits.
+
+        Returns:
+            The rate limiter, or None if the rate is not limited
+        """
+        if self.rate is None:
+            return None
+        return AdaptiveRateLimiter(
+            rate=self.rate,
+            burst=self.burst,
+            min_rate=min(0.5, self.rate),
+            max_rate=self.rate,
+        )
+
+
+class SolarNetworkClientPool:
+    """
+    Clients for many credentials, sharing one session and connection pool.
+
+    Each credential is registered under an ID and gets a lightweight
+    `SolarNetworkClient` with its own signer, which caches the credential's
+    daily signing key, and its own concurrency and rate limits, so one busy
+    tenant can not starve the others. All clients send requests over a single
+    thread-safe session, which keeps one connection pool per host, so the
+    number of open sockets per host is bounded by `pool_maxsize` rather than
+    the number of tenants. The bound only holds with `pool_block=True`, the
+    default here; without it, a request finding every connection busy opens
+    an extra one and discards it afterwards.
+
+    Example:
+        >>> with SolarNetworkClientPool(limits=TenantLimits(rate=5)) as pool:
+        ...     pool.add("customer-1", credentials_1)
+        ...     pool.add("customer-2", credentials_2)
+        ...     nodes = pool.get_json("customer-1", "/solarquery/api/v1/sec/nodes")
+    """
+
+    def __init__(
+        self,
+        pool: Optional[PoolOptions] = None,
+        limits: Optional[TenantLimits] = None,
+        retry: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        hooks: Sequence[RequestHook] = (),
+    ):
+        """
+        Initialize the client pool.
+
+        Args:
+            pool: Connection pool and timeout settings, shared by all tenants,
+                defaults to `PoolOptions(pool_block=True)`, which caps the open
+                connections per host at `pool_maxsize`
+            limits: The default per-tenant limits, defaults to `TenantLimits()`
+            retry: The retry policy, defaults to `RetryPolicy()`
+            cache: An optional cache for queries of closed historical ranges,
+                keyed by token so tenants never see each other's responses
+            hooks: Receive a `RequestSpan` for each request of every tenant
+        """
+        self.pool = pool if pool is not None else PoolOptions(pool_block=True)
+        self.limits = limits if limits is not None else TenantLimits()
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.cache = cache
+        self.hooks = list(hooks)
+        self.pool_stats = PoolStats()
+        self._session = create_session(self.pool, self.pool_stats)
+        self._lock = threading.Lock()
+        self._clients: Dict[str, SolarNetworkClient] = {}
+
+    def add(
+        self,
+        credential_id: str,
+        credentials: SolarNetworkCredentials,
+        limits: Optional[TenantLimits] = None,
+    ) -> SolarNetworkClient:
+        """
+        Register a credential, replacing any registered under the same ID.
+
+        Args:
+            credential_id: The ID to route the credential's requests by
+            credentials: SolarNetwork authentication credentials
+            limits: The credential's limits, defaults to the pool's limits
+
+        Returns:
+            The credential's client
+        """
+        limits = limits if limits is not None else self.limits
+        client = SolarNetworkClient(
+            credentials,
+            cache=self.cache,
+            retry=self.retry,
+            rate_limiter=limits.rate_limiter(),
+            pool=self.pool,
+            hooks=self.hooks,
+            max_in_flight=limits.max_in_flight,
+            session=self._session,
+        )
+        with self._lock:
+            self._clients[credential_id] = client
+        return client
+
+    def remove(self, credential_id: str) -> None:
+        """
+        Unregister a credential.
+
+        Args:
+            credential_id: The credential ID
+
+        Raises:
+            KeyError: If no credential is registered under the ID.
+        """
+        with self._lock:
+            del self._clients[credential_id]
+
+    def client(self, credential_id: str) -> SolarNetworkClient:
+        """
+        Get the client of a registered credential.
+
+        Args:
+            credential_id: The credential ID
+
+        Returns:
+            The credential's client
+
+        Raises:
+            KeyError: If no credential is registered under the ID.
+        """
+        try:
+            return self._clients[credential_id]
+        except KeyError:
+            raise KeyError(f"Unknown credential ID: {credential_id!r}") from None
+
+    def credential_ids(self) -> List[str]:
+        """
+        List the registered credential IDs.
+
+        Returns:
+            The credential IDs
+        """
+        with self._lock:
+            return list(self._clients)
+
+    def request(
+        self,
+        credential_id: str,
+        method: Union[str, HTTPMethod],
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        accept: Optional[str] = "application/json",
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Make an authenticated request with a registered credential.
+
+        Args:
+            credential_id: The credential ID
+            method: HTTP method
+            path: API endpoint path
+            params: Query parameters
+            data: Request body data
+            accept: Accept header value, defaults to application/json
+            stream: If True, the body is not downloaded until it is read
+
+        Returns:
+            API response
+
+        Raises:
+            KeyError: If no credential is registered under the ID.
+        """
+        return self.client(credential_id).request(
+            method, path, params, data, accept, stream
+        )
+
+    def get_json(
+        self,
+        credential_id: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Make an authenticated GET request with a registered credential and parse
+        the JSON response.
+
+        Args:
+            credential_id: The credential ID
+            path: API endpoint path
+            params: Query parameters
+
+        Returns:
+            The parsed response JSON
+
+        Raises:
+            KeyError: If no credential is registered under the ID.
+            SolarNetworkError: If the response is not successful.
+        """
+        return self.client(credential_id).get_json(path, params)
+
+    def __contains__(self, credential_id: object) -> bool:
+        return credential_id in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def close(self) -> None:
+        """Close the shared session."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from wattmaven_solarnetwork_tools.core.authentication import canonical_query_string
+
+T = TypeVar("T")
+
+
+def request_key(
+    method: str,
+    path: str,
+    params: Optional[Mapping[str, Any]],
+    accept: Optional[str],
+) -> Tuple[str, str, str, Optional[str]]:
+    """
+    Get the key that identifies identical requests.
+
+    Args:
+        method: HTTP method name
+        path: API endpoint path
+        params: Query parameters, in any order
+        accept: Accept header value
+
+    Returns:
+        The request key
+    """
+    return (method, path, canonical_query_string(params), accept)
+
+
+class _Call:
+    """An in-flight call and, once done, its outcome."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls from threads into one.
+
+    While a call for a key is in flight, other callers with the same key wait
+    for it and share its result (or exception) instead of making their own.
+    Shared results must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run `fn`, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identifies identical calls.
+            fn: Makes the call.
+
+        Returns:
+            The call's result.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent identical calls from asyncio tasks into one.
+
+    The call runs in its own task, so cancelling any one caller does not
+    cancel the call for the others. Shared results must be treated as
+    read-only.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `fn`, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identifies identical calls.
+            fn: Makes the call.
+
+        Returns:
+            The call's result.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        return await asyncio.shield(call)
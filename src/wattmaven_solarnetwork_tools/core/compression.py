@@ -0,0 +1,61 @@
+from importlib.util import find_spec
+from typing import Optional, Sequence, Tuple
+
+# Response encodings that can always be decoded.
+STANDARD_ENCODINGS = ("gzip", "deflate")
+
+# Optional response encodings, and the modules that can decode them. Both
+# `requests` (via urllib3) and `httpx` decode these when the module is installed.
+OPTIONAL_ENCODINGS = {
+    "br": ("brotli", "brotlicffi"),
+    "zstd": ("zstandard",),
+}
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    """
+    Get the response encodings that can be decoded in this environment.
+
+    Returns:
+        The content codings, gzip and deflate first, then br and zstd if the
+        brotli and zstandard packages are installed
+    """
+    optional = tuple(
+        encoding
+        for encoding, modules in OPTIONAL_ENCODINGS.items()
+        if any(find_spec(module) is not None for module in modules)
+    )
+    return STANDARD_ENCODINGS + optional
+
+
+def accept_encoding(encodings: Optional[Sequence[str]] = None) -> str:
+    """
+    Build an Accept-Encoding header value.
+
+    Args:
+        encodings: The encodings to accept, in order of preference, or None for
+            all supported encodings; an empty sequence disables compression
+
+    Returns:
+        The header value
+
+    Raises:
+        ValueError: If an encoding can not be decoded in this environment.
+
+    Example:
+        >>> accept_encoding(["gzip"])
+        'gzip'
+        >>> accept_encoding([])
+        'identity'
+    """
+    supported = supported_encodings()
+    if encodings is None:
+        encodings = supported
+
+    unsupported = [e for e in encodings if e not in supported]
+    if unsupported:
+        raise ValueError(
+            f"Unsupported encodings {unsupported}; supported: {list(supported)}"
+        )
+
+    return ", ".join(encodings) if encodings else "identity"
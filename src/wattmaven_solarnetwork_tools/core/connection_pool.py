@@ -0,0 +1,156 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+@dataclass
+class PoolOptions:
+    """Connection pool and timeout settings for a client session."""
+
+    # The number of per-host pools to keep
+    pool_connections: int = 10
+    # The maximum number of connections kept per host
+    pool_maxsize: int = 10
+    # If True, wait for a free connection instead of opening a throwaway one
+    pool_block: bool = False
+    # Seconds to wait for a connection to be established, or None for no limit
+    connect_timeout: Optional[float] = 10.0
+    # Seconds to wait between bytes of the response, or None for no limit
+    read_timeout: Optional[float] = 60.0
+
+    @property
+    def timeout(self) -> Tuple[Optional[float], Optional[float]]:
+        """The (connect, read) timeout, as accepted by `requests`."""
+        return (self.connect_timeout, self.read_timeout)
+
+
+class PoolStats:
+    """Thread-safe counts of requests sent and connections opened."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._connections_opened = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._requests += 1
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self._connections_opened += 1
+
+    @property
+    def requests(self) -> int:
+        """The number of requests sent."""
+        return self._requests
+
+    @property
+    def connections_opened(self) -> int:
+        """The number of connections opened (including TLS handshakes)."""
+        return self._connections_opened
+
+    @property
+    def connections_reused(self) -> int:
+        """The number of requests sent over an already open connection."""
+        with self._lock:
+            return max(0, self._requests - self._connections_opened)
+
+    def __repr__(self) -> str:
+        return (
+            f"PoolStats(requests={self.requests}, "
+            f"connections_opened={self.connections_opened}, "
+            f"connections_reused={self.connections_reused})"
+        )
+
+
+# Per-thread listener of connections opened while sending a request.
+_listeners = threading.local()
+
+
+@contextmanager
+def observe_connections(listener: Callable[[float], None]) -> Iterator[None]:
+    """
+    Report connections opened by the current thread while in this context.
+
+    Args:
+        listener: Receives the seconds spent opening each new connection.
+    """
+    previous = getattr(_listeners, "listener", None)
+    _listeners.listener = listener
+    try:
+        yield
+    finally:
+        _listeners.listener = previous
+
+
+def _counting_pool(pool_cls: type, connection_cls: type, stats: PoolStats) -> type:
+    """Create a connection pool class that counts the connections it opens."""
+
+    class CountingConnection(connection_cls):
+        def connect(self) -> None:
+            stats.record_connection()
+            start = time.perf_counter()
+            super().connect()
+            listener = getattr(_listeners, "listener", None)
+            if listener is not None:
+                listener(time.perf_counter() - start)
+
+    return type(
+        f"Counting{pool_cls.__name__}",
+        (pool_cls,),
+        {"ConnectionCls": CountingConnection},
+    )
+
+
+class PoolAdapter(HTTPAdapter):
+    """An HTTP adapter that records connection pool statistics."""
+
+    def __init__(self, options: PoolOptions, stats: PoolStats):
+        self.stats = stats
+        super().__init__(
+            pool_connections=options.pool_connections,
+            pool_maxsize=options.pool_maxsize,
+            pool_block=options.pool_block,
+        )
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool(HTTPConnectionPool, HTTPConnection, self.stats),
+            "https": _counting_pool(HTTPSConnectionPool, HTTPSConnection, self.stats),
+        }
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any):
+        self.stats.record_request()
+        return super().send(request, *args, **kwargs)
+
+
+def create_session(options: PoolOptions, stats: PoolStats) -> requests.Session:
+    """
+    Create a session that is safe to share across threads.
+
+    The session's connection pool is sized by `options`, and cookies are never
+    stored, so sending requests does not mutate any shared session state.
+
+    Args:
+        options: The connection pool settings.
+        stats: Receives the connection pool statistics.
+
+    Returns:
+        The session.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = PoolAdapter(options, stats)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,125 @@
+import codecs
+import csv
+from typing import Dict, Iterator, List
+
+import requests
+
+from wattmaven_solarnetwork_tools.core.exceptions import SolarNetworkError
+
+# The default number of bytes to read from the response at a time.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_lines(
+    response: requests.Response, chunk_size: int, encoding: str
+) -> Iterator[str]:
+    """
+    Incrementally decode a streamed response body into lines.
+
+    Args:
+        response: A response requested with `stream=True`.
+        chunk_size: The number of bytes to read at a time.
+        encoding: The body text encoding.
+
+    Returns:
+        An iterator over the lines, including their line endings.
+
+    Raises:
+        SolarNetworkError: If the response is not successful.
+    """
+    if not response.ok:
+        response.close()
+        raise SolarNetworkError(
+            f"Request failed with status {response.status_code}",
+            response.status_code,
+        )
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    with response:
+        for chunk in response.iter_content(chunk_size):
+            pending += decoder.decode(chunk)
+            # The csv module joins quoted fields spanning lines back together
+            lines = pending.split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + "\n"
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def iter_csv_rows(
+    response: requests.Response,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[Dict[str, str]]:
+    """
+    Parse CSV rows from a streamed response as the body arrives.
+
+    Args:
+        response: A response requested with `stream=True`.
+        chunk_size: The number of bytes to read at a time.
+        encoding: The body text encoding.
+
+    Returns:
+        An iterator over the rows, keyed by the CSV header.
+
+    Raises:
+        SolarNetworkError: If the response is not successful.
+    """
+    return csv.DictReader(_iter_lines(response, chunk_size, encoding))
+
+
+def iter_csv_batches(
+    response: requests.Response,
+    batch_size: int = 10_000,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str = "utf-8",
+) -> Iterator[Dict[str, List[str]]]:
+    """
+    Parse a streamed CSV response into fixed-size column batches.
+
+    Each batch maps every CSV header to a list of at most `batch_size` values, so
+    memory stays flat however large the response is.
+
+    Args:
+        response: A response requested with `stream=True`.
+        batch_size: The number of rows per batch; the last batch may be shorter.
+        chunk_size: The number of bytes to read at a time.
+        encoding: The body text encoding.
+
+    Returns:
+        An iterator over the column batches.
+
+    Raises:
+        ValueError: If batch_size is less than 1.
+        SolarNetworkError: If the response is not successful.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    reader = csv.reader(_iter_lines(response, chunk_size, encoding))
+    header = next(reader, None)
+    if header is None:
+        return
+
+    batch: List[List[str]] = []
+    for row in reader:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield _to_columns(header, batch)
+            batch = []
+
+    if batch:
+        yield _to_columns(header, batch)
+
+
+def _to_columns(header: List[str], rows: List[List[str]]) -> Dict[str, List[str]]:
+    # Short rows are padded with empty values, as csv.DictReader does
+    width = len(header)
+    padded = (
+        row if len(row) == width else (row + [""] * width)[:width] for row in rows
+    )
+    return {name: list(column) for name, column in zip(header, zip(*padded))}
@@ -0,0 +1,426 @@
+import math
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on the installed extras
+    raise ImportError(
+        "DatumFrame requires numpy; install it with "
+        "`pip install wattmaven-solarnetwork-tools[numpy]`"
+    ) from e
+
+from wattmaven_solarnetwork_tools.core.pagination import DATUM_LIST_PATH
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import SolarNetworkClient
+
+# Datum members that are not sample properties.
+RESERVED_PROPERTIES = frozenset(
+    {"created", "nodeId", "sourceId", "localDate", "localTime", "tags", "timeZone"}
+)
+
+# A point in time accepted by `DatumFrame.between`.
+TimeLike = Union[datetime, np.datetime64, str]
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _parse_timestamps(values: Sequence[str]) -> np.ndarray:
+    """
+    Parse SolarNetwork UTC timestamps (e.g. `2025-01-01 00:00:00.000Z`).
+
+    Args:
+        values: The timestamp strings; empty strings become NaT.
+
+    Returns:
+        A datetime64[ms] array.
+    """
+    # numpy has no timezone support, so drop the UTC designator before parsing
+    return np.char.rstrip(np.asarray(values, dtype=str), "Z").astype("datetime64[ms]")
+
+
+def _to_datetime64(value: TimeLike) -> np.datetime64:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    if isinstance(value, str):
+        value = value.rstrip("Z")
+    return np.datetime64(value, "ms")
+
+
+class DatumFrame:
+    """
+    A columnar container of datum.
+
+    Timestamps are stored as a datetime64[ms] array, node IDs as an int64 array,
+    source IDs as int32 codes into a shared list of unique source IDs, and each
+    sample property as a float64 array (NaN where a datum has no value).
+    """
+
+    __slots__ = ("timestamps", "node_ids", "source_codes", "sources", "columns")
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        node_ids: np.ndarray,
+        source_codes: np.ndarray,
+        sources: Sequence[str],
+        columns: Mapping[str, np.ndarray],
+    ):
+        """
+        Initialize the frame.
+
+        Args:
+            timestamps: The datum timestamps, as datetime64[ms].
+            node_ids: The datum node IDs.
+            source_codes: The index of each datum's source ID in `sources`.
+            sources: The unique source IDs.
+            columns: The sample property values, keyed by property name.
+
+        Raises:
+            ValueError: If the arrays do not all have the same length.
+        """
+        n = len(timestamps)
+        if len(node_ids) != n or len(source_codes) != n:
+            raise ValueError("All arrays must have the same length")
+        for name, values in columns.items():
+            if len(values) != n:
+                raise ValueError(f"Column {name!r} must have length {n}")
+
+        self.timestamps = timestamps
+        self.node_ids = node_ids
+        self.source_codes = source_codes
+        self.sources = list(sources)
+        self.columns = dict(columns)
+
+    @classmethod
+    def empty(cls) -> "DatumFrame":
+        """Create an empty frame."""
+        return cls(
+            np.empty(0, dtype="datetime64[ms]"),
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int32),
+            [],
+            {},
+        )
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Mapping[str, Any]],
+        properties: Optional[Sequence[str]] = None,
+    ) -> "DatumFrame":
+        """
+        Decode `/datum/list` JSON results into a frame.
+
+        Args:
+            records: The datum, e.g. the `results` of a `/datum/list` page.
+            properties: The sample properties to keep, or None to keep every
+                property that has a numeric value.
+
+        Returns:
+            The frame.
+        """
+        records = records if isinstance(records, list) else list(records)
+        n = len(records)
+
+        if properties is None:
+            found: Dict[str, None] = {}
+            for record in records:
+                for key, value in record.items():
+                    if (
+                        key not in RESERVED_PROPERTIES
+                        and isinstance(value, (int, float))
+                        and not isinstance(value, bool)
+                    ):
+                        found[key] = None
+            properties = list(found)
+
+        sources: Dict[str, int] = {}
+        source_codes = np.fromiter(
+            (
+                sources.setdefault(r.get("sourceId") or "", len(sources))
+                for r in records
+            ),
+            dtype=np.int32,
+            count=n,
+        )
+
+        return cls(
+            _parse_timestamps([r.get("created") or "" for r in records]),
+            np.fromiter(
+                (r.get("nodeId", -1) for r in records), dtype=np.int64, count=n
+            ),
+            source_codes,
+            list(sources),
+            {
+                p: np.fromiter(
+                    (_to_float(r.get(p)) for r in records), dtype=np.float64, count=n
+                )
+                for p in properties
+            },
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        batch: Mapping[str, Sequence[str]],
+        properties: Optional[Sequence[str]] = None,
+    ) -> "DatumFrame":
+        """
+        Decode a CSV column batch (see `iter_csv_batches`) into a frame.
+
+        Args:
+            batch: The CSV values, keyed by CSV header.
+            properties: The sample properties to keep, or None to keep every
+                column that has at least one numeric value.
+
+        Returns:
+            The frame.
+        """
+        n = len(next(iter(batch.values()), ()))
+
+        sources: Dict[str, int] = {}
+        source_codes = np.fromiter(
+            (
+                sources.setdefault(s, len(sources))
+                for s in batch.get("sourceId", [""] * n)
+            ),
+            dtype=np.int32,
+            count=n,
+        )
+
+        node_ids = (
+            np.fromiter(
+                (int(v) if v else -1 for v in batch["nodeId"]), dtype=np.int64, count=n
+            )
+            if "nodeId" in batch
+            else np.full(n, -1, dtype=np.int64)
+        )
+
+        keep_numeric = properties is None
+        if properties is None:
+            properties = [k for k in batch if k not in RESERVED_PROPERTIES]
+
+        columns = {}
+        for p in properties:
+            values = batch.get(p)
+            if values is None:
+                column = np.full(n, math.nan)
+            else:
+                try:
+                    column = np.asarray(values, dtype=np.float64)
+                except ValueError:
+                    # Empty or text values; fall back to per-value parsing
+                    column = np.fromiter(
+                        (_to_float(v) for v in values), dtype=np.float64, count=n
+                    )
+            if keep_numeric and n and np.isnan(column).all():
+                continue
+            columns[p] = column
+
+        return cls(
+            _parse_timestamps(batch.get("created", [""] * n)),
+            node_ids,
+            source_codes,
+            list(sources),
+            columns,
+        )
+
+    @classmethod
+    def concat(cls, frames: Iterable["DatumFrame"]) -> "DatumFrame":
+        """
+        Concatenate frames, e.g. one per page, into a single frame.
+
+        Each array is copied once in bulk; properties missing from a frame are
+        filled with NaN.
+
+        Args:
+            frames: The frames to concatenate.
+
+        Returns:
+            The concatenated frame.
+        """
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return cls.empty()
+        if len(frames) == 1:
+            return frames[0]
+
+        sources: Dict[str, int] = {}
+        source_codes = []
+        for frame in frames:
+            # Remap each frame's source codes onto the merged source list
+            remap = np.array(
+                [sources.setdefault(s, len(sources)) for s in frame.sources],
+                dtype=np.int32,
+            )
+            source_codes.append(remap[frame.source_codes])
+
+        names: Dict[str, None] = {}
+        for frame in frames:
+            names.update(dict.fromkeys(frame.columns))
+
+        return cls(
+            np.concatenate([f.timestamps for f in frames]),
+            np.concatenate([f.node_ids for f in frames]),
+            np.concatenate(source_codes),
+            list(sources),
+            {
+                name: np.concatenate(
+                    [
+                        f.columns[name]
+                        if name in f.columns
+                        else np.full(len(f), math.nan)
+                        for f in frames
+                    ]
+                )
+                for name in names
+            },
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def source_ids(self) -> np.ndarray:
+        """The source ID of each datum."""
+        return np.asarray(self.sources, dtype=object)[self.source_codes]
+
+    def filter(self, mask: np.ndarray) -> "DatumFrame":
+        """
+        Select the datum where a boolean mask (or index array) applies.
+
+        Args:
+            mask: A boolean array of the frame's length, or an index array.
+
+        Returns:
+            The filtered frame.
+        """
+        return DatumFrame(
+            self.timestamps[mask],
+            self.node_ids[mask],
+            self.source_codes[mask],
+            self.sources,
+            {name: values[mask] for name, values in self.columns.items()},
+        )
+
+    def select(
+        self,
+        node_ids: Optional[Iterable[int]] = None,
+        source_ids: Optional[Iterable[str]] = None,
+    ) -> "DatumFrame":
+        """
+        Select the datum of the given nodes and/or sources.
+
+        Args:
+            node_ids: The node IDs to keep, or None for all.
+            source_ids: The source IDs to keep, or None for all.
+
+        Returns:
+            The filtered frame.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if node_ids is not None:
+            mask &= np.isin(self.node_ids, list(node_ids))
+        if source_ids is not None:
+            wanted = set(source_ids)
+            codes = [i for i, s in enumerate(self.sources) if s in wanted]
+            mask &= np.isin(self.source_codes, codes)
+        return self.filter(mask)
+
+    def between(
+        self, start: Optional[TimeLike] = None, end: Optional[TimeLike] = None
+    ) -> "DatumFrame":
+        """
+        Select the datum in a time range.
+
+        Args:
+            start: The start of the range (inclusive), or None for unbounded.
+            end: The end of the range (exclusive), or None for unbounded.
+
+        Returns:
+            The filtered frame.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.timestamps >= _to_datetime64(start)
+        if end is not None:
+            mask &= self.timestamps < _to_datetime64(end)
+        return self.filter(mask)
+
+    def sort(self) -> "DatumFrame":
+        """
+        Sort the datum by timestamp.
+
+        Returns:
+            The sorted frame.
+        """
+        return self.filter(np.argsort(self.timestamps, kind="stable"))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Convert the frame back to datum dictionaries, omitting NaN values.
+
+        Returns:
+            The datum.
+        """
+        created = np.datetime_as_string(self.timestamps, unit="ms")
+        records = []
+        for i in range(len(self)):
+            record: Dict[str, Any] = {
+                "created": created[i].replace("T", " ") + "Z",
+                "nodeId": int(self.node_ids[i]),
+                "sourceId": self.sources[self.source_codes[i]],
+            }
+            for name, values in self.columns.items():
+                if not math.isnan(values[i]):
+                    record[name] = float(values[i])
+            records.append(record)
+        return records
+
+
+def fetch_datum_frame(
+    client: SolarNetworkClient,
+    params: Dict[str, Any],
+    properties: Optional[Sequence[str]] = None,
+    page_size: int = 1000,
+    prefetch: int = 1,
+    path: str = DATUM_LIST_PATH,
+) -> DatumFrame:
+    """
+    Query datum straight into a frame, decoding each page as it arrives.
+
+    Args:
+        client: The client to query with.
+        params: Query parameters, excluding `max` and `offset`.
+        properties: The sample properties to keep, or None for all numeric ones.
+        page_size: The number of datum to request per page.
+        prefetch: The number of pages to fetch ahead, or 0 to disable.
+        path: API endpoint path, defaults to the datum list query.
+
+    Returns:
+        The frame.
+
+    Raises:
+        SolarNetworkError: If a page request is not successful.
+    """
+    return DatumFrame.concat(
+        DatumFrame.from_records(page, properties)
+        for page in client.iter_datum_pages(params, page_size, prefetch, path)
+    )
@@ -0,0 +1,439 @@
+import bisect
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, unquote
+
+from wattmaven_solarnetwork_tools.core.records import parse_created
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+_TIMESTAMPS_FILE = "timestamps.i64"
+_INDEX_FILE = "index.i64"
+_META_FILE = "meta.json"
+_LOCK_FILE = ".lock"
+_COLUMN_SUFFIX = ".f64"
+
+# Every column value is 8 bytes wide: int64 timestamps, float64 values.
+_WIDTH = 8
+
+# Datum members that are not sample properties.
+_RESERVED_PROPERTIES = frozenset(
+    {"created", "nodeId", "sourceId", "localDate", "localTime", "tags", "timeZone"}
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# A point in time: a datetime, or milliseconds since the epoch.
+TimeLike = Union[datetime, int]
+
+
+def to_epoch_ms(value: TimeLike) -> int:
+    """
+    Convert a point in time to milliseconds since the epoch.
+
+    Args:
+        value: A datetime (naive datetimes are taken as UTC) or epoch milliseconds.
+
+    Returns:
+        The milliseconds since the epoch.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        # Integer arithmetic, since float timestamps can round 1 ms low
+        return (value - _EPOCH) // timedelta(milliseconds=1)
+    return int(value)
+
+
+@dataclass
+class StreamSlice:
+    """
+    A time range of a stream.
+
+    The timestamps (int64 epoch milliseconds) and values (float64, NaN where a
+    datum has no value) are zero-copy memoryviews of the store's memory-mapped
+    files; `numpy.frombuffer` wraps them without copying.
+    """
+
+    timestamps: memoryview
+    columns: Dict[str, memoryview]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class _Mapping:
+    """A read-only memory map of a column file, remapped when the file grows."""
+
+    def __init__(self, path: str, fmt: str):
+        self.path = path
+        self.fmt = fmt
+        self.view: memoryview = memoryview(b"").cast("B").cast(fmt)
+
+    def rows(self, count: int) -> memoryview:
+        if len(self.view) < count:
+            with open(self.path, "rb") as f:
+                # Views already handed out keep the previous map alive
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(mapped).cast(self.fmt)
+        return self.view[:count]
+
+
+class _Stream:
+    """The files of one stream."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.timestamps = _Mapping(os.path.join(directory, _TIMESTAMPS_FILE), "q")
+        self.columns: Dict[str, _Mapping] = {}
+        self.index: List[Tuple[int, int]] = []
+        self.index_rows = -1
+
+    def column_path(self, name: str) -> str:
+        return os.path.join(self.directory, quote(name, safe="") + _COLUMN_SUFFIX)
+
+    def row_count(self) -> int:
+        try:
+            return os.path.getsize(self.timestamps.path) // _WIDTH
+        except FileNotFoundError:
+            return 0
+
+    def properties(self) -> List[str]:
+        try:
+            with open(os.path.join(self.directory, _META_FILE)) as f:
+                return json.load(f)["properties"]
+        except FileNotFoundError:
+            return []
+
+
+class DatumStore:
+    """
+    An append-only local store of datum, memory-mapped for fast range queries.
+
+    Each (nodeId, sourceId) stream is a directory of fixed-width column files:
+    int64 epoch-millisecond timestamps, and one float64 file per sample
+    property. A sparse index records the timestamp of every `index_interval`-th
+    row, so a range lookup is a binary search over the index, then over one
+    block of timestamps, followed by a zero-copy slice.
+
+    One writer may append to a stream while any number of readers (threads or
+    processes) query it. The column files are written first, then the list of
+    properties, then the timestamps file, so its size is the committed row
+    count and readers never see a partially written row or column.
+    """
+
+    def __init__(self, root: str, index_interval: int = 1024):
+        """
+        Open (or create) the store.
+
+        Args:
+            root: The store directory.
+            index_interval: The number of rows between sparse index entries.
+
+        Raises:
+            ValueError: If index_interval is less than 1.
+        """
+        if index_interval < 1:
+            raise ValueError("index_interval must be at least 1")
+
+        self.root = root
+        self.index_interval = index_interval
+        self._lock = threading.Lock()
+        self._streams: Dict[Tuple[int, str], _Stream] = {}
+        os.makedirs(root, exist_ok=True)
+
+    def _stream(self, node_id: int, source_id: str) -> _Stream:
+        key = (int(node_id), source_id)
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                directory = os.path.join(
+                    self.root, str(key[0]), quote(source_id, safe="")
+                )
+                stream = self._streams[key] = _Stream(directory)
+            return stream
+
+    def streams(self) -> List[Tuple[int, str]]:
+        """
+        List the stored streams.
+
+        Returns:
+            The (nodeId, sourceId) of each stream.
+        """
+        result = []
+        for node in sorted(os.listdir(self.root)):
+            node_dir = os.path.join(self.root, node)
+            if not node.isdigit() or not os.path.isdir(node_dir):
+                continue
+            for source in sorted(os.listdir(node_dir)):
+                if os.path.exists(os.path.join(node_dir, source, _TIMESTAMPS_FILE)):
+                    result.append((int(node), unquote(source)))
+        return result
+
+    def append(
+        self,
+        node_id: int,
+        source_id: str,
+        timestamps: Sequence[TimeLike],
+        columns: Mapping[str, Sequence[float]],
+    ) -> int:
+        """
+        Append rows to a stream.
+
+        Args:
+            node_id: The node ID.
+            source_id: The source ID.
+            timestamps: The row timestamps, in ascending order and not before
+                the last stored row.
+            columns: The row values per sample property; properties the stream
+                does not have yet are added, NaN-filled for earlier rows.
+
+        Returns:
+            The number of rows in the stream after the append.
+
+        Raises:
+            ValueError: If the rows are not in timestamp order, or a column
+                length does not match the number of timestamps.
+        """
+        stamps = array("q", (to_epoch_ms(t) for t in timestamps))
+        for name, values in columns.items():
+            if len(values) != len(stamps):
+                raise ValueError(f"Column {name!r} must have length {len(stamps)}")
+        if any(a > b for a, b in zip(stamps, stamps[1:])):
+            raise ValueError("Timestamps must be in ascending order")
+
+        stream = self._stream(node_id, source_id)
+        with stream.lock, self._write_lock(stream):
+            rows = stream.row_count()
+            if stamps and rows and stamps[0] < self._last_timestamp(stream, rows):
+                raise ValueError("Timestamps must not be before the last stored row")
+            if not stamps:
+                return rows
+
+            properties = stream.properties()
+            added = [name for name in columns if name not in properties]
+            properties.extend(added)
+
+            # Write the values before the timestamps, which commit the rows
+            for name in properties:
+                path = stream.column_path(name)
+                with open(path, "ab") as f:
+                    # Align the column with the committed rows: drop values left
+                    # by an interrupted append, and NaN-fill a new property
+                    written = f.tell() // _WIDTH
+                    if written > rows:
+                        f.truncate(rows * _WIDTH)
+                    elif written < rows:
+                        f.write((array("d", [math.nan]) * (rows - written)).tobytes())
+
+                    values = columns.get(name)
+                    block = (
+                        array("d", values)
+                        if values is not None
+                        else array("d", [math.nan]) * len(stamps)
+                    )
+                    f.write(block.tobytes())
+
+            # Publish new properties only once their columns cover every
+            # committed row, so a reader never maps a missing or short column
+            if added:
+                self._write_meta(stream, properties)
+
+            with open(stream.timestamps.path, "ab") as f:
+                # Drop any partial row left by an interrupted append
+                f.truncate(rows * _WIDTH)
+                f.write(stamps.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._append_index(stream, rows, stamps)
+            return rows + len(stamps)
+
+    def append_datum(
+        self, node_id: int, source_id: str, datum: Iterable[Mapping[str, Any]]
+    ) -> int:
+        """
+        Append `/datum/list` results to a stream.
+
+        Args:
+            node_id: The node ID.
+            source_id: The source ID.
+            datum: The datum, in ascending `created` order.
+
+        Returns:
+            The number of rows in the stream after the append.
+        """
+        datum = list(datum)
+        names: Dict[str, None] = {}
+        for d in datum:
+            for key, value in d.items():
+                if (
+                    key not in _RESERVED_PROPERTIES
+                    and isinstance(value, (int, float))
+                    and not isinstance(value, bool)
+                ):
+                    names[key] = None
+
+        return self.append(
+            node_id,
+            source_id,
+            [parse_created(d["created"]) for d in datum],
+            {name: [float(d.get(name, math.nan)) for d in datum] for name in names},
+        )
+
+    def query(
+        self,
+        node_id: int,
+        source_id: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+    ) -> StreamSlice:
+        """
+        Get the rows of a stream in a time range.
+
+        Args:
+            node_id: The node ID.
+            source_id: The source ID.
+            start: The start of the range (inclusive), or None for unbounded.
+            end: The end of the range (exclusive), or None for unbounded.
+
+        Returns:
+            The rows, as zero-copy views of the stream files.
+        """
+        stream = self._stream(node_id, source_id)
+        rows = stream.row_count()
+        if rows == 0:
+            return StreamSlice(memoryview(array("q")), {})
+
+        with stream.lock:
+            timestamps = stream.timestamps.rows(rows)
+            index = self._load_index(stream, rows)
+            columns = {}
+            for name in stream.properties():
+                mapping = stream.columns.get(name)
+                if mapping is None:
+                    mapping = stream.columns[name] = _Mapping(
+                        stream.column_path(name), "d"
+                    )
+                columns[name] = mapping.rows(rows)
+
+        lo = 0 if start is None else self._search(timestamps, index, to_epoch_ms(start))
+        hi = rows if end is None else self._search(timestamps, index, to_epoch_ms(end))
+
+        return StreamSlice(
+            timestamps[lo:hi], {name: view[lo:hi] for name, view in columns.items()}
+        )
+
+    def rebuild_index(self, node_id: int, source_id: str) -> int:
+        """
+        Rebuild the sparse index of a stream from its timestamps file.
+
+        Args:
+            node_id: The node ID.
+            source_id: The source ID.
+
+        Returns:
+            The number of index entries.
+        """
+        stream = self._stream(node_id, source_id)
+        with stream.lock, self._write_lock(stream):
+            rows = stream.row_count()
+            path = os.path.join(stream.directory, _INDEX_FILE)
+            entries = array("q")
+            if rows:
+                timestamps = stream.timestamps.rows(rows)
+                for row in range(0, rows, self.index_interval):
+                    entries.extend((timestamps[row], row))
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(entries.tobytes())
+            os.replace(tmp, path)
+            stream.index_rows = -1
+            return len(entries) // 2
+
+    def _search(
+        self, timestamps: memoryview, index: List[Tuple[int, int]], value: int
+    ) -> int:
+        # Narrow down to one index block, then search the timestamps within it
+        block = bisect.bisect_left(index, (value, -1))
+        lo = index[block - 1][1] if block > 0 else 0
+        hi = index[block][1] if block < len(index) else len(timestamps)
+        return bisect.bisect_left(timestamps, value, lo, hi)
+
+    def _load_index(self, stream: _Stream, rows: int) -> List[Tuple[int, int]]:
+        if stream.index_rows == rows:
+            return stream.index
+
+        path = os.path.join(stream.directory, _INDEX_FILE)
+        entries = array("q")
+        try:
+            with open(path, "rb") as f:
+                entries.frombytes(f.read())
+        except (FileNotFoundError, ValueError):
+            entries = array("q")
+
+        index = [
+            (entries[i], entries[i + 1])
+            for i in range(0, len(entries) - 1, 2)
+            # Ignore entries for rows that are not committed yet
+            if entries[i + 1] < rows
+        ]
+        stream.index = index
+        stream.index_rows = rows
+        return index
+
+    def _append_index(self, stream: _Stream, rows: int, stamps: array) -> None:
+        first = -rows % self.index_interval
+        entries = array("q")
+        for offset in range(first, len(stamps), self.index_interval):
+            entries.extend((stamps[offset], rows + offset))
+        if entries:
+            with open(os.path.join(stream.directory, _INDEX_FILE), "ab") as f:
+                f.write(entries.tobytes())
+
+    def _last_timestamp(self, stream: _Stream, rows: int) -> int:
+        with open(stream.timestamps.path, "rb") as f:
+            f.seek((rows - 1) * _WIDTH)
+            return struct.unpack("=q", f.read(_WIDTH))[0]
+
+    def _write_meta(self, stream: _Stream, properties: List[str]) -> None:
+        path = os.path.join(stream.directory, _META_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"properties": properties}, f)
+        os.replace(tmp, path)
+
+    def _write_lock(self, stream: _Stream) -> "_FileLock":
+        os.makedirs(stream.directory, exist_ok=True)
+        return _FileLock(os.path.join(stream.directory, _LOCK_FILE))
+
+
+class _FileLock:
+    """An exclusive advisory lock, so only one process writes a stream."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
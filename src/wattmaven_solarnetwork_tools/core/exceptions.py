@@ -0,0 +1,9 @@
+from typing import Optional
+
+
+class SolarNetworkError(Exception):
+    """Raised when the SolarNetwork API returns an unsuccessful response."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
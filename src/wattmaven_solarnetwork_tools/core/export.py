@@ -0,0 +1,223 @@
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, Iterator, List, Tuple
+
+import requests
+
+from wattmaven_solarnetwork_tools.core.records import parse_created
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkError,
+)
+
+logger = logging.getLogger(__name__)
+
+# The date format accepted by the startDate/endDate query parameters.
+QUERY_DATE_FORMAT = "%Y-%m-%dT%H:%M"
+
+
+def split_time_windows(
+    start_date: datetime, end_date: datetime, window: timedelta
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split a date range into consecutive sub-windows.
+
+    Args:
+        start_date: The start of the range (inclusive).
+        end_date: The end of the range (exclusive).
+        window: The size of each sub-window; the last one may be shorter.
+
+    Returns:
+        The (start, end) pairs of each sub-window, in order.
+
+    Raises:
+        ValueError: If the window is not positive.
+
+    Example:
+        >>> windows = split_time_windows(
+        ...     datetime(2025, 1, 1), datetime(2025, 1, 8), timedelta(days=3)
+        ... )
+        >>> [(s.day, e.day) for s, e in windows]
+        [(1, 4), (4, 7), (7, 8)]
+    """
+    if window <= timedelta(0):
+        raise ValueError("window must be positive")
+
+    windows = []
+    start = start_date
+    while start < end_date:
+        end = min(start + window, end_date)
+        windows.append((start, end))
+        start = end
+
+    return windows
+
+
+def _datum_timestamp(datum: Dict[str, Any]) -> int:
+    # Parsed, since "00:00:00Z" sorts after "00:00:00.500Z" as text
+    return parse_created(datum["created"])
+
+
+def export_windows(
+    client: SolarNetworkClient,
+    params: Dict[str, Any],
+    start_date: datetime,
+    end_date: datetime,
+    window: timedelta = timedelta(days=7),
+    max_workers: int = 4,
+    page_size: int = 1000,
+    retries: int = 2,
+    retry_delay: float = 1.0,
+) -> Iterator[Tuple[datetime, datetime, List[Dict[str, Any]]]]:
+    """
+    Export datum over a long date range by fetching sub-windows in parallel,
+    yielding each complete window in order.
+
+    Knowing where windows end lets a caller record its progress, and resume an
+    interrupted export from the first window it did not finish.
+
+    Args:
+        client: The client to query with.
+        params: Query parameters (e.g. nodeId, sourceId, aggregation), excluding
+            startDate, endDate, max and offset.
+        start_date: The start of the range (inclusive).
+        end_date: The end of the range (exclusive).
+        window: The size of each sub-window.
+        max_workers: The number of windows to fetch concurrently.
+        page_size: The number of datum to request per page.
+        retries: The number of times to retry a window that failed with a
+            transient error the client's retry policy does not cover, such as a
+            200 response with an unsuccessful envelope. Errors the client
+            already retried, and client errors (4xx) such as bad credentials,
+            are raised at once.
+        retry_delay: The delay before the first retry in seconds, doubled for
+            each following retry.
+
+    Returns:
+        An iterator over the (start, end, datum) of each window, in order, with
+        the datum of each window in timestamp order.
+
+    Raises:
+        ValueError: If max_workers is less than 1.
+        SolarNetworkError: If a window still fails after all retries.
+        requests.RequestException: If a window still fails after all retries.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    def fetch_window(
+        start: datetime, end: datetime
+    ) -> Tuple[datetime, datetime, List[Dict[str, Any]]]:
+        window_params = {
+            **params,
+            "startDate": start.strftime(QUERY_DATE_FORMAT),
+            "endDate": end.strftime(QUERY_DATE_FORMAT),
+        }
+        attempt = 0
+        while True:
+            try:
+                datum = list(
+                    client.iter_datum(window_params, page_size=page_size, prefetch=0)
+                )
+                # Windows are disjoint, so sorting each one orders the whole export
+                datum.sort(key=_datum_timestamp)
+                return start, end, datum
+            except (SolarNetworkError, requests.RequestException) as e:
+                # Only transient errors the client did not retry itself
+                if attempt >= retries or not client.retry.should_retry_again("GET", e):
+                    raise
+                delay = retry_delay * 2**attempt
+                attempt += 1
+                logger.warning(
+                    "Retrying window %s - %s in %.1fs (attempt %d): %s",
+                    window_params["startDate"],
+                    window_params["endDate"],
+                    delay,
+                    attempt,
+                    e,
+                )
+                time.sleep(delay)
+
+    windows = iter(split_time_windows(start_date, end_date, window))
+    pending: Deque[Future] = deque()
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="datum-export"
+    ) as executor:
+        try:
+            while True:
+                # Keep the pool busy, without fetching arbitrarily far ahead
+                while len(pending) < 2 * max_workers:
+                    next_window = next(windows, None)
+                    if next_window is None:
+                        break
+                    pending.append(executor.submit(fetch_window, *next_window))
+
+                if not pending:
+                    return
+
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def export_datum(
+    client: SolarNetworkClient,
+    params: Dict[str, Any],
+    start_date: datetime,
+    end_date: datetime,
+    window: timedelta = timedelta(days=7),
+    max_workers: int = 4,
+    page_size: int = 1000,
+    retries: int = 2,
+    retry_delay: float = 1.0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Export datum over a long date range by fetching sub-windows in parallel.
+
+    The range is split into sub-windows that are fetched concurrently on a thread
+    pool sharing the client's session. Datum are yielded in timestamp order, as if
+    they came from a single query. At most `2 * max_workers` windows are held in
+    memory at once.
+
+    Args:
+        client: The client to query with.
+        params: Query parameters (e.g. nodeId, sourceId, aggregation), excluding
+            startDate, endDate, max and offset.
+        start_date: The start of the range (inclusive).
+        end_date: The end of the range (exclusive).
+        window: The size of each sub-window.
+        max_workers: The number of windows to fetch concurrently.
+        page_size: The number of datum to request per page.
+        retries: The number of times to retry a window that failed with a
+            transient error the client's retry policy does not cover, such as a
+            200 response with an unsuccessful envelope. Errors the client
+            already retried, and client errors (4xx) such as bad credentials,
+            are raised at once.
+        retry_delay: The delay before the first retry in seconds, doubled for
+            each following retry.
+
+    Returns:
+        An iterator over the datum, in timestamp order.
+
+    Raises:
+        ValueError: If max_workers is less than 1.
+        SolarNetworkError: If a window still fails after all retries.
+        requests.RequestException: If a window still fails after all retries.
+    """
+    for _, _, datum in export_windows(
+        client,
+        params,
+        start_date,
+        end_date,
+        window,
+        max_workers,
+        page_size,
+        retries,
+        retry_delay,
+    ):
+        yield from datum
@@ -0,0 +1,244 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Default histogram buckets, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestSpan:
+    """
+    The timings and outcome of one client request, including its retries.
+
+    Phases are accumulated over all attempts, in seconds:
+
+    * `prepare`: building and signing the request
+    * `connect`: opening new connections (TCP and TLS)
+    * `send`: sending the request until the response headers arrive, which
+      includes `connect`
+    * `download`: reading the response body
+    * `parse`: decoding the response JSON, for methods that parse it
+    """
+
+    method: str
+    path: str
+    start: float = field(default_factory=time.perf_counter)
+    duration: float = 0.0
+    status_code: Optional[int] = None
+    attempts: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    connections_opened: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+    phases: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def retries(self) -> int:
+        """The number of retried attempts."""
+        return max(0, self.attempts - 1)
+
+    @property
+    def connection_reused(self) -> bool:
+        """True if the request was sent without opening a new connection."""
+        return self.attempts > 0 and self.connections_opened == 0
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        """
+        Add time spent in a phase.
+
+        Args:
+            name: The phase name.
+            seconds: The time spent.
+        """
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def record_connect(self, seconds: float) -> None:
+        """
+        Record a new connection being opened.
+
+        Args:
+            seconds: The time spent connecting.
+        """
+        self.connections_opened += 1
+        self.add_phase("connect", seconds)
+
+    def finish(self) -> None:
+        """Record the total duration."""
+        self.duration = time.perf_counter() - self.start
+
+
+# Receives each finished request span.
+RequestHook = Callable[[RequestSpan], None]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, buckets: int):
+        self.counts = [0] * buckets
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """
+    An in-memory registry of request metrics, usable as a client hook.
+
+    Metrics are labelled by endpoint path, and `render` returns them in the
+    Prometheus text exposition format.
+
+    Example:
+        >>> metrics = MetricsRegistry()
+        >>> client = SolarNetworkClient(credentials, hooks=[metrics])
+        >>> print(metrics.render())
+    """
+
+    def __init__(
+        self,
+        prefix: str = "solarnetwork_client",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            prefix: The metric name prefix.
+            buckets: The request duration histogram bucket bounds, in seconds.
+        """
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._durations: Dict[str, _Histogram] = {}
+        self._phases: Dict[Tuple[str, str], float] = {}
+        self._bytes_sent: Dict[str, int] = {}
+        self._bytes_received: Dict[str, int] = {}
+        self._retries: Dict[str, int] = {}
+        self._connections = {"opened": 0, "reused": 0}
+
+    def __call__(self, span: RequestSpan) -> None:
+        self.observe(span)
+
+    def observe(self, span: RequestSpan) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            span: The request span.
+        """
+        if span.error is not None:
+            status = "error"
+        elif span.cached:
+            status = "cached"
+        else:
+            status = str(span.status_code)
+
+        with self._lock:
+            key = (span.method, span.path, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+            histogram = self._durations.get(span.path)
+            if histogram is None:
+                histogram = self._durations[span.path] = _Histogram(len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    histogram.counts[i] += 1
+            histogram.sum += span.duration
+            histogram.count += 1
+
+            for phase, seconds in span.phases.items():
+                key = (span.path, phase)
+                self._phases[key] = self._phases.get(key, 0.0) + seconds
+
+            self._add(self._bytes_sent, span.path, span.bytes_sent)
+            self._add(self._bytes_received, span.path, span.bytes_received)
+            self._add(self._retries, span.path, span.retries)
+            if span.attempts:
+                self._connections["opened"] += span.connections_opened
+                self._connections["reused"] += int(span.connection_reused)
+
+    @staticmethod
+    def _add(counter: Dict[str, int], key: str, value: int) -> None:
+        counter[key] = counter.get(key, 0) + value
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            The metrics text.
+        """
+        p = self.prefix
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help: str) -> None:
+            lines.append(f"# HELP {p}_{name} {help}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+
+        with self._lock:
+            metric("requests_total", "counter", "Requests made, by status.")
+            for (method, path, status), count in sorted(self._requests.items()):
+                labels = _labels(method=method, path=path, status=status)
+                lines.append(f"{p}_requests_total{{{labels}}} {count}")
+
+            metric(
+                "request_duration_seconds", "histogram", "Request duration, by path."
+            )
+            for path, h in sorted(self._durations.items()):
+                for bound, count in zip(self.buckets, h.counts):
+                    labels = _labels(path=path, le=repr(float(bound)))
+                    lines.append(
+                        f"{p}_request_duration_seconds_bucket{{{labels}}} {count}"
+                    )
+                labels = _labels(path=path, le="+Inf")
+                lines.append(
+                    f"{p}_request_duration_seconds_bucket{{{labels}}} {h.count}"
+                )
+                labels = _labels(path=path)
+                lines.append(f"{p}_request_duration_seconds_sum{{{labels}}} {h.sum}")
+                lines.append(
+                    f"{p}_request_duration_seconds_count{{{labels}}} {h.count}"
+                )
+
+            metric(
+                "request_phase_seconds_total",
+                "counter",
+                "Time spent in each request phase, by path.",
+            )
+            for (path, phase), seconds in sorted(self._phases.items()):
+                labels = _labels(path=path, phase=phase)
+                lines.append(f"{p}_request_phase_seconds_total{{{labels}}} {seconds}")
+
+            for name, counter, help in (
+                ("request_bytes_total", self._bytes_sent, "Request body bytes sent."),
+                (
+                    "response_bytes_total",
+                    self._bytes_received,
+                    "Response bytes received.",
+                ),
+                ("retries_total", self._retries, "Retried request attempts."),
+            ):
+                metric(name, "counter", f"{help[:-1]}, by path.")
+                for path, value in sorted(counter.items()):
+                    lines.append(f"{p}_{name}{{{_labels(path=path)}}} {value}")
+
+            metric(
+                "connections_total",
+                "counter",
+                "Connections opened, and requests sent over a reused connection.",
+            )
+            for state, value in sorted(self._connections.items()):
+                lines.append(f"{p}_connections_total{{{_labels(state=state)}}} {value}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,75 @@
+import json
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the installed extras
+    msgspec = None
+
+# Decodes a JSON document from bytes into plain Python objects, raising
+# ValueError if it is invalid. Datum pages are converted into records after
+# decoding (see `records.decode_datum`), as their sample properties vary.
+JsonDecoder = Callable[[bytes], Any]
+
+# The decoder names, fastest first.
+JSON_DECODERS = ("orjson", "msgspec", "json")
+
+
+def _msgspec_decoder() -> JsonDecoder:
+    decoder = msgspec.json.Decoder()
+
+    def decode(payload: bytes) -> Any:
+        try:
+            return decoder.decode(payload)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return decode
+
+
+def get_json_decoder(name: Optional[str] = None) -> JsonDecoder:
+    """
+    Get a JSON decoder by name.
+
+    Args:
+        name: One of `JSON_DECODERS`, or None for the fastest installed one;
+            the stdlib `json` decoder is always available
+
+    Returns:
+        The decoder
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the named decoder is not installed.
+    """
+    if name is None:
+        if orjson is not None:
+            name = "orjson"
+        elif msgspec is not None:
+            name = "msgspec"
+        else:
+            name = "json"
+
+    if name == "orjson":
+        if orjson is None:
+            raise ImportError(
+                "The orjson decoder requires orjson; install it with "
+                "`pip install wattmaven-solarnetwork-tools[fast-json]`"
+            )
+        return orjson.loads
+    if name == "msgspec":
+        if msgspec is None:
+            raise ImportError(
+                "The msgspec decoder requires msgspec; install it with "
+                "`pip install wattmaven-solarnetwork-tools[fast-json]`"
+            )
+        return _msgspec_decoder()
+    if name == "json":
+        return json.loads
+
+    raise ValueError(f"Unknown JSON decoder {name!r}; expected one of {JSON_DECODERS}")
@@ -0,0 +1,245 @@
+import heapq
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from wattmaven_solarnetwork_tools.core.records import parse_created
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import SolarNetworkClient
+from wattmaven_solarnetwork_tools.core.sync import StreamKey
+
+T = TypeVar("T")
+
+_END = object()
+
+
+def datum_timestamp(datum: Dict[str, Any]) -> int:
+    """
+    Get the merge key of a datum.
+
+    The `created` timestamp is parsed rather than compared as text, since
+    whole-second timestamps may have no fraction, and "00:00:00Z" would sort
+    after "00:00:00.500Z".
+
+    Args:
+        datum: The datum.
+
+    Returns:
+        Its `created` timestamp, in milliseconds since the epoch.
+
+    Raises:
+        KeyError: If the datum has no `created` timestamp.
+        ValueError: If the timestamp is malformed.
+    """
+    return parse_created(datum["created"])
+
+
+class _Failure:
+    """Carries a page fetch exception to the merge."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class _StreamReader:
+    """
+    Fetches the pages of one stream ahead of the merge, on a shared pool.
+
+    The stream's page iterator is advanced by one task at a time, and at most
+    `read_ahead` pages are fetched but not yet taken.
+    """
+
+    def __init__(
+        self,
+        pages: Iterator[List[Any]],
+        executor: ThreadPoolExecutor,
+        read_ahead: int,
+    ):
+        self._pages = pages
+        self._executor = executor
+        self._read_ahead = read_ahead
+        self._lock = threading.Lock()
+        self._ready: queue.Queue = queue.Queue()
+        self._pending = 0
+        self._fetching = False
+        self._done = False
+        with self._lock:
+            self._schedule()
+
+    def _schedule(self) -> None:
+        # Called with the lock held
+        if self._fetching or self._done or self._pending >= self._read_ahead:
+            return
+        self._fetching = True
+        self._pending += 1
+        self._executor.submit(self._fetch)
+
+    def _fetch(self) -> None:
+        try:
+            page = next(self._pages, _END)
+        except BaseException as e:
+            page = _Failure(e)
+
+        with self._lock:
+            self._fetching = False
+            self._done = page is _END or isinstance(page, _Failure)
+            self._ready.put(page)
+            self._schedule()
+
+    def next_page(self) -> Optional[List[Any]]:
+        """
+        Take the next page, waiting for it if it has not arrived.
+
+        Returns:
+            The page, or None at the end of the stream.
+        """
+        page = self._ready.get()
+        if isinstance(page, _Failure):
+            raise page.error
+        if page is _END:
+            return None
+
+        with self._lock:
+            self._pending -= 1
+            self._schedule()
+        return page
+
+
+def merge_pages(
+    streams: Sequence[Iterator[List[T]]],
+    key: Callable[[T], Any],
+    read_ahead: int = 2,
+    max_workers: int = 8,
+) -> Iterator[T]:
+    """
+    Merge paged streams, each in key order, into one stream in key order.
+
+    Each stream's pages are fetched ahead of the merge on a shared thread pool,
+    and a heap holding the next item of each stream picks the item to yield.
+    At most `read_ahead` pages per stream are buffered, plus the page being
+    merged, so memory grows with the number of streams and the page size, not
+    with the total number of items.
+
+    Items with equal keys are yielded in the order of their streams.
+
+    Args:
+        streams: The page iterators of each stream.
+        key: Gets the sort key of an item.
+        read_ahead: The number of pages to fetch ahead of each stream.
+        max_workers: The number of pages to fetch concurrently.
+
+    Returns:
+        An iterator over the items of every stream, in key order.
+
+    Raises:
+        ValueError: If read_ahead or max_workers is less than 1.
+    """
+    if read_ahead < 1:
+        raise ValueError("read_ahead must be at least 1")
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    return _merge_pages(streams, key, read_ahead, max_workers)
+
+
+def _merge_pages(
+    streams: Sequence[Iterator[List[T]]],
+    key: Callable[[T], Any],
+    read_ahead: int,
+    max_workers: int,
+) -> Iterator[T]:
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="datum-merge"
+    )
+    try:
+        readers = [_StreamReader(pages, executor, read_ahead) for pages in streams]
+        current: List[Iterator[T]] = [iter(()) for _ in readers]
+        # One (key, stream index, item) entry per unfinished stream; the index
+        # breaks ties, so items themselves are never compared
+        heap: List[Any] = []
+
+        def next_entry(i: int) -> Optional[Any]:
+            while True:
+                item = next(current[i], _END)
+                if item is not _END:
+                    return (key(item), i, item)
+                page = readers[i].next_page()
+                if page is None:
+                    return None
+                current[i] = iter(page)
+
+        for i in range(len(readers)):
+            entry = next_entry(i)
+            if entry is not None:
+                heap.append(entry)
+        heapq.heapify(heap)
+
+        while heap:
+            _, i, item = heap[0]
+            yield item
+            entry = next_entry(i)
+            if entry is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, entry)
+    finally:
+        # Pages in flight finish in the background, and are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def merge_streams(
+    client: SolarNetworkClient,
+    streams: Iterable[StreamKey],
+    params: Dict[str, Any],
+    page_size: int = 1000,
+    read_ahead: int = 2,
+    max_workers: int = 8,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Query many datum streams, yielding one stream in timestamp order.
+
+    Each stream is paged through with its own datum list query, fetched ahead
+    concurrently, and merged as it arrives; see `merge_pages`. Datum with the
+    same timestamp are yielded in the order of `streams`.
+
+    Example:
+        >>> streams = [StreamKey(1, "/meter/1"), StreamKey(2, "/meter/1")]
+        >>> params = {"startDate": "2025-01-01", "endDate": "2025-02-01"}
+        >>> for datum in merge_streams(client, streams, params):
+        ...     process(datum)
+
+    Args:
+        client: The client to query with.
+        streams: The streams.
+        params: Query parameters (e.g. startDate, endDate, aggregation),
+            excluding nodeId, sourceId, max and offset.
+        page_size: The number of datum to request per page.
+        read_ahead: The number of pages to fetch ahead of each stream.
+        max_workers: The number of pages to fetch concurrently.
+
+    Returns:
+        An iterator over the datum of every stream, in timestamp order.
+
+    Raises:
+        ValueError: If read_ahead or max_workers is less than 1.
+        SolarNetworkError: If a page request is not successful.
+    """
+    pages = [
+        client.iter_datum_pages(
+            {**params, "nodeId": stream.node_id, "sourceId": stream.source_id},
+            page_size=page_size,
+            prefetch=0,
+        )
+        for stream in streams
+    ]
+    return merge_pages(pages, datum_timestamp, read_ahead, max_workers)
@@ -0,0 +1,314 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from wattmaven_solarnetwork_tools.core.coalescing import SingleFlight
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import SolarNetworkClient
+
+logger = logging.getLogger(__name__)
+
+# The time each kind of metadata is fresh for.
+DEFAULT_TTLS = {
+    "nodes": timedelta(hours=1),
+    "sources": timedelta(hours=1),
+    "range": timedelta(minutes=5),
+}
+
+_SNAPSHOT_VERSION = 2
+
+# The kind of metadata, then the query arguments, e.g. ("sources", 123).
+MetadataKey = Tuple[Any, ...]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float
+
+
+class MetadataCache:
+    """
+    Caches node, source ID and reporting range metadata.
+
+    Fresh entries are served from memory. Once an entry's TTL has passed it is
+    still served for up to `max_stale` longer, while it is refreshed on a
+    background thread; older entries are fetched before returning. Concurrent
+    fetches of the same entry are coalesced into one request.
+
+    With a snapshot path, the entries are loaded when the cache is created and
+    saved when it is closed, so a new process starts warm.
+
+    Cached lists and dicts are shared, and must be treated as read-only.
+
+    Example:
+        >>> with MetadataCache(client, snapshot_path="metadata.json") as metadata:
+        ...     for node_id in metadata.nodes():
+        ...         print(node_id, metadata.source_ids(node_id))
+    """
+
+    def __init__(
+        self,
+        client: SolarNetworkClient,
+        ttls: Optional[Mapping[str, timedelta]] = None,
+        max_stale: timedelta = timedelta(days=1),
+        snapshot_path: Optional[str] = None,
+        refresh_workers: int = 4,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache, loading the snapshot if there is one.
+
+        Args:
+            client: The client to fetch metadata with.
+            ttls: The time each kind of metadata ("nodes", "sources" and
+                "range") is fresh for, overriding `DEFAULT_TTLS`.
+            max_stale: How long past its TTL an entry is served while it is
+                refreshed in the background.
+            snapshot_path: The JSON snapshot file, or None to keep the cache in
+                memory only.
+            refresh_workers: The number of background refresh threads.
+            clock: The current time in seconds since the epoch.
+        """
+        self.client = client
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_stale = max_stale
+        self.snapshot_path = snapshot_path
+        self.clock = clock
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._entries: Dict[MetadataKey, _Entry] = {}
+        self._refreshing: Set[MetadataKey] = set()
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(
+            max_workers=refresh_workers, thread_name_prefix="metadata-refresh"
+        )
+
+        if snapshot_path is not None:
+            self._load(snapshot_path)
+
+    def nodes(self) -> List[int]:
+        """
+        Get the IDs of the nodes the credentials can access.
+
+        Returns:
+            The node IDs.
+
+        Raises:
+            SolarNetworkError: If the metadata has to be fetched and the request
+                is not successful.
+        """
+        return self._get(("nodes",), self.client.list_nodes)
+
+    def source_ids(self, node_id: int) -> List[str]:
+        """
+        Get the source IDs of a node.
+
+        Args:
+            node_id: The node ID.
+
+        Returns:
+            The source IDs.
+
+        Raises:
+            SolarNetworkError: If the metadata has to be fetched and the request
+                is not successful.
+        """
+        return self._get(
+            ("sources", node_id), lambda: self.client.list_source_ids(node_id)
+        )
+
+    def reporting_range(
+        self, node_id: int, source_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the range of time a node has reported datum over.
+
+        Args:
+            node_id: The node ID.
+            source_ids: Only consider these sources, or None for all of them.
+
+        Returns:
+            The range, with startDate, endDate, timeZone and other members.
+
+        Raises:
+            SolarNetworkError: If the metadata has to be fetched and the request
+                is not successful.
+        """
+        sources = sorted(source_ids or ())
+        return self._get(
+            ("range", node_id, *sources),
+            lambda: self.client.reporting_range(node_id, sources or None),
+        )
+
+    def prefetch(
+        self, node_ids: Optional[Iterable[int]] = None, ranges: bool = False
+    ) -> None:
+        """
+        Load the metadata of many nodes concurrently, on the refresh threads.
+
+        Args:
+            node_ids: The nodes, or None for every accessible node.
+            ranges: Also load the reporting range of each node.
+
+        Raises:
+            SolarNetworkError: If a request is not successful.
+        """
+        node_ids = self.nodes() if node_ids is None else list(node_ids)
+        futures = [self._executor.submit(self.source_ids, n) for n in node_ids]
+        if ranges:
+            futures += [
+                self._executor.submit(self.reporting_range, n) for n in node_ids
+            ]
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def _get(self, key: MetadataKey, fetch: Callable[[], Any]) -> Any:
+        ttl = self.ttls[key[0]].total_seconds()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = None if entry is None else self.clock() - entry.fetched_at
+            if age is not None and age < ttl:
+                self.hits += 1
+                return entry.value
+            stale = age is not None and age < ttl + self.max_stale.total_seconds()
+            if stale:
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+
+        if stale:
+            self._refresh_in_background(key, fetch)
+            return entry.value
+        return self._fetch(key, fetch)
+
+    def _fetch(self, key: MetadataKey, fetch: Callable[[], Any]) -> Any:
+        def fetch_and_store() -> Any:
+            value = fetch()
+            with self._lock:
+                self._entries[key] = _Entry(value, self.clock())
+            return value
+
+        return self._flight.do(key, fetch_and_store)
+
+    def _refresh_in_background(
+        self, key: MetadataKey, fetch: Callable[[], Any]
+    ) -> None:
+        def refresh() -> None:
+            try:
+                self._fetch(key, fetch)
+            except Exception as e:
+                # Keep serving the stale entry; the next read retries
+                logger.warning("Failed to refresh %s metadata: %s", key, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        try:
+            self._executor.submit(refresh)
+        except RuntimeError:
+            # The cache is closed
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """
+        Drop cached entries, so they are fetched on next use.
+
+        Args:
+            kind: Only drop this kind of metadata ("nodes", "sources" or
+                "range"), or None to drop everything.
+        """
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[key]
+
+    def _identity(self) -> str:
+        # Metadata depends on the token's permissions; only a hash of the token
+        # is written to the snapshot
+        credentials = self.client.credentials
+        identity = f"{credentials.host}\0{credentials.token}"
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def _load(self, path: str) -> None:
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable metadata snapshot %s: %s", path, e)
+            return
+
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get("version") != _SNAPSHOT_VERSION
+            or snapshot.get("identity") != self._identity()
+        ):
+            logger.info("Ignoring metadata snapshot %s of other credentials", path)
+            return
+
+        with self._lock:
+            for entry in snapshot.get("entries", []):
+                key = tuple(entry["key"])
+                if key and key[0] in self.ttls:
+                    self._entries[key] = _Entry(entry["value"], entry["fetchedAt"])
+
+    def save(self) -> None:
+        """
+        Save the entries to the snapshot file, replacing it atomically.
+
+        Raises:
+            ValueError: If the cache has no snapshot path.
+        """
+        if self.snapshot_path is None:
+            raise ValueError("The cache has no snapshot path")
+
+        with self._lock:
+            entries = [
+                {"key": list(key), "value": entry.value, "fetchedAt": entry.fetched_at}
+                for key, entry in self._entries.items()
+            ]
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "identity": self._identity(),
+            "entries": entries,
+        }
+        temporary = f"{self.snapshot_path}.tmp"
+        # Readable by the owner only, like the credentials the metadata is for
+        fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(temporary, self.snapshot_path)
+
+    def close(self) -> None:
+        """Stop refreshing, and save the snapshot if there is a snapshot path."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self.snapshot_path is not None:
+            self.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
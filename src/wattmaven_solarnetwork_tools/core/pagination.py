@@ -0,0 +1,129 @@
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List
+
+# The path of the datum list query.
+DATUM_LIST_PATH = "/solarquery/api/v1/sec/datum/list"
+
+# Fetches the page starting at the given offset, returning the response `data` object.
+PageFetcher = Callable[[int], Dict[str, Any]]
+
+_DONE = object()
+
+
+class _Failure:
+    """Wraps an exception raised by the prefetch worker."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _fetch_pages(fetch_page: PageFetcher, page_size: int) -> Iterator[List[Any]]:
+    """
+    Fetch pages sequentially until the last page.
+
+    Args:
+        fetch_page: The page fetcher.
+        page_size: The requested page size.
+
+    Returns:
+        An iterator over the results of each page.
+    """
+    offset = 0
+    while True:
+        data = fetch_page(offset)
+        results = data.get("results") or []
+        yield results
+
+        offset += len(results)
+        total = data.get("totalResults")
+        if total is not None:
+            # The server may serve fewer rows per page than requested, so a
+            # short page is not the last while the total says more remain
+            if not results or offset >= total:
+                return
+        elif len(results) < page_size:
+            return
+
+
+def iter_pages(
+    fetch_page: PageFetcher, page_size: int, prefetch: int = 1
+) -> Iterator[List[Any]]:
+    """
+    Iterate over the pages of an offset/max paginated query.
+
+    With a prefetch depth greater than zero, the following pages are fetched on
+    a worker thread while the caller consumes the current one. At most `prefetch`
+    pages are buffered, so memory stays bounded however long the query is.
+
+    Args:
+        fetch_page: The page fetcher.
+        page_size: The requested page size.
+        prefetch: The number of pages to fetch ahead, or 0 to fetch on demand.
+
+    Returns:
+        An iterator over the results of each page.
+
+    Raises:
+        ValueError: If page_size is less than 1 or prefetch is negative.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    if prefetch < 0:
+        raise ValueError("prefetch must not be negative")
+
+    if prefetch == 0:
+        return _fetch_pages(fetch_page, page_size)
+
+    return _prefetch_pages(fetch_page, page_size, prefetch)
+
+
+def _prefetch_pages(
+    fetch_page: PageFetcher, page_size: int, prefetch: int
+) -> Iterator[List[Any]]:
+    """
+    Fetch pages on a worker thread, buffering at most `prefetch` pages.
+
+    Args:
+        fetch_page: The page fetcher.
+        page_size: The requested page size.
+        prefetch: The number of pages to fetch ahead.
+
+    Returns:
+        An iterator over the results of each page.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        # Poll so the worker notices when the consumer stops early
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker() -> None:
+        try:
+            for page in _fetch_pages(fetch_page, page_size):
+                if not put(page):
+                    return
+        except BaseException as e:
+            put(_Failure(e))
+            return
+        put(_DONE)
+
+    thread = threading.Thread(target=worker, name="datum-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
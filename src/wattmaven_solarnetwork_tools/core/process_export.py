@@ -0,0 +1,312 @@
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from wattmaven_solarnetwork_tools.core.connection_pool import PoolOptions
+from wattmaven_solarnetwork_tools.core.datum_frame import (
+    DatumFrame,
+    fetch_datum_frame,
+    np,
+)
+from wattmaven_solarnetwork_tools.core.export import (
+    QUERY_DATE_FORMAT,
+    split_time_windows,
+)
+from wattmaven_solarnetwork_tools.core.json_decoding import get_json_decoder
+from wattmaven_solarnetwork_tools.core.retry import RetryPolicy
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+)
+
+# Transforms the frame of a window in the worker process; it must be picklable,
+# e.g. a module-level function.
+FrameTransform = Callable[[DatumFrame], DatumFrame]
+
+
+@dataclass(frozen=True)
+class ClientSpec:
+    """
+    The picklable configuration of a `SolarNetworkClient`.
+
+    A client owns a live session and can not be sent to another process; a
+    spec can, and builds an equivalent client there.
+    """
+
+    credentials: SolarNetworkCredentials
+    pool: Optional[PoolOptions] = None
+    retry: Optional[RetryPolicy] = None
+    compression: Optional[Tuple[str, ...]] = None
+    # The JSON decoder name (see `get_json_decoder`), or None for the fastest
+    json_decoder: Optional[str] = None
+
+    def create_client(self) -> SolarNetworkClient:
+        """
+        Build a client from the spec.
+
+        Returns:
+            The client, with its own session.
+        """
+        return SolarNetworkClient(
+            self.credentials,
+            retry=self.retry,
+            pool=self.pool,
+            compression=self.compression,
+            json_decoder=get_json_decoder(self.json_decoder),
+        )
+
+
+def _open_block(name: Optional[str] = None, size: int = 0) -> SharedMemory:
+    """
+    Create (without a name) or attach to a shared memory block, untracked.
+
+    The block is handed from the worker to the parent, which unlinks it, so
+    neither process's resource tracker may own it: the worker's would unlink
+    it at exit, and with the fork start method the trackers also warn of
+    leaked blocks and fail to unlink them twice.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, create=name is None, size=size, track=False)
+
+    block = SharedMemory(name, create=name is None, size=size)
+    if os.name == "posix":
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def _unlink_block(block: SharedMemory) -> None:
+    if sys.version_info < (3, 13) and os.name == "posix":
+        # Before Python 3.13, unlink always unregisters the block
+        resource_tracker.register(block._name, "shared_memory")
+    block.unlink()
+
+
+@dataclass(frozen=True)
+class SharedFrame:
+    """
+    A `DatumFrame` in a shared memory block, passed between processes by name.
+
+    The block holds the timestamps, node IDs and each column, then the source
+    codes, back to back; only the block name and the layout are pickled.
+    """
+
+    # The block name, or None for an empty frame
+    name: Optional[str]
+    length: int
+    sources: List[str]
+    columns: List[str]
+
+    def _layout(self) -> List[Tuple[str, Any]]:
+        # 8-byte arrays first, so every array is aligned
+        return (
+            [("timestamps", np.int64), ("node_ids", np.int64)]
+            + [(name, np.float64) for name in self.columns]
+            + [("source_codes", np.int32)]
+        )
+
+    def _arrays(self, buffer: Any) -> Dict[str, np.ndarray]:
+        arrays = {}
+        offset = 0
+        for name, dtype in self._layout():
+            array = np.ndarray(self.length, dtype=dtype, buffer=buffer, offset=offset)
+            arrays[name] = array
+            offset += array.nbytes
+        return arrays
+
+    @classmethod
+    def write(cls, frame: DatumFrame) -> "SharedFrame":
+        """
+        Copy a frame into a new shared memory block.
+
+        The block outlives this process, until `read` releases it.
+
+        Args:
+            frame: The frame.
+
+        Returns:
+            The shared frame.
+        """
+        shared = cls(None, len(frame), list(frame.sources), list(frame.columns))
+        if not len(frame):
+            return shared
+
+        size = sum(np.dtype(dtype).itemsize for _, dtype in shared._layout())
+        block = _open_block(size=size * len(frame))
+        try:
+            arrays = shared._arrays(block.buf)
+            arrays["timestamps"][:] = frame.timestamps.astype(np.int64)
+            arrays["node_ids"][:] = frame.node_ids
+            arrays["source_codes"][:] = frame.source_codes
+            for name in shared.columns:
+                arrays[name][:] = frame.columns[name]
+            del arrays
+        except BaseException:
+            # Views of the block may still be alive, so it can't be closed yet
+            _unlink_block(block)
+            raise
+        block.close()
+
+        return cls(block.name, shared.length, shared.sources, shared.columns)
+
+    def read(self) -> DatumFrame:
+        """
+        Copy the frame out of shared memory, and release the block.
+
+        Returns:
+            The frame.
+        """
+        if self.name is None:
+            return DatumFrame(
+                np.empty(0, dtype="datetime64[ms]"),
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.int32),
+                self.sources,
+                {name: np.empty(0, dtype=np.float64) for name in self.columns},
+            )
+
+        block = _open_block(self.name)
+        try:
+            arrays = {k: v.copy() for k, v in self._arrays(block.buf).items()}
+        finally:
+            block.close()
+            _unlink_block(block)
+
+        return DatumFrame(
+            arrays.pop("timestamps").view("datetime64[ms]"),
+            arrays.pop("node_ids"),
+            arrays.pop("source_codes"),
+            self.sources,
+            arrays,
+        )
+
+    def release(self) -> None:
+        """Release the block without reading it."""
+        if self.name is not None:
+            block = _open_block(self.name)
+            block.close()
+            _unlink_block(block)
+
+
+# The client of a worker process, built on its first window.
+_worker_spec: Optional[ClientSpec] = None
+_worker_client: Optional[SolarNetworkClient] = None
+
+
+def _init_worker(spec: ClientSpec) -> None:
+    global _worker_spec, _worker_client
+    _worker_spec = spec
+    _worker_client = None
+
+
+def _fetch_window(
+    params: Dict[str, Any],
+    properties: Optional[Sequence[str]],
+    page_size: int,
+    transform: Optional[FrameTransform],
+) -> SharedFrame:
+    global _worker_client
+    if _worker_client is None:
+        _worker_client = _worker_spec.create_client()
+
+    frame = fetch_datum_frame(_worker_client, params, properties, page_size)
+    if transform is not None:
+        frame = transform(frame)
+    return SharedFrame.write(frame)
+
+
+def export_frames(
+    spec: ClientSpec,
+    params: Dict[str, Any],
+    start_date: datetime,
+    end_date: datetime,
+    window: timedelta = timedelta(days=7),
+    processes: Optional[int] = None,
+    properties: Optional[Sequence[str]] = None,
+    page_size: int = 1000,
+    transform: Optional[FrameTransform] = None,
+    mp_context: Optional[multiprocessing.context.BaseContext] = None,
+) -> Iterator[Tuple[datetime, datetime, DatumFrame]]:
+    """
+    Export datum over a long date range on a pool of worker processes.
+
+    Each window is fetched, JSON decoded, converted into a `DatumFrame` and
+    optionally transformed in a worker process, so the work is not held back
+    by the GIL. Each worker builds its own client from the spec on its first
+    window. Frames come back through shared memory blocks rather than being
+    pickled. At most `2 * processes` windows are in flight at once.
+
+    Failed requests are retried by the spec's retry policy; a window that still
+    fails ends the export.
+
+    Args:
+        spec: The client configuration.
+        params: Query parameters (e.g. nodeId, sourceId, aggregation), excluding
+            startDate, endDate, max and offset.
+        start_date: The start of the range (inclusive).
+        end_date: The end of the range (exclusive).
+        window: The size of each window.
+        processes: The number of worker processes, defaults to the CPU count.
+        properties: The sample properties to keep, or None for all numeric ones.
+        page_size: The number of datum to request per page.
+        transform: Transforms each window's frame in the worker, e.g. to convert
+            units; it must be picklable.
+        mp_context: The multiprocessing context to start workers with.
+
+    Returns:
+        An iterator over the (start, end, frame) of each window, in order.
+
+    Raises:
+        ValueError: If processes is less than 1.
+        SolarNetworkError: If a window fails.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1:
+        raise ValueError("processes must be at least 1")
+
+    windows = iter(split_time_windows(start_date, end_date, window))
+    pending: Deque[Tuple[datetime, datetime, Future]] = deque()
+
+    executor = ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(spec,),
+    )
+    try:
+        while True:
+            while len(pending) < 2 * processes:
+                next_window = next(windows, None)
+                if next_window is None:
+                    break
+                start, end = next_window
+                window_params = {
+                    **params,
+                    "startDate": start.strftime(QUERY_DATE_FORMAT),
+                    "endDate": end.strftime(QUERY_DATE_FORMAT),
+                }
+                future = executor.submit(
+                    _fetch_window, window_params, properties, page_size, transform
+                )
+                pending.append((start, end, future))
+
+            if not pending:
+                return
+
+            start, end, future = pending.popleft()
+            yield start, end, future.result().read()
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+        # Release the blocks of windows that finished but were not read
+        for _, _, future in pending:
+            if not future.cancelled() and future.exception() is None:
+                future.result().release()
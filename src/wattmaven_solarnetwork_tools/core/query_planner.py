@@ -0,0 +1,406 @@
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from wattmaven_solarnetwork_tools.core.export import QUERY_DATE_FORMAT
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import SolarNetworkClient
+
+logger = logging.getLogger(__name__)
+
+# The aggregation recorded for raw datum queries.
+RAW_AGGREGATION = "None"
+
+_MINUTE = timedelta(minutes=1)
+
+
+@dataclass(frozen=True)
+class DensityKey:
+    """Identifies the datum of a stream at an aggregation level."""
+
+    node_id: int
+    source_id: str
+    aggregation: str = RAW_AGGREGATION
+
+
+@dataclass(frozen=True)
+class Density:
+    """
+    The observed datum density of a stream.
+
+    Rows and seconds are decayed totals, so recent windows count for the most.
+    """
+
+    rows: float
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """The datum per second."""
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def observe(self, rows: int, seconds: float, decay: float) -> "Density":
+        """
+        Fold in the datum count of a window.
+
+        Args:
+            rows: The datum in the window.
+            seconds: The length of the window.
+            decay: The weight kept by the earlier observations, in [0, 1).
+
+        Returns:
+            The updated density.
+        """
+        return Density(self.rows * decay + rows, self.seconds * decay + seconds)
+
+
+class DensityStore:
+    """A SQLite store of the observed datum density of each stream."""
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: The SQLite database path, or ":memory:".
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS densities ("
+                "node_id INTEGER NOT NULL, "
+                "source_id TEXT NOT NULL, "
+                "aggregation TEXT NOT NULL, "
+                "rows REAL NOT NULL, "
+                "seconds REAL NOT NULL, "
+                "PRIMARY KEY (node_id, source_id, aggregation))"
+            )
+
+    def get(self, key: DensityKey) -> Optional[Density]:
+        """
+        Get the density of a stream.
+
+        Args:
+            key: The stream and aggregation.
+
+        Returns:
+            The density, or None if it has not been observed.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rows, seconds FROM densities "
+                "WHERE node_id = ? AND source_id = ? AND aggregation = ?",
+                (key.node_id, key.source_id, key.aggregation),
+            ).fetchone()
+        return Density(*row) if row else None
+
+    def put(self, key: DensityKey, density: Density) -> None:
+        """
+        Set the density of a stream.
+
+        Args:
+            key: The stream and aggregation.
+            density: The density.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO densities "
+                "(node_id, source_id, aggregation, rows, seconds) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    key.node_id,
+                    key.source_id,
+                    key.aggregation,
+                    density.rows,
+                    density.seconds,
+                ),
+            )
+
+    def observe(
+        self, key: DensityKey, rows: int, seconds: float, decay: float
+    ) -> Density:
+        """
+        Fold the datum count of a window into the density of a stream.
+
+        The read and the write are one transaction, so concurrent observations
+        of the same stream, from any thread or process, are never lost.
+
+        Args:
+            key: The stream and aggregation.
+            rows: The datum in the window.
+            seconds: The length of the window.
+            decay: The weight kept by the earlier observations, in [0, 1).
+
+        Returns:
+            The updated density.
+        """
+        params = (key.node_id, key.source_id, key.aggregation)
+        with self._lock, self._conn:
+            # Take the write lock up front, so no other process writes between
+            # the read and the write
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT rows, seconds FROM densities "
+                "WHERE node_id = ? AND source_id = ? AND aggregation = ?",
+                params,
+            ).fetchone()
+            density = (Density(*row) if row else Density(0.0, 0.0)).observe(
+                rows, seconds, decay
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO densities "
+                "(node_id, source_id, aggregation, rows, seconds) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (*params, density.rows, density.seconds),
+            )
+        return density
+
+    def all(self) -> Dict[DensityKey, Density]:
+        """
+        Get every density.
+
+        Returns:
+            The densities, keyed by stream and aggregation.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node_id, source_id, aggregation, rows, seconds FROM densities"
+            ).fetchall()
+        return {
+            DensityKey(node_id, source_id, aggregation): Density(rows, seconds)
+            for node_id, source_id, aggregation, rows, seconds in rows
+        }
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+@dataclass(frozen=True)
+class WindowResult:
+    """The datum of one planned window."""
+
+    start: datetime
+    end: datetime
+    datum: List[Dict[str, Any]]
+    pages: int
+
+
+class QueryPlanner:
+    """
+    Sizes datum list windows from the observed density of each stream.
+
+    Each stream is queried in consecutive windows sized to return about
+    `target_pages` pages. The density of every window is recorded, and the next
+    window is resized from it, so a window that comes back over or under target
+    corrects the rest of the query; the recorded history sizes the first window
+    of later queries.
+    """
+
+    def __init__(
+        self,
+        client: SolarNetworkClient,
+        store: Optional[DensityStore] = None,
+        page_size: int = 1000,
+        target_pages: float = 0.9,
+        initial_window: timedelta = timedelta(days=1),
+        min_window: timedelta = timedelta(minutes=5),
+        max_window: timedelta = timedelta(days=90),
+        max_growth: float = 4.0,
+        decay: float = 0.5,
+    ):
+        """
+        Initialize the planner.
+
+        Args:
+            client: The client to query with.
+            store: The density history, or None to keep it in memory.
+            page_size: The number of datum to request per page.
+            target_pages: The number of pages each window should return; the
+                default leaves room for variation in density, rather than
+                spilling into a nearly empty second page.
+            initial_window: The window of a stream with no history.
+            min_window: The smallest window.
+            max_window: The largest window.
+            max_growth: The most a window may grow over the previous one, so a
+                gap in the data does not produce one huge window.
+            decay: The weight kept by earlier observations as each window is
+                recorded, in [0, 1).
+
+        Raises:
+            ValueError: If an argument is out of range.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if target_pages <= 0:
+            raise ValueError("target_pages must be positive")
+        if not timedelta(0) < min_window <= max_window:
+            raise ValueError("Expected 0 < min_window <= max_window")
+        if max_growth < 1:
+            raise ValueError("max_growth must be at least 1")
+        if not 0 <= decay < 1:
+            raise ValueError("decay must be in [0, 1)")
+
+        self.client = client
+        self.store = store if store is not None else DensityStore()
+        self._owns_store = store is None
+        self.page_size = page_size
+        self.target_pages = target_pages
+        self.initial_window = initial_window
+        self.min_window = min_window
+        self.max_window = max_window
+        self.max_growth = max_growth
+        self.decay = decay
+
+    def window_for(
+        self, key: DensityKey, previous: Optional[timedelta] = None
+    ) -> timedelta:
+        """
+        Size the next window of a stream.
+
+        Args:
+            key: The stream and aggregation.
+            previous: The previous window of the query, if any, to bound growth.
+
+        Returns:
+            The window.
+        """
+        density = self.store.get(key)
+        if density is None:
+            window = self.initial_window
+        elif density.rows_per_second > 0:
+            target_rows = self.target_pages * self.page_size
+            window = timedelta(seconds=target_rows / density.rows_per_second)
+        else:
+            window = self.max_window
+
+        if previous is not None:
+            window = min(window, previous * self.max_growth)
+        window = max(self.min_window, min(window, self.max_window))
+        # Query dates have minute precision
+        return max(_MINUTE, window // _MINUTE * _MINUTE)
+
+    def record(self, key: DensityKey, rows: int, window: timedelta) -> Density:
+        """
+        Record the datum count of a window.
+
+        Args:
+            key: The stream and aggregation.
+            rows: The datum in the window.
+            window: The length of the window.
+
+        Returns:
+            The updated density.
+        """
+        return self.store.observe(key, rows, window.total_seconds(), self.decay)
+
+    def iter_windows(
+        self,
+        node_id: int,
+        source_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        aggregation: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[WindowResult]:
+        """
+        Query a stream over a date range in planned windows.
+
+        Args:
+            node_id: The node ID.
+            source_id: The source ID.
+            start_date: The start of the range (inclusive).
+            end_date: The end of the range (exclusive).
+            aggregation: The aggregation level, or None for raw datum.
+            params: Other query parameters, excluding nodeId, sourceId,
+                aggregation, startDate, endDate, max and offset.
+
+        Returns:
+            An iterator over the windows, in order.
+
+        Raises:
+            SolarNetworkError: If a page request is not successful.
+        """
+        key = DensityKey(node_id, source_id, aggregation or RAW_AGGREGATION)
+        query = {**(params or {}), "nodeId": node_id, "sourceId": source_id}
+        if aggregation is not None:
+            query["aggregation"] = aggregation
+
+        start = start_date
+        window: Optional[timedelta] = None
+        while start < end_date:
+            window = self.window_for(key, window)
+            end = min(start + window, end_date)
+            window_params = {
+                **query,
+                "startDate": start.strftime(QUERY_DATE_FORMAT),
+                "endDate": end.strftime(QUERY_DATE_FORMAT),
+            }
+
+            datum: List[Dict[str, Any]] = []
+            pages = 0
+            for page in self.client.iter_datum_pages(
+                window_params, page_size=self.page_size, prefetch=0
+            ):
+                datum.extend(page)
+                pages += 1
+
+            density = self.record(key, len(datum), end - start)
+            logger.debug(
+                "Window %s - %s of %s returned %d datum in %d pages; "
+                "density now %.3g/s",
+                window_params["startDate"],
+                window_params["endDate"],
+                key,
+                len(datum),
+                pages,
+                density.rows_per_second,
+            )
+
+            yield WindowResult(start, end, datum, pages)
+            start = end
+
+    def iter_datum(
+        self,
+        node_id: int,
+        source_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        aggregation: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Query a stream over a date range in planned windows, one datum at a time.
+
+        See `iter_windows` for the arguments.
+
+        Returns:
+            An iterator over the datum.
+        """
+        for result in self.iter_windows(
+            node_id, source_id, start_date, end_date, aggregation, params
+        ):
+            yield from result.datum
+
+    def close(self) -> None:
+        """Close the density store, if the planner created it."""
+        if self._owns_store:
+            self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
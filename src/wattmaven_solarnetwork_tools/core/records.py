@@ -0,0 +1,225 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Tuple
+
+# The path of the node list query.
+NODES_PATH = "/solarquery/api/v1/sec/nodes"
+
+# The path of the source ID list query.
+SOURCES_PATH = "/solarquery/api/v1/sec/nodes/sources"
+
+# The path of the reporting range query.
+REPORTING_RANGE_PATH = "/solarquery/api/v1/sec/range/interval"
+
+# Datum properties decoded into record fields, or dropped as redundant.
+_ENVELOPE_PROPERTIES = frozenset(
+    {"created", "nodeId", "sourceId", "localDate", "localTime"}
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def parse_created(created: str) -> int:
+    """
+    Parse a datum `created` timestamp.
+
+    Args:
+        created: The timestamp, e.g. "2025-01-01 00:00:00.000Z".
+
+    Returns:
+        The milliseconds since the epoch.
+
+    Raises:
+        ValueError: If the timestamp is malformed.
+    """
+    dt = datetime.fromisoformat(created[:-1] if created.endswith("Z") else created)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // _MILLISECOND
+
+
+class Datum:
+    """
+    A datum, converted into a compact record.
+
+    Records are built from the decoded JSON objects rather than decoded
+    straight into typed structs: the sample properties vary by source, so
+    a datum has no fixed schema to decode into.
+
+    The sample property names are held in a tuple shared by all records of a
+    page with the same properties, and the values in a tuple, which takes a
+    fraction of the memory of a dict per datum. The `localDate` and
+    `localTime` properties are dropped, as they follow from the timestamp.
+    """
+
+    __slots__ = ("node_id", "source_id", "timestamp", "names", "values")
+
+    def __init__(
+        self,
+        node_id: int,
+        source_id: str,
+        timestamp: int,
+        names: Tuple[str, ...],
+        values: Tuple[Any, ...],
+    ):
+        """
+        Initialize the record.
+
+        Args:
+            node_id: The node ID.
+            source_id: The source ID.
+            timestamp: The `created` time, in milliseconds since the epoch.
+            names: The sample property names.
+            values: The sample property values, in the order of `names`.
+        """
+        self.node_id = node_id
+        self.source_id = source_id
+        self.timestamp = timestamp
+        self.names = names
+        self.values = values
+
+    @property
+    def created(self) -> datetime:
+        """The `created` time, in UTC."""
+        return _EPOCH + self.timestamp * _MILLISECOND
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return self.values[self.names.index(name)]
+        except ValueError:
+            raise KeyError(name) from None
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Get a sample property value.
+
+        Args:
+            name: The property name.
+            default: The value if the property is missing.
+
+        Returns:
+            The property value.
+        """
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def samples(self) -> Dict[str, Any]:
+        """
+        Get the sample properties.
+
+        Returns:
+            The property values, keyed by name.
+        """
+        return dict(zip(self.names, self.values))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Datum):
+            return NotImplemented
+        return (
+            self.node_id == other.node_id
+            and self.source_id == other.source_id
+            and self.timestamp == other.timestamp
+            and self.samples() == other.samples()
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Datum(node_id={self.node_id!r}, source_id={self.source_id!r}, "
+            f"created={self.created.isoformat()!r}, samples={self.samples()!r})"
+        )
+
+
+def decode_datum(datum: Iterable[Dict[str, Any]]) -> List[Datum]:
+    """
+    Decode datum list results into records.
+
+    Args:
+        datum: The datum, as decoded JSON objects.
+
+    Returns:
+        The records, in order.
+
+    Raises:
+        KeyError: If a datum has no nodeId, sourceId or created property.
+        ValueError: If a created timestamp is malformed.
+    """
+    layouts: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+    records = []
+    last_created = None
+    timestamp = 0
+    for d in datum:
+        created = d["created"]
+        # Datum of several sources often share a timestamp
+        if created != last_created:
+            timestamp = parse_created(created)
+            last_created = created
+
+        names = tuple(k for k in d if k not in _ENVELOPE_PROPERTIES)
+        names = layouts.setdefault(names, names)
+        records.append(
+            Datum(
+                d["nodeId"],
+                d["sourceId"],
+                timestamp,
+                names,
+                tuple(d[k] for k in names),
+            )
+        )
+    return records
+
+
+def decode_datum_page(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decode the results of a datum list response `data` object into records.
+
+    Args:
+        data: The response `data` object.
+
+    Returns:
+        A copy of the object, with the `results` decoded into `Datum` records.
+    """
+    return {**data, "results": decode_datum(data.get("results") or [])}
+
+
+def decode_nodes(data: Any) -> List[int]:
+    """
+    Decode the `data` of a node list response.
+
+    Args:
+        data: The response `data`, a list of node IDs.
+
+    Returns:
+        The node IDs.
+
+    Raises:
+        ValueError: If the data is not a list of node IDs.
+    """
+    if not isinstance(data, list) or not all(
+        isinstance(node_id, int) for node_id in data
+    ):
+        raise ValueError("Expected a list of node IDs")
+    return data
+
+
+def decode_source_ids(data: Any) -> List[str]:
+    """
+    Decode the `data` of a source ID list response.
+
+    Args:
+        data: The response `data`, a list of source IDs or of objects with a
+            `sourceId` member.
+
+    Returns:
+        The source IDs, in order.
+
+    Raises:
+        ValueError: If the data is not a list of source IDs.
+    """
+    if not isinstance(data, list):
+        raise ValueError("Expected a list of source IDs")
+    source_ids = [d.get("sourceId") if isinstance(d, dict) else d for d in data]
+    if not all(isinstance(source_id, str) for source_id in source_ids):
+        raise ValueError("Expected a list of source IDs")
+    return source_ids
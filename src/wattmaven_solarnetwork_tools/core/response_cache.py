@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Mapping, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from wattmaven_solarnetwork_tools.core.authentication import canonical_query_string
+
+# The query parameters that bound a query's time range, and whether they are
+# interpreted in the node's local time zone.
+_END_DATE_PARAMETERS = {"endDate": False, "localEndDate": True}
+
+# The accepted formats of the date query parameters.
+_DATE_FORMATS = ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+# No time zone is more than 14 hours ahead of UTC.
+_MAX_UTC_OFFSET = timedelta(hours=14)
+
+_FILE_SUFFIX = ".z"
+
+
+def _parse_query_date(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if not isinstance(value, str):
+        return None
+    value = value.rstrip("Z")
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def is_immutable_query(
+    params: Optional[Mapping[str, Any]],
+    now: Optional[datetime] = None,
+    settle: timedelta = timedelta(hours=1),
+) -> bool:
+    """
+    Check if a query covers a closed historical range whose results won't change.
+
+    A query is immutable when it has an end date that is at least `settle` before
+    now. Queries without an end date, or whose range overlaps now, are not.
+
+    Args:
+        params: Query parameters
+        now: The current time, defaults to the current UTC time
+        settle: How long after the end of a range to wait for late data
+
+    Returns:
+        True if the query results can be cached
+    """
+    if not params:
+        return False
+
+    now = now or datetime.now(timezone.utc)
+    for name, local in _END_DATE_PARAMETERS.items():
+        end = _parse_query_date(params.get(name))
+        if end is None:
+            continue
+        # A local end date may be ahead of UTC in the node's time zone
+        if local:
+            end += _MAX_UTC_OFFSET
+        return end <= now - settle
+
+    return False
+
+
+@dataclass
+class CachedResponse:
+    """A response body stored in the cache."""
+
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> "CachedResponse":
+        """
+        Capture a downloaded response.
+
+        Args:
+            response: The response
+
+        Returns:
+            The cached response
+        """
+        headers = {}
+        if "Content-Type" in response.headers:
+            headers["Content-Type"] = response.headers["Content-Type"]
+        return cls(response.status_code, headers, response.content)
+
+    def to_response(self, url: str) -> requests.Response:
+        """
+        Rebuild a `requests.Response` from the cached body.
+
+        Args:
+            url: The request URL
+
+        Returns:
+            The response
+        """
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.url = url
+        response.reason = "OK" if self.status_code == 200 else ""
+        return response
+
+
+class ResponseCache:
+    """
+    A persistent on-disk cache of response bodies.
+
+    Bodies are stored zlib-compressed, one file per request, and the least
+    recently used entries are evicted when the total size exceeds `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 1024 * 1024 * 1024,
+        compress_level: int = 6,
+        settle: timedelta = timedelta(hours=1),
+    ):
+        """
+        Initialize the cache, indexing any entries already on disk.
+
+        Args:
+            directory: The cache directory, created if it does not exist.
+            max_bytes: The maximum total size of the (compressed) entries.
+            compress_level: The zlib compression level.
+            settle: How long after the end of a range to wait for late data
+                before caching it.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.settle = settle
+        self._lock = threading.Lock()
+        # key -> compressed size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        existing = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith(_FILE_SUFFIX):
+                stat = entry.stat()
+                existing.append(
+                    (stat.st_mtime, entry.name[: -len(_FILE_SUFFIX)], stat.st_size)
+                )
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def key(
+        host: str,
+        token: str,
+        method: str,
+        path: str,
+        params: Optional[Mapping[str, Any]],
+        accept: Optional[str],
+    ) -> str:
+        """
+        Get the cache key of a request.
+
+        Args:
+            host: The API host
+            token: The token, since results depend on the token's permissions
+            method: HTTP method name
+            path: API endpoint path
+            params: Query parameters
+            accept: Accept header value
+
+        Returns:
+            The cache key
+        """
+        canonical = "\n".join(
+            [host, token, method, path, canonical_query_string(params), accept or ""]
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def is_cacheable(self, method: str, params: Optional[Mapping[str, Any]]) -> bool:
+        """
+        Check if a request may be served from, and stored in, the cache.
+
+        Args:
+            method: HTTP method name
+            params: Query parameters
+
+        Returns:
+            True if the request is a GET of a closed historical range
+        """
+        return method == "GET" and is_immutable_query(params, settle=self.settle)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _FILE_SUFFIX)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Get a cached response.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached response, or None if it is not cached
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = zlib.decompress(f.read())
+        except FileNotFoundError:
+            # Evicted since the index lookup
+            return None
+        except (OSError, zlib.error):
+            self._discard(key)
+            return None
+        try:
+            # Persist the recency, so the LRU order survives a restart
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        meta, _, content = payload.partition(b"\n")
+        meta = json.loads(meta)
+        return CachedResponse(meta["status_code"], meta["headers"], content)
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        """
+        Store a response, evicting the least recently used entries if needed.
+
+        Args:
+            key: The cache key
+            response: The response to store
+        """
+        meta = json.dumps(
+            {"status_code": response.status_code, "headers": response.headers}
+        ).encode("utf-8")
+        data = zlib.compress(meta + b"\n" + response.content, self.compress_level)
+        if len(data) > self.max_bytes:
+            return
+
+        # Write atomically, so concurrent readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            evicted = []
+            while self._total_bytes > self.max_bytes:
+                old_key, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        with self._lock:
+            keys = list(self._entries)
+        for key in keys:
+            self._discard(key)
+
+    @property
+    def total_bytes(self) -> int:
+        """The total size of the (compressed) entries."""
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
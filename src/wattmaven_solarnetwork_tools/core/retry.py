@@ -0,0 +1,259 @@
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+import requests
+
+from wattmaven_solarnetwork_tools.core.exceptions import SolarNetworkError
+
+# The exceptions of a failed attempt that are retried like a connection error,
+# including a response body download cut short.
+RETRYABLE_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Check if a failed request may succeed when sent again.
+
+    Throttling (429), server errors (5xx), connection errors and corrupt
+    bodies are transient, as are successful statuses whose body is not a
+    successful JSON envelope. Other client errors (4xx), such as bad
+    credentials or a rejected request, are not.
+
+    Args:
+        error: The exception the request failed with
+
+    Returns:
+        True if the error is transient
+    """
+    if isinstance(error, SolarNetworkError):
+        status_code = error.status_code
+        return (
+            status_code is None
+            or status_code < 400
+            or status_code == 429
+            or status_code >= 500
+        )
+    return isinstance(
+        error, RETRYABLE_ERRORS + (requests.exceptions.ContentDecodingError,)
+    )
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a request.
+
+    Throttled (429) responses are retried for any method, since the server did
+    not process them. Other retryable statuses and connection errors are only
+    retried for idempotent methods.
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    jitter: bool = True
+    respect_retry_after: bool = True
+    retry_statuses: FrozenSet[int] = field(
+        default_factory=lambda: frozenset({429, 500, 502, 503, 504})
+    )
+    idempotent_methods: FrozenSet[str] = field(
+        default_factory=lambda: frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    )
+
+    def should_retry(self, method: str, status_code: Optional[int]) -> bool:
+        """
+        Check if a request may be retried.
+
+        Args:
+            method: HTTP method name
+            status_code: The response status, or None for a connection error
+
+        Returns:
+            True if the request may be retried
+        """
+        if status_code == 429:
+            return True
+        if status_code is not None and status_code not in self.retry_statuses:
+            return False
+        return method in self.idempotent_methods
+
+    def handles(self, method: str, error: BaseException) -> bool:
+        """
+        Check if a client with this policy already retried a failed request.
+
+        Callers that retry whole operations use this to retry only the errors
+        the policy does not cover, rather than multiplying its attempts.
+
+        Args:
+            method: HTTP method name
+            error: The exception the request failed with
+
+        Returns:
+            True if the client retried the request before raising the error
+        """
+        if self.max_retries < 1:
+            return False
+        if isinstance(error, SolarNetworkError):
+            status_code = error.status_code
+            if status_code is None:
+                return False
+        elif isinstance(error, RETRYABLE_ERRORS):
+            status_code = None
+        else:
+            return False
+        return self.should_retry(method, status_code)
+
+    def should_retry_again(self, method: str, error: BaseException) -> bool:
+        """
+        Check if a caller retrying whole operations should retry a failed request.
+
+        Only transient errors the client has not already retried are, such as a
+        200 response with an unsuccessful envelope.
+
+        Args:
+            method: HTTP method name
+            error: The exception the request failed with
+
+        Returns:
+            True if the operation should be retried
+        """
+        return is_transient(error) and not self.handles(method, error)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get the exponential backoff delay before a retry.
+
+        Args:
+            attempt: The number of attempts made so far, starting at 1
+
+        Returns:
+            The delay in seconds; with jitter, a random delay up to the backoff
+        """
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        # "Full jitter" spreads retries out, so clients don't retry in lockstep
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def retry_after(self, response: requests.Response) -> Optional[float]:
+        """
+        Get the delay requested by a response's Retry-After header.
+
+        Args:
+            response: API response
+
+        Returns:
+            The delay in seconds, at most `max_backoff`, or None if the header
+            is missing or invalid
+        """
+        if not self.respect_retry_after:
+            return None
+
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            delay = (when - datetime.now(timezone.utc)).total_seconds()
+        # A misbehaving server must not stall the client for hours
+        return min(self.max_backoff, max(0.0, delay))
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket whose rate adapts to throttling (AIMD).
+
+    Each successful response increases the rate additively, and each throttled
+    response decreases it multiplicatively, at most once per `cooldown`
+    seconds so a burst of throttled responses counts as one signal.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        min_rate: float = 0.5,
+        max_rate: float = 1000.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: The initial rate, in requests per second
+            burst: The bucket size, defaults to one second's worth of requests
+            min_rate: The lowest rate to back off to
+            max_rate: The highest rate to grow to
+            increase: The rate increase per successful response
+            decrease: The rate multiplier per throttled response
+            cooldown: The minimum seconds between rate decreases
+
+        Raises:
+            ValueError: If the rates are not positive or inconsistent.
+        """
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError("Rates must satisfy 0 < min_rate <= rate <= max_rate")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._tokens = self._capacity()
+        self._updated = time.monotonic()
+        self._last_decrease = float("-inf")
+
+    def _capacity(self) -> float:
+        return self.burst if self.burst is not None else max(1.0, self.rate)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity(),
+                    self._tokens + (now - self._updated) * self.rate,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        """Record a response that was not throttled."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self) -> None:
+        """Record a throttled response."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                return
+            self._last_decrease = now
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, self._capacity())
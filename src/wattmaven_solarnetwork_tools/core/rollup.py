@@ -0,0 +1,423 @@
+from datetime import datetime, timezone, tzinfo
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
+
+from wattmaven_solarnetwork_tools.core.datum_frame import DatumFrame, np
+
+_MINUTE_MS = 60_000
+_HOUR_MS = 60 * _MINUTE_MS
+_DAY_MS = 24 * _HOUR_MS
+_QUARTER_HOUR_MS = 15 * _MINUTE_MS
+
+# The fixed-width aggregation levels, and their bucket widths in milliseconds.
+FIXED_AGGREGATIONS = {
+    "FiveMinute": 5 * _MINUTE_MS,
+    "TenMinute": 10 * _MINUTE_MS,
+    "FifteenMinute": 15 * _MINUTE_MS,
+    "ThirtyMinute": 30 * _MINUTE_MS,
+    "Hour": _HOUR_MS,
+    "Day": _DAY_MS,
+}
+
+# The calendar aggregation levels; weeks start on Monday.
+CALENDAR_AGGREGATIONS = ("Week", "Month", "Year")
+
+# The SolarNetwork aggregation levels supported by `Rollup`.
+AGGREGATIONS = tuple(FIXED_AGGREGATIONS) + CALENDAR_AGGREGATIONS
+
+# The days from the epoch (a Thursday) to the first Monday.
+_EPOCH_MONDAY = 4
+
+
+def is_accumulating(name: str) -> bool:
+    """
+    Guess whether a sample property is an accumulating reading.
+
+    Args:
+        name: The property name.
+
+    Returns:
+        True for energy readings such as `wattHours` and `wattHoursReverse`.
+    """
+    return "Hours" in name
+
+
+def _offsets_ms(ms: np.ndarray, offset_of: Callable[[int], float]) -> np.ndarray:
+    """
+    Look up UTC offsets once per distinct quarter hour of a timestamp array.
+
+    Time zones change offset on a quarter hour, not always on the hour (e.g.
+    America/St_Johns and Australia/Lord_Howe switch at half past), so every
+    timestamp in a quarter hour shares the offset of the quarter's start.
+    """
+    quarters, inverse = np.unique(ms // _QUARTER_HOUR_MS, return_inverse=True)
+    offsets = np.array([offset_of(int(q)) for q in quarters], dtype=np.int64)
+    return offsets[inverse.reshape(-1)]
+
+
+def _local_ms(utc_ms: np.ndarray, tz: tzinfo) -> np.ndarray:
+    def offset_of(quarter: int) -> float:
+        local = datetime.fromtimestamp(quarter * _QUARTER_HOUR_MS / 1000, tz)
+        return local.utcoffset().total_seconds() * 1000
+
+    return utc_ms + _offsets_ms(utc_ms, offset_of)
+
+
+def _utc_ms(local_ms: np.ndarray, tz: tzinfo) -> np.ndarray:
+    def offset_of(quarter: int) -> float:
+        local = datetime.fromtimestamp(
+            quarter * _QUARTER_HOUR_MS / 1000, timezone.utc
+        ).replace(tzinfo=tz)
+        return local.utcoffset().total_seconds() * 1000
+
+    return local_ms - _offsets_ms(local_ms, offset_of)
+
+
+def bucket_starts(local_ms: np.ndarray, aggregation: str) -> np.ndarray:
+    """
+    Find the bucket each local time falls in.
+
+    Args:
+        local_ms: Local wall-clock times, in milliseconds since the local epoch.
+        aggregation: One of `AGGREGATIONS`.
+
+    Returns:
+        The local start of each time's bucket, in milliseconds.
+
+    Raises:
+        ValueError: If the aggregation is not supported.
+    """
+    width = FIXED_AGGREGATIONS.get(aggregation)
+    if width is not None:
+        return local_ms - local_ms % width
+    if aggregation == "Week":
+        days = local_ms // _DAY_MS
+        return (days - (days - _EPOCH_MONDAY) % 7) * _DAY_MS
+    if aggregation in ("Month", "Year"):
+        unit = "M" if aggregation == "Month" else "Y"
+        return (
+            local_ms.astype("datetime64[ms]")
+            .astype(f"datetime64[{unit}]")
+            .astype("datetime64[ms]")
+            .astype(np.int64)
+        )
+    raise ValueError(
+        f"Unsupported aggregation {aggregation!r}; expected {AGGREGATIONS}"
+    )
+
+
+def _grow(values: np.ndarray, size: int, fill: float) -> np.ndarray:
+    grown = np.full(size, fill, dtype=values.dtype)
+    grown[: len(values)] = values
+    return grown
+
+
+class Rollup:
+    """
+    Incrementally aggregates raw datum into SolarNetwork-style rollups.
+
+    Each (node, source, bucket) keeps running statistics, so updating with new
+    raw rows only touches the buckets they fall in. Instantaneous properties
+    get their average, minimum, maximum and count. Accumulating properties get
+    the difference of their readings: the change since a stream's previous
+    reading is counted in the bucket of the later reading, including across
+    updates, along with the first and last reading in each bucket.
+
+    Buckets follow the wall clock of the time zone, so a Day bucket runs from
+    local midnight to midnight, and is 23 or 25 hours long across a daylight
+    saving transition.
+
+    Rows at or before the last row already applied to their stream are ignored,
+    so overlapping pulls can be applied without double counting; rows within an
+    update may be in any order.
+
+    Example:
+        >>> hourly = Rollup("Hour", "Pacific/Auckland")
+        >>> hourly.update(frame)
+        >>> hourly.to_frame()["watts_max"]
+    """
+
+    def __init__(
+        self,
+        aggregation: str = "Hour",
+        time_zone: Union[str, tzinfo] = "UTC",
+        accumulating: Optional[Iterable[str]] = None,
+    ):
+        """
+        Initialize the rollup.
+
+        Args:
+            aggregation: The aggregation level, one of `AGGREGATIONS`.
+            time_zone: The time zone of the bucket boundaries, as a tzinfo or
+                IANA name.
+            accumulating: The accumulating properties, or None to guess them
+                with `is_accumulating`.
+
+        Raises:
+            ValueError: If the aggregation is not supported.
+        """
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(
+                f"Unsupported aggregation {aggregation!r}; expected {AGGREGATIONS}"
+            )
+
+        self.aggregation = aggregation
+        self.time_zone = (
+            ZoneInfo(time_zone) if isinstance(time_zone, str) else time_zone
+        )
+        self._accumulating = None if accumulating is None else set(accumulating)
+
+        # Streams, and the last applied timestamp and readings of each
+        self._stream_ids: Dict[Tuple[int, str], int] = {}
+        self._last_ms = np.empty(0, dtype=np.int64)
+        self._last_reading: Dict[str, np.ndarray] = {}
+
+        # Buckets: their stream and local start, and the statistics per property
+        self._slot_ids: Dict[Tuple[int, int], int] = {}
+        self._slot_streams = np.empty(0, dtype=np.int64)
+        self._slot_starts = np.empty(0, dtype=np.int64)
+        self._stats: Dict[str, Dict[str, np.ndarray]] = {}
+
+    def _is_accumulating(self, name: str) -> bool:
+        if self._accumulating is None:
+            return is_accumulating(name)
+        return name in self._accumulating
+
+    def __len__(self) -> int:
+        return len(self._slot_ids)
+
+    @property
+    def streams(self) -> List[Tuple[int, str]]:
+        """The (nodeId, sourceId) of each stream seen."""
+        return list(self._stream_ids)
+
+    def _streams_of(self, frame: DatumFrame) -> np.ndarray:
+        """Map each row of a frame to a stream index, adding new streams."""
+        pairs, inverse = np.unique(
+            np.stack([frame.node_ids, frame.source_codes.astype(np.int64)]),
+            axis=1,
+            return_inverse=True,
+        )
+        ids = np.array(
+            [
+                self._stream_ids.setdefault(
+                    (int(node_id), frame.sources[code]), len(self._stream_ids)
+                )
+                for node_id, code in pairs.T
+            ],
+            dtype=np.int64,
+        )
+
+        count = len(self._stream_ids)
+        if count > len(self._last_ms):
+            self._last_ms = _grow(self._last_ms, count, np.iinfo(np.int64).min)
+            for name, readings in self._last_reading.items():
+                self._last_reading[name] = _grow(readings, count, np.nan)
+
+        return ids[inverse.reshape(-1)]
+
+    def _slots_of(self, streams: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """Map each row to its bucket's slot, adding new buckets."""
+        keys, inverse = np.unique(
+            np.stack([streams, starts]), axis=1, return_inverse=True
+        )
+        first_new = len(self._slot_ids)
+        ids = np.array(
+            [
+                self._slot_ids.setdefault((int(s), int(b)), len(self._slot_ids))
+                for s, b in keys.T
+            ],
+            dtype=np.int64,
+        )
+
+        count = len(self._slot_ids)
+        if count > first_new:
+            new = ids >= first_new
+            self._slot_streams = _grow(self._slot_streams, count, 0)
+            self._slot_starts = _grow(self._slot_starts, count, 0)
+            self._slot_streams[ids[new]] = keys[0, new]
+            self._slot_starts[ids[new]] = keys[1, new]
+            for name, stats in self._stats.items():
+                self._stats[name] = self._new_stats(name, count, stats)
+
+        return ids[inverse.reshape(-1)]
+
+    def _new_stats(
+        self, name: str, size: int, stats: Optional[Dict[str, np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
+        if self._is_accumulating(name):
+            fills = {"diff": 0.0, "diffs": 0.0, "start": np.nan, "end": np.nan}
+        else:
+            fills = {"count": 0.0, "sum": 0.0, "min": np.inf, "max": -np.inf}
+        return {
+            key: _grow(
+                stats[key] if stats else np.empty(0, dtype=np.float64), size, fill
+            )
+            for key, fill in fills.items()
+        }
+
+    def update(self, frame: DatumFrame) -> int:
+        """
+        Apply new raw datum.
+
+        Args:
+            frame: The raw datum.
+
+        Returns:
+            The number of rows applied.
+        """
+        if not len(frame):
+            return 0
+
+        ms = frame.timestamps.astype(np.int64)
+        streams = self._streams_of(frame)
+
+        # Skip rows already applied, then order by stream and time
+        rows = np.flatnonzero(ms > self._last_ms[streams])
+        rows = rows[np.lexsort((ms[rows], streams[rows]))]
+        if not len(rows):
+            return 0
+        ms, streams = ms[rows], streams[rows]
+
+        starts = bucket_starts(_local_ms(ms, self.time_zone), self.aggregation)
+        slots = self._slots_of(streams, starts)
+
+        for name, column in frame.columns.items():
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = self._new_stats(name, len(self._slot_ids))
+
+            values = column[rows]
+            valid = ~np.isnan(values)
+            if self._is_accumulating(name):
+                self._update_accumulating(
+                    name, stats, values[valid], streams[valid], slots[valid]
+                )
+            else:
+                values, slot = values[valid], slots[valid]
+                np.add.at(stats["count"], slot, 1.0)
+                np.add.at(stats["sum"], slot, values)
+                np.minimum.at(stats["min"], slot, values)
+                np.maximum.at(stats["max"], slot, values)
+
+        np.maximum.at(self._last_ms, streams, ms)
+        return len(rows)
+
+    def _update_accumulating(
+        self,
+        name: str,
+        stats: Dict[str, np.ndarray],
+        readings: np.ndarray,
+        streams: np.ndarray,
+        slots: np.ndarray,
+    ) -> None:
+        last = self._last_reading.get(name)
+        if last is None:
+            last = self._last_reading[name] = np.full(
+                len(self._stream_ids), np.nan, dtype=np.float64
+            )
+        if not len(readings):
+            return
+
+        # Each reading's predecessor: the previous row of its stream, or the
+        # last reading of an earlier update
+        previous = np.empty_like(readings)
+        previous[1:] = readings[:-1]
+        first = np.ones(len(readings), dtype=bool)
+        first[1:] = streams[1:] != streams[:-1]
+        previous[first] = last[streams[first]]
+
+        diffs = readings - previous
+        counted = ~np.isnan(diffs)
+        np.add.at(stats["diff"], slots[counted], diffs[counted])
+        np.add.at(stats["diffs"], slots[counted], 1.0)
+
+        # Rows are in time order within each bucket
+        _, first_rows = np.unique(slots, return_index=True)
+        unset = np.isnan(stats["start"][slots[first_rows]])
+        stats["start"][slots[first_rows[unset]]] = readings[first_rows[unset]]
+
+        _, last_rows = np.unique(slots[::-1], return_index=True)
+        last_rows = len(slots) - 1 - last_rows
+        stats["end"][slots[last_rows]] = readings[last_rows]
+
+        _, stream_last = np.unique(streams[::-1], return_index=True)
+        stream_last = len(streams) - 1 - stream_last
+        last[streams[stream_last]] = readings[stream_last]
+
+    def to_frame(self) -> DatumFrame:
+        """
+        Get the rollups, one row per node, source and bucket.
+
+        Instantaneous properties have `<name>` (the average), `<name>_min`,
+        `<name>_max` and `<name>_count` columns; accumulating properties have
+        `<name>` (the difference), `<name>_start` and `<name>_end` columns.
+        Statistics without any values are NaN.
+
+        Returns:
+            The rollups, ordered by bucket start and stream, timestamped with
+            the UTC time of each bucket's local start.
+        """
+        count = len(self._slot_ids)
+        if not count:
+            return DatumFrame.empty()
+
+        utc_starts = _utc_ms(self._slot_starts, self.time_zone)
+        order = np.lexsort((self._slot_streams, utc_starts))
+        streams = list(self._stream_ids)
+
+        sources: Dict[str, int] = {}
+        stream_sources = np.array(
+            [sources.setdefault(source, len(sources)) for _, source in streams],
+            dtype=np.int32,
+        )
+        stream_nodes = np.array([node for node, _ in streams], dtype=np.int64)
+        slot_streams = self._slot_streams[order]
+
+        columns: Dict[str, np.ndarray] = {}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for name, stats in self._stats.items():
+                stats = {key: values[order] for key, values in stats.items()}
+                if self._is_accumulating(name):
+                    columns[name] = np.where(stats["diffs"] > 0, stats["diff"], np.nan)
+                    columns[f"{name}_start"] = stats["start"]
+                    columns[f"{name}_end"] = stats["end"]
+                else:
+                    empty = stats["count"] == 0
+                    columns[name] = np.where(
+                        empty, np.nan, stats["sum"] / stats["count"]
+                    )
+                    columns[f"{name}_min"] = np.where(empty, np.nan, stats["min"])
+                    columns[f"{name}_max"] = np.where(empty, np.nan, stats["max"])
+                    columns[f"{name}_count"] = stats["count"]
+
+        return DatumFrame(
+            utc_starts[order].astype("datetime64[ms]"),
+            stream_nodes[slot_streams],
+            stream_sources[slot_streams],
+            list(sources),
+            columns,
+        )
+
+
+def rollup(
+    frame: DatumFrame,
+    aggregation: str,
+    time_zone: Union[str, tzinfo] = "UTC",
+    accumulating: Optional[Iterable[str]] = None,
+) -> DatumFrame:
+    """
+    Aggregate raw datum in one go; see `Rollup`.
+
+    Args:
+        frame: The raw datum.
+        aggregation: The aggregation level, one of `AGGREGATIONS`.
+        time_zone: The time zone of the bucket boundaries.
+        accumulating: The accumulating properties, or None to guess them.
+
+    Returns:
+        The rollups.
+    """
+    engine = Rollup(aggregation, time_zone, accumulating)
+    engine.update(frame)
+    return engine.to_frame()
@@ -1,16 +1,72 @@
 import json
+import logging
+import threading
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, Optional, Union
-from urllib.parse import urlencode
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
 
 import requests
+from urllib3.response import HTTPResponse
 
 from wattmaven_solarnetwork_tools.core.authentication import (
-    generate_auth_header,
+    Snws2Signer,
     get_x_sn_date,
 )
+from wattmaven_solarnetwork_tools.core.coalescing import SingleFlight, request_key
+from wattmaven_solarnetwork_tools.core.compression import accept_encoding
+from wattmaven_solarnetwork_tools.core.connection_pool import (
+    PoolAdapter,
+    PoolOptions,
+    PoolStats,
+    create_session,
+    observe_connections,
+)
+from wattmaven_solarnetwork_tools.core.csv_stream import (
+    DEFAULT_CHUNK_SIZE,
+    iter_csv_rows,
+)
+from wattmaven_solarnetwork_tools.core.exceptions import SolarNetworkError
+from wattmaven_solarnetwork_tools.core.instrumentation import RequestHook, RequestSpan
+from wattmaven_solarnetwork_tools.core.json_decoding import (
+    JsonDecoder,
+    get_json_decoder,
+)
+from wattmaven_solarnetwork_tools.core.pagination import DATUM_LIST_PATH, iter_pages
+from wattmaven_solarnetwork_tools.core.records import (
+    NODES_PATH,
+    REPORTING_RANGE_PATH,
+    SOURCES_PATH,
+    Datum,
+    decode_datum_page,
+    decode_nodes,
+    decode_source_ids,
+)
+from wattmaven_solarnetwork_tools.core.response_cache import (
+    CachedResponse,
+    ResponseCache,
+)
+from wattmaven_solarnetwork_tools.core.retry import (
+    RETRYABLE_ERRORS,
+    AdaptiveRateLimiter,
+    RetryPolicy,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 class HTTPMethod(Enum):
@@ -32,28 +88,248 @@ class SolarNetworkCredentials:
     token: str
     secret: str
     host: str = "data.solarnetwork.net"
+    # Only a local stand-in server should be used over plain "http"
+    scheme: str = "https"
+
+    @property
+    def base_url(self) -> str:
+        """The base URL of the API host."""
+        return f"{self.scheme}://{self.host}"
+
+
+def response_json(response: Any, loads: JsonDecoder = json.loads) -> Dict[str, Any]:
+    """
+    Get the JSON of a successful SolarNetwork API response.
+
+    Args:
+        response: API response, from `requests` or `httpx`
+        loads: The JSON decoder, defaults to the stdlib decoder
+
+    Returns:
+        The response JSON
+
+    Raises:
+        SolarNetworkError: If the response is not successful.
+    """
+    try:
+        body = loads(response.content)
+    except ValueError:
+        body = None
+
+    if (
+        response.status_code >= 400
+        or not isinstance(body, dict)
+        or not body.get("success")
+    ):
+        message = body.get("message") if isinstance(body, dict) else None
+        raise SolarNetworkError(
+            message or f"Request failed with status {response.status_code}",
+            response.status_code,
+        )
+
+    return body
+
+
+def response_data(response: requests.Response, loads: JsonDecoder = json.loads) -> Any:
+    """
+    Get the `data` of a SolarNetwork API response.
+
+    Args:
+        response: API response
+        loads: The JSON decoder, defaults to the stdlib decoder
+
+    Returns:
+        The `data` member of the response JSON
+
+    Raises:
+        SolarNetworkError: If the response is not successful.
+    """
+    return response_json(response, loads).get("data")
+
+
+def wire_size(response: requests.Response, content: bytes) -> int:
+    """
+    Get the number of body bytes received, before any decompression.
+
+    Args:
+        response: A downloaded API response
+        content: The decoded response content
+
+    Returns:
+        The size of the body as received
+    """
+    if isinstance(response.raw, HTTPResponse):
+        return response.raw.tell()
+    return len(content)
+
+
+def method_value(method: Union[str, HTTPMethod]) -> str:
+    """
+    Get the upper-case HTTP method name.
+
+    Args:
+        method: HTTP method
+
+    Returns:
+        The HTTP method name
+    """
+    return method.value if isinstance(method, HTTPMethod) else method.upper()
+
+
+def encode_body(data: Optional[Union[Dict[str, Any], bytes]]) -> Optional[bytes]:
+    """
+    Serialize a request body to the exact JSON bytes that are signed and sent.
+
+    Args:
+        data: Request body data, or an already encoded JSON body
+
+    Returns:
+        The encoded body, or None if there is no body
+    """
+    if isinstance(data, bytes):
+        return data
+    return json.dumps(data).encode("utf-8") if isinstance(data, dict) else None
+
+
+def signed_headers(
+    credentials: SolarNetworkCredentials,
+    signer: Snws2Signer,
+    method: str,
+    path: str,
+    params: Optional[Dict[str, Any]],
+    body: Optional[bytes],
+    accept: Optional[str] = "application/json",
+    content_encoding: Optional[str] = None,
+    accept_encoding: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Build the request headers, including the SNWS2 Authorization header.
+
+    Args:
+        credentials: SolarNetwork authentication credentials
+        signer: The signer for the credentials
+        method: HTTP method name
+        path: API endpoint path
+        params: Query parameters
+        body: The encoded request body
+        accept: Accept header value, defaults to application/json
+        content_encoding: The encoding of the body, e.g. "gzip"
+        accept_encoding: Accept-Encoding header value, which is signed so it can
+            not be altered in transit
+
+    Returns:
+        The request headers
+    """
+    now = datetime.now(timezone.utc)
+
+    headers = {
+        "accept": accept,
+        "host": credentials.host,
+        "x-sn-date": get_x_sn_date(now),
+    }
+    if accept_encoding is not None:
+        headers["accept-encoding"] = accept_encoding
+
+    # Generate auth header
+    headers["Authorization"] = signer.sign(method, path, params, headers, body, now)
+
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+        if content_encoding is not None:
+            headers["Content-Encoding"] = content_encoding
+
+    return headers
 
 
 class SolarNetworkClient:
-    """Client for interacting with the SolarNetwork API."""
+    """
+    Client for interacting with the SolarNetwork API.
 
-    def __init__(self, credentials: SolarNetworkCredentials):
+    A client is safe to share across threads: requests are signed and sent
+    without mutating shared state, and all threads share one connection pool.
+    Clients for many credentials can also share one session; see
+    `SolarNetworkClientPool`.
+    """
+
+    def __init__(
+        self,
+        credentials: SolarNetworkCredentials,
+        cache: Optional[ResponseCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        pool: Optional[PoolOptions] = None,
+        coalesce: bool = False,
+        hooks: Sequence[RequestHook] = (),
+        max_in_flight: Optional[int] = None,
+        session: Optional[requests.Session] = None,
+        compression: Optional[Sequence[str]] = None,
+        json_decoder: Optional[JsonDecoder] = None,
+    ):
         """
         Initialize the SolarNetwork client.
 
         Args:
             credentials: SolarNetwork authentication credentials
+            cache: An optional cache for queries of closed historical ranges
+            retry: The retry policy, defaults to `RetryPolicy()`; use
+                `RetryPolicy(max_retries=0)` to disable retries
+            rate_limiter: An optional client-side rate limiter
+            pool: Connection pool and timeout settings, defaults to `PoolOptions()`
+            coalesce: If True, concurrent identical `get_json` calls share one
+                request and its parsed result
+            hooks: Receive a `RequestSpan` with the timings and outcome of each
+                request, e.g. a `MetricsRegistry`
+            max_in_flight: The maximum number of requests sent at once, or None
+                for no limit
+            session: An existing session to send requests with, which is not
+                closed with the client; defaults to a new session configured by
+                `pool`
+            compression: The response encodings to accept, in order of
+                preference, defaults to all supported encodings (see
+                `supported_encodings`); an empty sequence disables compression
+            json_decoder: Decodes JSON responses, defaults to the fastest
+                installed decoder (see `get_json_decoder`)
+
+        Raises:
+            ValueError: If a compression encoding is not supported.
         """
         self.credentials = credentials
-        self._session = requests.Session()
+        self.cache = cache
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.hooks = list(hooks)
+        self.pool = pool if pool is not None else PoolOptions()
+        self.accept_encoding = accept_encoding(compression)
+        self.json_decoder = (
+            json_decoder if json_decoder is not None else get_json_decoder()
+        )
+        self._signer = Snws2Signer(credentials.token, credentials.secret)
+        self._flights = SingleFlight() if coalesce else None
+        self._in_flight = (
+            threading.BoundedSemaphore(max_in_flight)
+            if max_in_flight is not None
+            else nullcontext()
+        )
+
+        self._owns_session = session is None
+        if session is None:
+            self.pool_stats = PoolStats()
+            self._session = create_session(self.pool, self.pool_stats)
+        else:
+            adapter = session.get_adapter(credentials.base_url)
+            self.pool_stats = (
+                adapter.stats if isinstance(adapter, PoolAdapter) else PoolStats()
+            )
+            self._session = session
 
     def _prepare_request(
         self,
         method: Union[str, HTTPMethod],
         path: str,
         params: Optional[Dict[str, Any]] = None,
-        data: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], bytes]] = None,
         accept: Optional[str] = "application/json",
+        content_encoding: Optional[str] = None,
     ) -> requests.Request:
         """Prepare a request with authentication headers.
 
@@ -61,45 +337,34 @@ class SolarNetworkClient:
             method: HTTP method
             path: API endpoint path
             params: Query parameters
-            data: Request body data
+            data: Request body data, or an already encoded JSON body
             accept: Accept header value, defaults to application/json
+            content_encoding: The encoding of an already encoded body, e.g. "gzip"
 
         Returns:
             Prepared request
         """
-        now = datetime.now(timezone.utc)
-        date = get_x_sn_date(now)
-
-        headers = {
-            "accept": accept,
-            "host": self.credentials.host,
-            "x-sn-date": date,
-        }
-
-        method_str = method.value if isinstance(method, HTTPMethod) else method.upper()
-
-        # Generate auth header
-        auth = generate_auth_header(
-            self.credentials.token,
-            self.credentials.secret,
+        method_str = method_value(method)
+        # Serialize the body once, so the signed bytes are exactly the sent bytes
+        body = encode_body(data)
+        headers = signed_headers(
+            self.credentials,
+            self._signer,
             method_str,
             path,
-            urlencode(params) if params else "",
-            headers,
-            json.dumps(data) if data else "",
-            now,
+            params,
+            body,
+            accept,
+            content_encoding,
+            self.accept_encoding,
         )
-        headers["Authorization"] = auth
-
-        if isinstance(data, dict):
-            headers["Content-Type"] = "application/json"
 
         return requests.Request(
             method=method_str,
-            url=f"https://{self.credentials.host}{path}",
+            url=f"{self.credentials.base_url}{path}",
             params=params,
             headers=headers,
-            json=data if isinstance(data, dict) else None,
+            data=body,
         )
 
     def request(
@@ -107,8 +372,10 @@ class SolarNetworkClient:
         method: Union[str, HTTPMethod],
         path: str,
         params: Optional[Dict[str, Any]] = None,
-        data: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], bytes]] = None,
         accept: Optional[str] = "application/json",
+        stream: bool = False,
+        content_encoding: Optional[str] = None,
     ) -> requests.Response:
         """
         Make an authenticated request to the SolarNetwork API.
@@ -117,17 +384,481 @@ class SolarNetworkClient:
             method: HTTP method
             path: API endpoint path
             params: Query parameters
-            data: Request body data
+            data: Request body data, or an already encoded JSON body
             accept: Accept header value, defaults to application/json
+            stream: If True, the body is not downloaded until it is read
+            content_encoding: The encoding of an already encoded body,
+                e.g. "gzip"
+        Returns:
+            API response
+        """
+        return self._request(
+            method, path, params, data, accept, stream, content_encoding
+        )
+
+    def _request(
+        self,
+        method: Union[str, HTTPMethod],
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Union[Dict[str, Any], bytes]] = None,
+        accept: Optional[str] = "application/json",
+        stream: bool = False,
+        content_encoding: Optional[str] = None,
+        parse: Optional[Callable[[requests.Response], T]] = None,
+    ) -> Union[requests.Response, T]:
+        """
+        Make a request, optionally parse the response, and report its span.
+
+        Args:
+            method: HTTP method
+            path: API endpoint path
+            params: Query parameters
+            data: Request body data, or an already encoded JSON body
+            accept: Accept header value
+            stream: If True, the body is not downloaded until it is read
+            content_encoding: The encoding of an already encoded body,
+                e.g. "gzip"
+            parse: Parses the response, timed as the `parse` phase
+
+        Returns:
+            API response, or the parsed response if `parse` is given
+        """
+        method_str = method_value(method)
+        span = RequestSpan(method_str, path)
+        try:
+            response = self._cached_send(
+                method_str, path, params, data, accept, stream, content_encoding, span
+            )
+            if parse is None:
+                return response
+
+            start = time.perf_counter()
+            try:
+                return parse(response)
+            finally:
+                span.add_phase("parse", time.perf_counter() - start)
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.finish()
+            for hook in self.hooks:
+                hook(span)
+
+    def _cached_send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Union[Dict[str, Any], bytes]],
+        accept: Optional[str],
+        stream: bool,
+        content_encoding: Optional[str],
+        span: RequestSpan,
+    ) -> requests.Response:
+        """
+        Send a request, or serve it from the cache.
+
+        Args:
+            method: HTTP method name
+            path: API endpoint path
+            params: Query parameters
+            data: Request body data, or an already encoded JSON body
+            accept: Accept header value
+            stream: If True, the body is not downloaded until it is read
+            content_encoding: The encoding of an already encoded body,
+                e.g. "gzip"
+            span: Records the request timings and outcome
+
+        Returns:
+            API response
+        """
+        cache_key = None
+        if (
+            self.cache is not None
+            and data is None
+            and not stream
+            and self.cache.is_cacheable(method, params)
+        ):
+            cache_key = ResponseCache.key(
+                self.credentials.host,
+                self.credentials.token,
+                method,
+                path,
+                params,
+                accept,
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                # Cache hits are served without signing a request at all
+                span.cached = True
+                span.status_code = cached.status_code
+                span.bytes_received = len(cached.content)
+                return cached.to_response(f"{self.credentials.base_url}{path}")
+
+        response = self._send(
+            method, path, params, data, accept, stream, content_encoding, span
+        )
+
+        if cache_key is not None and self._is_successful(response):
+            self.cache.put(cache_key, CachedResponse.from_response(response))
+
+        return response
+
+    def _is_successful(self, response: requests.Response) -> bool:
+        """Check a response is a 200 with, for JSON, a successful envelope."""
+        if response.status_code != 200:
+            return False
+        if "json" not in response.headers.get("Content-Type", ""):
+            return True
+        try:
+            response_json(response, self.json_decoder)
+        except SolarNetworkError:
+            return False
+        return True
+
+    def _parse_json(self, response: requests.Response) -> Dict[str, Any]:
+        return response_json(response, self.json_decoder)
+
+    def _parse_data(self, response: requests.Response) -> Any:
+        return response_data(response, self.json_decoder)
+
+    def get_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Make an authenticated GET request and parse the JSON response.
+
+        When the client coalesces requests, concurrent callers of an identical
+        request (same path, parameters in any order) wait for one upstream call
+        and share its parsed result, which must then be treated as read-only.
+
+        Args:
+            path: API endpoint path
+            params: Query parameters
+
+        Returns:
+            The parsed response JSON
+
+        Raises:
+            SolarNetworkError: If the response is not successful.
+        """
+
+        def fetch() -> Any:
+            return self._request(HTTPMethod.GET, path, params, parse=self._parse_json)
+
+        if self._flights is None:
+            return fetch()
+
+        key = request_key("GET", path, params, "application/json")
+        return self._flights.do(key, fetch)
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Union[Dict[str, Any], bytes]],
+        accept: Optional[str],
+        stream: bool,
+        content_encoding: Optional[str],
+        span: RequestSpan,
+    ) -> requests.Response:
+        """
+        Send a request, retrying according to the retry policy.
+
+        Every attempt is prepared, and therefore signed, afresh, so a retry never
+        reuses a stale x-sn-date signature.
+
+        Args:
+            method: HTTP method name
+            path: API endpoint path
+            params: Query parameters
+            data: Request body data, or an already encoded JSON body
+            accept: Accept header value
+            stream: If True, the body is not downloaded until it is read
+            content_encoding: The encoding of an already encoded body,
+                e.g. "gzip"
+            span: Records the request timings and outcome
+
         Returns:
             API response
         """
-        request = self._prepare_request(method, path, params, data, accept)
-        prepared = request.prepare()
-        return self._session.send(prepared)
+        while True:
+            span.attempts += 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            # Only the attempt itself counts towards max_in_flight, not the
+            # wait before a retry
+            with self._in_flight:
+                start = time.perf_counter()
+                prepared = self._prepare_request(
+                    method, path, params, data, accept, content_encoding
+                ).prepare()
+                sent = time.perf_counter()
+                span.add_phase("prepare", sent - start)
+                span.bytes_sent += len(prepared.body or b"")
+
+                received = None
+                try:
+                    # Always stream, so the body download is timed separately
+                    with observe_connections(span.record_connect):
+                        response = self._session.send(
+                            prepared, stream=True, timeout=self.pool.timeout
+                        )
+                    received = time.perf_counter()
+                    span.add_phase("send", received - sent)
+                    span.status_code = response.status_code
+
+                    final = (
+                        span.attempts > self.retry.max_retries
+                        or not self.retry.should_retry(method, response.status_code)
+                    )
+                    if final and not stream:
+                        # Reading the content decompresses it chunk by chunk. A
+                        # download cut short is retried like a failed send.
+                        content = response.content
+                except RETRYABLE_ERRORS as e:
+                    if received is None:
+                        span.add_phase("send", time.perf_counter() - sent)
+                    else:
+                        response.close()
+                        span.add_phase("download", time.perf_counter() - received)
+                    if (
+                        span.attempts > self.retry.max_retries
+                        or not self.retry.should_retry(method, None)
+                    ):
+                        raise
+                    delay = self.retry.backoff(span.attempts)
+                    logger.debug("Retrying %s %s in %.2fs: %s", method, path, delay, e)
+                else:
+                    throttled = response.status_code in (429, 503)
+                    if self.rate_limiter is not None:
+                        if throttled:
+                            self.rate_limiter.on_throttle()
+                        else:
+                            self.rate_limiter.on_success()
+
+                    if final:
+                        if stream:
+                            span.bytes_received += int(
+                                response.headers.get("Content-Length") or 0
+                            )
+                        else:
+                            span.bytes_received += wire_size(response, content)
+                            span.add_phase("download", time.perf_counter() - received)
+                        return response
+
+                    response.close()
+                    delay = self.retry.retry_after(response)
+                    if delay is None:
+                        delay = self.retry.backoff(span.attempts)
+                    logger.debug(
+                        "Retrying %s %s in %.2fs: status %d",
+                        method,
+                        path,
+                        delay,
+                        response.status_code,
+                    )
+
+            time.sleep(delay)
+
+    def iter_datum_pages(
+        self,
+        params: Dict[str, Any],
+        page_size: int = 1000,
+        prefetch: int = 1,
+        path: str = DATUM_LIST_PATH,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Iterate over pages of datum, paging through the results.
+
+        The next pages are fetched in the background while the current one is
+        consumed; see `iter_pages`.
+
+        Args:
+            params: Query parameters, excluding `max` and `offset`
+            page_size: The number of datum to request per page
+            prefetch: The number of pages to fetch ahead, or 0 to disable
+            path: API endpoint path, defaults to the datum list query
+
+        Returns:
+            An iterator over the pages of datum
+
+        Raises:
+            SolarNetworkError: If a page request is not successful.
+        """
+
+        return self._iter_pages(params, page_size, prefetch, path, self._parse_data)
+
+    def _iter_pages(
+        self,
+        params: Dict[str, Any],
+        page_size: int,
+        prefetch: int,
+        path: str,
+        parse: Callable[[requests.Response], Dict[str, Any]],
+    ) -> Iterator[List[Any]]:
+        def fetch_page(offset: int) -> Dict[str, Any]:
+            page_params = {**params, "max": page_size, "offset": offset}
+            return self._request(HTTPMethod.GET, path, page_params, parse=parse)
+
+        return iter_pages(fetch_page, page_size, prefetch)
+
+    def iter_datum(
+        self,
+        params: Dict[str, Any],
+        page_size: int = 1000,
+        prefetch: int = 1,
+        path: str = DATUM_LIST_PATH,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over datum one at a time, paging through the results.
+
+        Args:
+            params: Query parameters, excluding `max` and `offset`
+            page_size: The number of datum to request per page
+            prefetch: The number of pages to fetch ahead, or 0 to disable
+            path: API endpoint path, defaults to the datum list query
+
+        Returns:
+            An iterator over the datum
+
+        Raises:
+            SolarNetworkError: If a page request is not successful.
+        """
+        for page in self.iter_datum_pages(params, page_size, prefetch, path):
+            yield from page
+
+    def iter_datum_records(
+        self,
+        params: Dict[str, Any],
+        page_size: int = 1000,
+        prefetch: int = 1,
+        path: str = DATUM_LIST_PATH,
+    ) -> Iterator[Datum]:
+        """
+        Iterate over datum decoded into compact `Datum` records.
+
+        Each page is decoded with the client's JSON decoder and converted into
+        records as it arrives, on the prefetch thread when prefetching, so only
+        the records are retained.
+
+        Args:
+            params: Query parameters, excluding `max` and `offset`
+            page_size: The number of datum to request per page
+            prefetch: The number of pages to fetch ahead, or 0 to disable
+            path: API endpoint path, defaults to the datum list query
+
+        Returns:
+            An iterator over the records
+
+        Raises:
+            SolarNetworkError: If a page request is not successful.
+        """
+
+        def parse(response: requests.Response) -> Dict[str, Any]:
+            return decode_datum_page(self._parse_data(response))
+
+        for page in self._iter_pages(params, page_size, prefetch, path, parse):
+            yield from page
+
+    def list_nodes(self) -> List[int]:
+        """
+        List the IDs of the nodes the credentials can access.
+
+        Returns:
+            The node IDs
+
+        Raises:
+            SolarNetworkError: If the response is not successful.
+        """
+
+        def parse(response: requests.Response) -> List[int]:
+            return decode_nodes(self._parse_data(response))
+
+        return self._request(HTTPMethod.GET, NODES_PATH, parse=parse)
+
+    def list_source_ids(self, node_id: int) -> List[str]:
+        """
+        List the source IDs of a node.
+
+        Args:
+            node_id: The node ID
+
+        Returns:
+            The source IDs
+
+        Raises:
+            SolarNetworkError: If the response is not successful.
+        """
+
+        def parse(response: requests.Response) -> List[str]:
+            return decode_source_ids(self._parse_data(response))
+
+        return self._request(
+            HTTPMethod.GET, SOURCES_PATH, {"nodeId": node_id}, parse=parse
+        )
+
+    def reporting_range(
+        self, node_id: int, source_ids: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the range of time a node has reported datum over.
+
+        Args:
+            node_id: The node ID
+            source_ids: Only consider these sources, or None for all of them
+
+        Returns:
+            The range, with startDate, endDate, timeZone and other members
+
+        Raises:
+            SolarNetworkError: If the response is not successful.
+        """
+        params: Dict[str, Any] = {"nodeId": node_id}
+        if source_ids:
+            params["sourceIds"] = ",".join(source_ids)
+        return self._request(
+            HTTPMethod.GET, REPORTING_RANGE_PATH, params, parse=self._parse_data
+        )
+
+    def iter_csv(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Stream a CSV response, parsing rows as the body arrives.
+
+        Args:
+            path: API endpoint path
+            params: Query parameters
+            chunk_size: The number of bytes to read at a time
+
+        Returns:
+            An iterator over the rows, keyed by the CSV header
+
+        Raises:
+            SolarNetworkError: If the response is not successful.
+        """
+        response = self.request(
+            HTTPMethod.GET, path, params, accept="text/csv", stream=True
+        )
+        return iter_csv_rows(response, chunk_size)
+
+    def close(self) -> None:
+        """Close the client's session, unless it was given an existing one."""
+        if self._owns_session:
+            self._session.close()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._session.close()
+        self.close()
@@ -0,0 +1,189 @@
+import gzip
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Tuple
+
+import requests
+
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    HTTPMethod,
+    SolarNetworkClient,
+    SolarNetworkError,
+    response_json,
+)
+
+logger = logging.getLogger(__name__)
+
+# The default maximum size of an uncompressed upload chunk, in bytes.
+DEFAULT_MAX_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass
+class UploadResult:
+    """A summary of a bulk upload."""
+
+    # The number of chunks uploaded
+    chunks: int = 0
+    # The number of datum uploaded
+    datum: int = 0
+    # The size of the JSON bodies, before compression
+    bytes_encoded: int = 0
+    # The size of the bodies sent
+    bytes_sent: int = 0
+
+
+def encode_datum_chunks(
+    datum: Iterable[Dict[str, Any]],
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    Serialize datum into JSON array chunks of bounded size.
+
+    Each datum is serialized exactly once, and the chunks are joined from the
+    serialized bytes. A single datum larger than `max_chunk_bytes` is sent in a
+    chunk of its own.
+
+    Args:
+        datum: The datum to serialize, as JSON-serializable dicts.
+        max_chunk_bytes: The maximum size of a chunk, in bytes.
+
+    Returns:
+        An iterator over the (datum count, JSON bytes) of each chunk.
+
+    Raises:
+        ValueError: If max_chunk_bytes is not positive.
+
+    Example:
+        >>> [body for _, body in encode_datum_chunks([{"a": 1}, {"a": 2}], 16)]
+        [b'[{"a":1}]', b'[{"a":2}]']
+    """
+    if max_chunk_bytes < 1:
+        raise ValueError("max_chunk_bytes must be positive")
+
+    parts: List[bytes] = []
+    # The size of the enclosing brackets and separating commas
+    size = 2
+    for d in datum:
+        encoded = json.dumps(d, separators=(",", ":")).encode("utf-8")
+        if parts and size + 1 + len(encoded) > max_chunk_bytes:
+            yield len(parts), b"[" + b",".join(parts) + b"]"
+            parts = []
+            size = 2
+        size += len(encoded) + (1 if parts else 0)
+        parts.append(encoded)
+
+    if parts:
+        yield len(parts), b"[" + b",".join(parts) + b"]"
+
+
+def upload_datum(
+    client: SolarNetworkClient,
+    path: str,
+    datum: Iterable[Dict[str, Any]],
+    max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+    compress: bool = True,
+    compress_level: int = 6,
+    max_workers: int = 4,
+    retries: int = 2,
+    retry_delay: float = 1.0,
+) -> UploadResult:
+    """
+    Upload a large batch of datum, as size-bounded chunks posted in parallel.
+
+    The datum are consumed lazily, and at most `2 * max_workers` chunks are held
+    in memory at once. Each chunk is serialized once, optionally gzip compressed,
+    and those exact bytes are signed and sent. A failed chunk is retried on its
+    own, so posting datum must be idempotent, as SolarNetwork's datum uploads
+    are for datum with the same node, source and timestamp.
+
+    Args:
+        client: The client to upload with.
+        path: The API endpoint path to POST the chunks to.
+        datum: The datum to upload, as JSON-serializable dicts.
+        max_chunk_bytes: The maximum size of a chunk before compression, in bytes.
+        compress: If True, send the chunks gzip compressed.
+        compress_level: The gzip compression level, from 1 (fastest) to 9.
+        max_workers: The number of chunks to upload concurrently.
+        retries: The number of times to retry a chunk that failed with a
+            transient error the client's retry policy does not cover, such as
+            a server or connection error, which a non-idempotent POST is not
+            retried for. Throttling is retried by the client and is not
+            retried again. A chunk rejected with a client error (4xx) is not
+            sent again.
+        retry_delay: The delay before the first retry in seconds, doubled for
+            each following retry.
+
+    Returns:
+        A summary of the upload.
+
+    Raises:
+        ValueError: If max_workers or max_chunk_bytes is less than 1.
+        SolarNetworkError: If a chunk still fails after all retries.
+        requests.RequestException: If a chunk still fails after all retries.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    def upload_chunk(count: int, body: bytes) -> Tuple[int, int, int]:
+        encoded_size = len(body)
+        if compress:
+            # A fixed mtime keeps the compressed bytes deterministic
+            body = gzip.compress(body, compresslevel=compress_level, mtime=0)
+
+        attempt = 0
+        while True:
+            try:
+                response_json(
+                    client.request(
+                        HTTPMethod.POST,
+                        path,
+                        data=body,
+                        content_encoding="gzip" if compress else None,
+                    )
+                )
+                return count, encoded_size, len(body)
+            except (SolarNetworkError, requests.RequestException) as e:
+                if attempt >= retries or not client.retry.should_retry_again("POST", e):
+                    raise
+                delay = retry_delay * 2**attempt
+                attempt += 1
+                logger.warning(
+                    "Retrying upload of %d datum in %.1fs (attempt %d): %s",
+                    count,
+                    delay,
+                    attempt,
+                    e,
+                )
+                time.sleep(delay)
+
+    chunks = encode_datum_chunks(datum, max_chunk_bytes)
+    pending: Deque[Future] = deque()
+    result = UploadResult()
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="datum-upload"
+    ) as executor:
+        try:
+            while True:
+                # Keep the pool busy, without serializing arbitrarily far ahead
+                while len(pending) < 2 * max_workers:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.append(executor.submit(upload_chunk, *chunk))
+
+                if not pending:
+                    return result
+
+                count, encoded_size, sent_size = pending.popleft().result()
+                result.chunks += 1
+                result.datum += count
+                result.bytes_encoded += encoded_size
+                result.bytes_sent += sent_size
+        finally:
+            for future in pending:
+                future.cancel()
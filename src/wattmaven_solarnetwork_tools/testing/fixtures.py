@@ -0,0 +1,28 @@
+"""
+Pytest fixtures for testing against the local SolarNetwork stand-in server.
+
+Enable them with `pytest_plugins = ["wattmaven_solarnetwork_tools.testing.fixtures"]`
+in a top-level conftest.py.
+"""
+
+from typing import Iterator
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkCredentials,
+)
+from wattmaven_solarnetwork_tools.testing.stub_server import StubServer
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubServer]:
+    """A running stand-in server, with the default synthetic nodes."""
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def stub_credentials(stub_server: StubServer) -> SolarNetworkCredentials:
+    """Credentials accepted by the `stub_server` fixture."""
+    return stub_server.credentials()
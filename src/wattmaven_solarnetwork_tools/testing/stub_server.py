@@ -0,0 +1,605 @@
+"""
+A local stand-in for the SolarNetwork API, for offline tests and benchmarks.
+
+The server verifies SNWS2 Authorization headers with the same algorithm the
+client signs with, and serves deterministic synthetic datum. Datum POSTed
+to any path are recorded in `uploads`. Responses are gzip or deflate
+compressed if the client accepts it. Latency, throttling (429) and server
+errors can be injected.
+
+Run it standalone with:
+
+    python -m wattmaven_solarnetwork_tools.testing.stub_server --port 8080
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import io
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from wattmaven_solarnetwork_tools.core.authentication import Snws2Signer
+from wattmaven_solarnetwork_tools.core.pagination import DATUM_LIST_PATH
+from wattmaven_solarnetwork_tools.core.records import (
+    NODES_PATH,
+    REPORTING_RANGE_PATH,
+    SOURCES_PATH,
+)
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkCredentials,
+)
+
+# The start of the synthetic datum reporting range.
+REPORTING_START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+# The format of datum `created` timestamps.
+CREATED_FORMAT = "%Y-%m-%d %H:%M:%S.000Z"
+
+# The accepted formats of the date query parameters.
+_DATE_FORMATS = ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+# Responses smaller than this are not worth compressing.
+_MIN_COMPRESS_SIZE = 256
+
+# The maximum allowed difference between x-sn-date and the server clock.
+_MAX_DATE_SKEW = timedelta(minutes=15)
+
+_AUTHORIZATION = re.compile(
+    r"SNWS2 Credential=(?P<token>[^,]+),"
+    r"SignedHeaders=(?P<headers>[^,]+),"
+    r"Signature=(?P<signature>[0-9a-f]+)"
+)
+
+_CSV_COLUMNS = [
+    "created",
+    "nodeId",
+    "sourceId",
+    "localDate",
+    "localTime",
+    "watts",
+    "wattHours",
+]
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value.rstrip("Z"), fmt).replace(
+                tzinfo=timezone.utc
+            )
+        except ValueError:
+            continue
+    return None
+
+
+def synthetic_datum(node_id: int, source_id: str, created: datetime) -> Dict[str, Any]:
+    """
+    Generate the deterministic synthetic datum of a stream at a point in time.
+
+    Power follows a daily sine curve, offset per stream, and energy is its
+    running total since the epoch, so it only ever increases.
+
+    Args:
+        node_id: The node ID.
+        source_id: The source ID.
+        created: The datum timestamp (UTC).
+
+    Returns:
+        The datum, as returned by `/datum/list`.
+    """
+    seed = int(hashlib.sha256(f"{node_id}{source_id}".encode()).hexdigest()[:8], 16)
+    scale = 500 + seed % 1000
+    seconds = created.timestamp()
+    day_fraction = (seconds % 86400) / 86400
+    watts = round(scale * max(0.0, math.sin(math.pi * (2 * day_fraction - 0.5))), 3)
+    # The average of the curve above is scale / pi, so this grows monotonically
+    watt_hours = round(scale / math.pi * seconds / 3600, 3)
+
+    return {
+        "created": created.strftime(CREATED_FORMAT),
+        "nodeId": node_id,
+        "sourceId": source_id,
+        "localDate": created.strftime("%Y-%m-%d"),
+        "localTime": created.strftime("%H:%M"),
+        "watts": watts,
+        "wattHours": watt_hours,
+    }
+
+
+class StubServer:
+    """
+    A local SolarNetwork stand-in server, run on a background thread.
+
+    Example:
+        >>> with StubServer() as server:
+        ...     with SolarNetworkClient(server.credentials()) as client:
+        ...         client.request("GET", NODES_PATH).json()["data"]
+        [1, 2, 3]
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        tokens: Optional[Dict[str, str]] = None,
+        nodes: Optional[Dict[int, Sequence[str]]] = None,
+        interval: timedelta = timedelta(minutes=5),
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: int = 1,
+        max_page_size: Optional[int] = None,
+        seed: int = 0,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            host: The interface to listen on.
+            port: The port to listen on, or 0 for any free port.
+            tokens: The accepted token secrets, keyed by token.
+            nodes: The source IDs of each node.
+            interval: The time between synthetic datum of a stream.
+            latency: Seconds to delay every response by.
+            throttle_rate: The fraction of requests to answer with 429.
+            error_rate: The fraction of requests to answer with 500.
+            retry_after: The Retry-After seconds of throttled responses.
+            max_page_size: The most datum served per page, whatever `max` a
+                query requests, or None for no limit.
+            seed: The seed of the fault injection random generator.
+        """
+        self.tokens = tokens or {"test-token": "test-secret"}
+        self.nodes = nodes or {
+            1: ["/meter/1", "/inverter/1"],
+            2: ["/meter/1"],
+            3: ["/meter/1", "/weather/1"],
+        }
+        self.interval = interval
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.max_page_size = max_page_size
+        self.request_count = 0
+        # The (path, datum) of each POSTed JSON array
+        self.uploads: List[Tuple[str, List[Dict[str, Any]]]] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        """The host:port the server listens on."""
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        return f"http://{self.host}"
+
+    def credentials(self, token: Optional[str] = None) -> SolarNetworkCredentials:
+        """
+        Get client credentials for the server.
+
+        Args:
+            token: The token to use, defaults to the first accepted token.
+
+        Returns:
+            The credentials.
+        """
+        token = token or next(iter(self.tokens))
+        return SolarNetworkCredentials(
+            token=token, secret=self.tokens[token], host=self.host, scheme="http"
+        )
+
+    def start(self) -> "StubServer":
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            # Poll often, so stopping the server is quick
+            kwargs={"poll_interval": 0.05},
+            name="stub-server",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread, until interrupted."""
+        self._server.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def inject_fault(self) -> Optional[int]:
+        """
+        Decide whether to fail the current request.
+
+        Returns:
+            The status to fail with, or None.
+        """
+        with self._lock:
+            self.request_count += 1
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 500
+        return None
+
+    def verify(
+        self,
+        method: str,
+        path: str,
+        query: Dict[str, List[str]],
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> Optional[str]:
+        """
+        Verify the SNWS2 signature of a request.
+
+        Args:
+            method: The HTTP method.
+            path: The request path.
+            query: The parsed query parameters.
+            headers: The request headers, with lower-case names.
+            body: The request body.
+
+        Returns:
+            Why the request is not authorized, or None if it is.
+        """
+        match = _AUTHORIZATION.fullmatch(headers.get("authorization", ""))
+        if match is None:
+            return "Missing or malformed Authorization header"
+
+        secret = self.tokens.get(match["token"])
+        if secret is None:
+            return "Unknown token"
+
+        names = match["headers"].split(";")
+        if "host" not in names or "x-sn-date" not in names:
+            return "The host and x-sn-date headers must be signed"
+
+        try:
+            date = datetime.strptime(
+                headers.get("x-sn-date", ""), "%a, %d %b %Y %H:%M:%S GMT"
+            ).replace(tzinfo=timezone.utc)
+        except ValueError:
+            return "Invalid x-sn-date header"
+        if abs(datetime.now(timezone.utc) - date) > _MAX_DATE_SKEW:
+            return "Request date too far from server time"
+
+        signed = {name: headers.get(name, "") for name in names}
+        expected = Snws2Signer(match["token"], secret).sign(
+            method, path, query, signed, body, date
+        )
+        if expected.rsplit("Signature=", 1)[1] != match["signature"]:
+            return "Invalid signature"
+
+        return None
+
+    def receive_upload(
+        self, path: str, headers: Dict[str, str], body: bytes
+    ) -> List[Dict[str, Any]]:
+        """
+        Decode and record a POSTed JSON array of datum.
+
+        Args:
+            path: The request path.
+            headers: The request headers, with lower-case names.
+            body: The request body, gzip compressed if its Content-Encoding says so.
+
+        Returns:
+            The datum.
+
+        Raises:
+            ValueError: If the body is not a JSON array.
+        """
+        encoding = headers.get("content-encoding", "identity")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding != "identity":
+            raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+        datum = json.loads(body)
+        if not isinstance(datum, list):
+            raise ValueError("Expected a JSON array of datum")
+
+        with self._lock:
+            self.uploads.append((path, datum))
+        return datum
+
+    def node_ids(self) -> List[int]:
+        """The IDs of the synthetic nodes."""
+        return sorted(self.nodes)
+
+    def reporting_range(self, node_id: int) -> Dict[str, Any]:
+        """
+        Get the reporting range of a node, from `REPORTING_START` to now.
+
+        Args:
+            node_id: The node ID.
+
+        Returns:
+            The range, as returned by a reporting range query.
+        """
+        end = datetime.now(timezone.utc)
+        return {
+            "nodeId": node_id,
+            "timeZone": "UTC",
+            "startDate": REPORTING_START.strftime("%Y-%m-%d %H:%M"),
+            "endDate": end.strftime("%Y-%m-%d %H:%M"),
+            "startDateMillis": int(REPORTING_START.timestamp() * 1000),
+            "endDateMillis": int(end.timestamp() * 1000),
+        }
+
+    def datum_page(
+        self, query: Dict[str, List[str]]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Get a page of synthetic datum for a `/datum/list` query.
+
+        Datum are ordered by timestamp, then node and source ID.
+
+        Args:
+            query: The parsed query parameters.
+
+        Returns:
+            The total number of matching datum, and the requested page.
+
+        Raises:
+            ValueError: If the query is invalid.
+        """
+
+        def values(*names: str) -> List[str]:
+            found = []
+            for name in names:
+                for value in query.get(name, []):
+                    found.extend(v for v in value.split(",") if v)
+            return found
+
+        node_ids = [int(n) for n in values("nodeId", "nodeIds")]
+        if not node_ids:
+            raise ValueError("nodeId is required")
+        source_ids = values("sourceId", "sourceIds")
+
+        streams = [
+            (node_id, source_id)
+            for node_id in sorted(set(node_ids))
+            for source_id in sorted(self.nodes.get(node_id, ()))
+            if not source_ids or any(s in ("*", "*/**", source_id) for s in source_ids)
+        ]
+
+        now = datetime.now(timezone.utc)
+        end = _parse_date(query.get("endDate", [""])[0]) or now
+        start = _parse_date(query.get("startDate", [""])[0]) or end - timedelta(days=1)
+        end = min(end, now)
+
+        step = self.interval.total_seconds()
+        first = math.ceil(start.timestamp() / step)
+        last = math.ceil(end.timestamp() / step)  # exclusive
+        total = max(0, last - first) * len(streams)
+
+        offset = int(query.get("offset", ["0"])[0])
+        page_size = int(query.get("max", ["1000"])[0])
+        if self.max_page_size is not None:
+            page_size = min(page_size, self.max_page_size)
+        page = []
+        for i in range(offset, min(total, offset + page_size)):
+            slot, stream = divmod(i, len(streams))
+            created = datetime.fromtimestamp((first + slot) * step, timezone.utc)
+            page.append(synthetic_datum(*streams[stream], created))
+
+        return total, page
+
+
+def _negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Choose gzip or deflate from an Accept-Encoding header, if accepted."""
+    accepted = {
+        value.split(";")[0].strip().lower() for value in accept_encoding.split(",")
+    }
+    for encoding in ("gzip", "deflate"):
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    return zlib.compress(body, 6)
+
+
+def _make_handler(server: StubServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; don't let Nagle delay the body
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            self._handle()
+
+        def do_POST(self) -> None:
+            self._handle()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _handle(self) -> None:
+            url = urlsplit(self.path)
+            query = parse_qs(url.query, keep_blank_values=True)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+
+            if server.latency:
+                time.sleep(server.latency)
+
+            fault = server.inject_fault()
+            if fault == 429:
+                self._send_json(
+                    429,
+                    {"success": False, "message": "Too many requests"},
+                    {"Retry-After": str(server.retry_after)},
+                )
+                return
+            if fault is not None:
+                self._send_json(fault, {"success": False, "message": "Server error"})
+                return
+
+            headers = {k.lower(): v for k, v in self.headers.items()}
+            reason = server.verify(self.command, url.path, query, headers, body)
+            if reason is not None:
+                self._send_json(403, {"success": False, "message": reason})
+                return
+
+            csv_requested = "text/csv" in headers.get("accept", "")
+            if self.command == "POST":
+                try:
+                    datum = server.receive_upload(url.path, headers, body)
+                except (OSError, ValueError) as e:
+                    self._send_json(422, {"success": False, "message": str(e)})
+                    return
+                self._send_json(200, {"success": True, "data": {"count": len(datum)}})
+            elif url.path == NODES_PATH:
+                self._send_json(200, {"success": True, "data": server.node_ids()})
+            elif url.path in (SOURCES_PATH, REPORTING_RANGE_PATH):
+                node_ids = query.get("nodeId", [""])[0]
+                if not node_ids.isdigit():
+                    self._send_json(
+                        422, {"success": False, "message": "nodeId is required"}
+                    )
+                    return
+                node_id = int(node_ids)
+                if url.path == SOURCES_PATH:
+                    data: Any = [
+                        {"nodeId": node_id, "sourceId": source_id}
+                        for source_id in sorted(server.nodes.get(node_id, ()))
+                    ]
+                else:
+                    data = server.reporting_range(node_id)
+                self._send_json(200, {"success": True, "data": data})
+            elif url.path == DATUM_LIST_PATH:
+                try:
+                    total, page = server.datum_page(query)
+                except ValueError as e:
+                    self._send_json(422, {"success": False, "message": str(e)})
+                    return
+                if csv_requested:
+                    self._send_csv(page)
+                else:
+                    self._send_json(
+                        200,
+                        {
+                            "success": True,
+                            "data": {
+                                "totalResults": total,
+                                "startingOffset": int(query.get("offset", ["0"])[0]),
+                                "returnedResultCount": len(page),
+                                "results": page,
+                            },
+                        },
+                    )
+            else:
+                self._send_json(404, {"success": False, "message": "Not found"})
+
+        def _send_json(
+            self,
+            status: int,
+            body: Dict[str, Any],
+            headers: Optional[Dict[str, str]] = None,
+        ) -> None:
+            self._send(
+                status,
+                json.dumps(body).encode("utf-8"),
+                "application/json;charset=UTF-8",
+                headers,
+            )
+
+        def _send_csv(self, page: List[Dict[str, Any]]) -> None:
+            out = io.StringIO()
+            writer = csv.DictWriter(out, _CSV_COLUMNS, lineterminator="\r\n")
+            writer.writeheader()
+            writer.writerows(page)
+            self._send(200, out.getvalue().encode("utf-8"), "text/csv;charset=UTF-8")
+
+        def _send(
+            self,
+            status: int,
+            body: bytes,
+            content_type: str,
+            headers: Optional[Dict[str, str]] = None,
+        ) -> None:
+            encoding = _negotiate_encoding(self.headers.get("Accept-Encoding", ""))
+            if encoding is not None and len(body) >= _MIN_COMPRESS_SIZE:
+                body = _compress(body, encoding)
+            else:
+                encoding = None
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            if encoding is not None:
+                self.send_header("Content-Encoding", encoding)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Run the stub server standalone."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--token", default="test-token")
+    parser.add_argument("--secret", default="test-secret")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-page-size", type=int)
+    args = parser.parse_args(argv)
+
+    server = StubServer(
+        host=args.host,
+        port=args.port,
+        tokens={args.token: args.secret},
+        latency=args.latency,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        max_page_size=args.max_page_size,
+    )
+    print(f"Serving SolarNetwork stand-in on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
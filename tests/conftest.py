@@ -21,6 +21,8 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
+pytest_plugins = ["wattmaven_solarnetwork_tools.testing.fixtures"]
+
 
 @pytest.fixture
 def credentials():
@@ -0,0 +1,155 @@
+import csv
+import json
+import subprocess
+import sys
+
+import pytest
+
+from wattmaven_solarnetwork_tools.cli import export
+from wattmaven_solarnetwork_tools.core.datum_store import DatumStore
+
+
+@pytest.fixture
+def run(stub_server, monkeypatch):
+    monkeypatch.setenv("SOLARNETWORK_TOKEN", "test-token")
+    monkeypatch.setenv("SOLARNETWORK_SECRET", "test-secret")
+
+    def run(*args):
+        return export.main(
+            [
+                "--host",
+                stub_server.host,
+                "--scheme",
+                "http",
+                "--node-id",
+                "1,3",
+                "--start",
+                "2025-01-01",
+                "--end",
+                "2025-01-02",
+                "--window-days",
+                "0.25",
+                *args,
+            ]
+        )
+
+    return run
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.unit
+def test_export_csv(run, tmp_path, capsys):
+    path = tmp_path / "out.csv"
+
+    assert run("--output", str(path)) == 0
+
+    rows = read_csv(path)
+    # Two nodes with two sources each, one datum every 5 minutes for a day
+    assert len(rows) == 4 * 288
+    assert list(rows[0])[:3] == ["created", "nodeId", "sourceId"]
+    assert [r["created"] for r in rows] == sorted(r["created"] for r in rows)
+    assert "rows/s" in capsys.readouterr().err
+
+
+@pytest.mark.unit
+def test_export_jsonl_to_stdout(run, capsys):
+    assert run("--format", "jsonl", "--source-id", "/meter/1", "--quiet") == 0
+
+    out, err = capsys.readouterr()
+    datum = [json.loads(line) for line in out.splitlines()]
+    assert len(datum) == 2 * 288
+    assert {d["sourceId"] for d in datum} == {"/meter/1"}
+    assert err == ""
+
+
+@pytest.mark.unit
+def test_export_columnar(run, tmp_path):
+    root = tmp_path / "store"
+
+    assert run("--format", "columnar", "--output", str(root), "-q") == 0
+    # Exporting again skips the datum that are already stored
+    assert run("--format", "columnar", "--output", str(root), "-q") == 0
+
+    store = DatumStore(str(root))
+    assert store.streams() == [
+        (1, "/inverter/1"),
+        (1, "/meter/1"),
+        (3, "/meter/1"),
+        (3, "/weather/1"),
+    ]
+    assert len(store.query(1, "/meter/1")) == 288
+
+
+@pytest.mark.unit
+def test_export_resumes_from_progress(run, tmp_path, monkeypatch):
+    expected = tmp_path / "expected.csv"
+    assert run("--output", str(expected), "-q") == 0
+
+    path = tmp_path / "out.csv"
+    progress = tmp_path / "progress.json"
+    write = export.CsvWriter.write
+    calls = []
+
+    def failing_write(self, datum):
+        calls.append(len(datum))
+        if len(calls) == 3:
+            # Interrupted partway through a window
+            write(self, datum[:10])
+            raise KeyboardInterrupt
+        write(self, datum)
+
+    monkeypatch.setattr(export.CsvWriter, "write", failing_write)
+    with pytest.raises(KeyboardInterrupt):
+        run("--output", str(path), "--progress", str(progress), "-q")
+    assert json.loads(progress.read_text())["completedUntil"] == "2025-01-01T12:00:00"
+
+    monkeypatch.setattr(export.CsvWriter, "write", write)
+    assert run("--output", str(path), "--progress", str(progress), "-q") == 0
+    assert path.read_text() == expected.read_text()
+
+    # A completed export has nothing left to do
+    assert run("--output", str(path), "--progress", str(progress), "-q") == 0
+    assert path.read_text() == expected.read_text()
+
+
+@pytest.mark.unit
+def test_export_rejects_progress_to_stdout(run, tmp_path):
+    with pytest.raises(SystemExit) as e:
+        run("--progress", str(tmp_path / "progress.json"))
+    assert e.value.code == 2
+
+
+@pytest.mark.unit
+def test_export_rejects_progress_of_another_export(run, tmp_path):
+    progress = tmp_path / "progress.json"
+    progress.write_text(json.dumps({"selector": {}, "completedUntil": "2025-01-01"}))
+
+    with pytest.raises(SystemExit) as e:
+        run("--output", str(tmp_path / "out.csv"), "--progress", str(progress))
+    assert e.value.code == 2
+
+
+@pytest.mark.unit
+def test_export_requires_credentials(monkeypatch, capsys):
+    monkeypatch.delenv("SOLARNETWORK_TOKEN", raising=False)
+
+    with pytest.raises(SystemExit) as e:
+        export.main(["--node-id", "1", "--start", "2025-01-01", "--end", "2025-01-02"])
+
+    assert e.value.code == 2
+    assert "SOLARNETWORK_TOKEN" in capsys.readouterr().err
+
+
+@pytest.mark.unit
+def test_export_imports_requests_lazily():
+    code = (
+        "import sys\n"
+        "import wattmaven_solarnetwork_tools.cli.export\n"
+        "assert 'requests' not in sys.modules, 'requests was imported'\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
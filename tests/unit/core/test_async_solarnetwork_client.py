@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.async_solarnetwork_client import (
+    AsyncSolarNetworkClient,
+    RequestSpec,
+)
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkCredentials,
+)
+
+httpx = pytest.importorskip("httpx")
+
+
+def make_credentials():
+    return SolarNetworkCredentials(token="test_token", secret="test_secret")
+
+
+@pytest.mark.unit
+def test_request_is_signed():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"success": True})
+
+    async def run():
+        async with AsyncSolarNetworkClient(
+            make_credentials(), transport=httpx.MockTransport(handler)
+        ) as client:
+            return await client.request(
+                "GET", "/solarquery/api/v1/sec/nodes", params={"b": 2, "a": 1}
+            )
+
+    response = asyncio.run(run())
+
+    assert response.json()["success"] is True
+    request = seen[0]
+    assert request.url.host == "data.solarnetwork.net"
+    assert request.url.params["a"] == "1"
+    assert request.headers["Authorization"].startswith(
+        "SNWS2 Credential=test_token,"
+        "SignedHeaders=accept;accept-encoding;host;x-sn-date,Signature="
+    )
+
+
+@pytest.mark.unit
+def test_gather_bounds_requests_in_flight():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def run():
+        async with AsyncSolarNetworkClient(
+            make_credentials(),
+            max_in_flight=3,
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            return await client.gather(
+                RequestSpec("GET", f"/solarquery/api/v1/sec/{i}") for i in range(10)
+            )
+
+    responses = asyncio.run(run())
+
+    assert [r.json()["path"] for r in responses] == [
+        f"/solarquery/api/v1/sec/{i}" for i in range(10)
+    ]
+    assert peak == 3
@@ -1,8 +1,11 @@
 from datetime import datetime, timezone
+from urllib.parse import urlencode
 
 import pytest
 
 from wattmaven_solarnetwork_tools.core.authentication import (
+    Snws2Signer,
+    canonical_query_string,
     generate_auth_header,
     generate_canonical_request_message,
     generate_signing_key_hex,
@@ -142,3 +145,78 @@ def test_generate_auth_header():
 )
 def test_order_query_parameters_parametrize(test_input, expected):
     assert order_query_parameters(test_input) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"foo": 1},
+        {"foo": 1, "bar": 2},
+        {"sourceId": "*/**", "nodeId": 123, "startDate": "2025-01-07T00:00"},
+    ],
+)
+def test_canonical_query_string_matches_order_query_parameters(params):
+    assert canonical_query_string(params) == order_query_parameters(urlencode(params))
+
+
+@pytest.mark.unit
+def test_canonical_query_string_expands_sequences():
+    assert canonical_query_string({"foo": [1, 3], "bar": 2}) == "bar=2&foo=1&foo=3"
+    assert canonical_query_string({"foo": None, "bar": 2}) == "bar=2"
+    assert canonical_query_string(None) == ""
+
+
+@pytest.mark.unit
+def test_snws2_signer_matches_generate_auth_header():
+    dt = datetime(2024, 2, 4, 12, 30, 45, tzinfo=timezone.utc)
+    signed_headers = {
+        "host": "api.example.com",
+        "x-sn-date": "Sun, 04 Feb 2024 12:30:45 GMT",
+    }
+    body = '{"foo": 1}'
+
+    expected = generate_auth_header(
+        "test_token",
+        "test_secret",
+        "POST",
+        "/api/v1/data",
+        "foo=1&bar=2",
+        signed_headers,
+        body,
+        dt,
+    )
+
+    signer = Snws2Signer("test_token", "test_secret")
+    result = signer.sign(
+        "POST",
+        "/api/v1/data",
+        {"foo": 1, "bar": 2},
+        signed_headers,
+        body.encode("latin-1"),
+        dt,
+    )
+    assert result == expected
+
+    # Signing again on the same day reuses the cached key
+    assert (
+        signer.sign(
+            "POST", "/api/v1/data", {"foo": 1, "bar": 2}, signed_headers, body, dt
+        )
+        == expected
+    )
+
+
+@pytest.mark.unit
+def test_snws2_signer_rolls_signing_key_over_at_midnight():
+    signer = Snws2Signer("test_token", "test_secret")
+    before = datetime(2024, 2, 4, 23, 59, 59, tzinfo=timezone.utc)
+    after = datetime(2024, 2, 5, 0, 0, 0, tzinfo=timezone.utc)
+
+    key = signer.signing_key(before)
+    assert signer.signing_key(before) is key
+    assert signer.signing_key(after).hex() == generate_signing_key_hex(
+        "test_secret", after, "snws2_request"
+    )
+    assert signer.signing_key(after) != key
@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.client_pool import (
+    SolarNetworkClientPool,
+    TenantLimits,
+)
+from wattmaven_solarnetwork_tools.core.connection_pool import PoolOptions
+from wattmaven_solarnetwork_tools.core.records import NODES_PATH
+from wattmaven_solarnetwork_tools.testing.stub_server import StubServer
+
+TOKENS = {f"token-{i}": f"secret-{i}" for i in range(20)}
+
+
+@pytest.fixture
+def server():
+    with StubServer(tokens=TOKENS) as server:
+        yield server
+
+
+@pytest.mark.unit
+def test_routes_requests_by_credential_id(server):
+    with SolarNetworkClientPool() as pool:
+        for token in TOKENS:
+            pool.add(token, server.credentials(token))
+
+        assert len(pool) == len(TOKENS)
+        for token in TOKENS:
+            assert pool.get_json(token, NODES_PATH)["data"] == [1, 2, 3]
+            assert pool.client(token).credentials.token == token
+
+        pool.remove("token-0")
+        assert "token-0" not in pool
+        with pytest.raises(KeyError, match="token-0"):
+            pool.get_json("token-0", NODES_PATH)
+
+
+@pytest.mark.unit
+def test_tenants_share_one_connection_pool(server):
+    options = PoolOptions(pool_maxsize=4, pool_block=True)
+    with SolarNetworkClientPool(pool=options) as pool:
+        for token in TOKENS:
+            pool.add(token, server.credentials(token))
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            responses = list(
+                executor.map(
+                    lambda i: pool.request(f"token-{i % 20}", "GET", NODES_PATH),
+                    range(200),
+                )
+            )
+
+    assert all(r.status_code == 200 for r in responses)
+    assert pool.pool_stats.requests == 200
+    assert pool.pool_stats.connections_opened <= 4
+    assert pool.client("token-1").pool_stats is pool.pool_stats
+
+
+@pytest.mark.unit
+def test_blocks_for_a_free_connection_by_default():
+    # Without blocking, busy hosts get throwaway connections past pool_maxsize
+    with SolarNetworkClientPool() as pool:
+        assert pool.pool.pool_block
+
+
+@pytest.mark.unit
+def test_enforces_per_tenant_concurrency(server):
+    lock = threading.Lock()
+    in_flight = {}
+    peak = {}
+
+    with SolarNetworkClientPool(limits=TenantLimits(max_in_flight=2)) as pool:
+        pool.add("busy", server.credentials("token-0"))
+        pool.add("quiet", server.credentials("token-1"), TenantLimits(max_in_flight=1))
+        send = pool._session.send
+
+        def tracking_send(prepared, **kwargs):
+            token = prepared.headers["Authorization"].split("=")[1].split(",")[0]
+            with lock:
+                in_flight[token] = in_flight.get(token, 0) + 1
+                peak[token] = max(peak.get(token, 0), in_flight[token])
+            try:
+                time.sleep(0.01)
+                return send(prepared, **kwargs)
+            finally:
+                with lock:
+                    in_flight[token] -= 1
+
+        pool._session.send = tracking_send
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            list(
+                executor.map(
+                    lambda i: pool.get_json("busy" if i % 4 else "quiet", NODES_PATH),
+                    range(40),
+                )
+            )
+
+    assert peak == {"token-0": 2, "token-1": 1}
+
+
+@pytest.mark.unit
+def test_enforces_per_tenant_rate(server):
+    with SolarNetworkClientPool(limits=TenantLimits(rate=20, burst=1)) as pool:
+        pool.add("a", server.credentials("token-0"))
+        pool.add("b", server.credentials("token-1"))
+
+        start = time.monotonic()
+        for _ in range(5):
+            pool.get_json("a", NODES_PATH)
+            pool.get_json("b", NODES_PATH)
+        elapsed = time.monotonic() - start
+
+    # Each tenant waits for its own tokens only: 4 waits of 1/20s each
+    assert 0.18 <= elapsed < 0.4
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.coalescing import (
+    AsyncSingleFlight,
+    SingleFlight,
+    request_key,
+)
+
+
+@pytest.mark.unit
+def test_request_key_ignores_parameter_order():
+    assert request_key("GET", "/p", {"a": 1, "b": 2}, "application/json") == (
+        request_key("GET", "/p", {"b": 2, "a": 1}, "application/json")
+    )
+    assert request_key("GET", "/p", {"a": 1}, "text/csv") != request_key(
+        "GET", "/p", {"a": 1}, "application/json"
+    )
+
+
+@pytest.mark.unit
+def test_single_flight_shares_one_call_across_threads():
+    flights = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait(timeout=5)
+        return {"data": [1, 2, 3]}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(flights.do, "key", fn) for _ in range(8)]
+        time.sleep(0.1)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+
+    # Once finished, the next call for the key runs again
+    release.set()
+    flights.do("key", fn)
+    assert len(calls) == 2
+
+
+@pytest.mark.unit
+def test_single_flight_shares_errors():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn():
+        started.set()
+        release.wait(timeout=5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flights.do, "key", fn)
+        started.wait(timeout=5)
+        follower = executor.submit(flights.do, "key", fn)
+        time.sleep(0.1)
+        release.set()
+
+        with pytest.raises(RuntimeError):
+            leader.result()
+        with pytest.raises(RuntimeError):
+            follower.result()
+
+
+@pytest.mark.unit
+def test_async_single_flight_shares_one_call():
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"data": []}
+
+    async def run():
+        flights = AsyncSingleFlight()
+        results = await asyncio.gather(*(flights.do("key", fn) for _ in range(10)))
+        other = await flights.do("other", fn)
+        return results, other
+
+    results, other = asyncio.run(run())
+
+    assert len(calls) == 2
+    assert all(r is results[0] for r in results)
+    assert other == {"data": []}
+
+
+@pytest.mark.unit
+def test_async_single_flight_survives_caller_cancellation():
+    async def fn():
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def run():
+        flights = AsyncSingleFlight()
+        first = asyncio.ensure_future(flights.do("key", fn))
+        second = asyncio.ensure_future(flights.do("key", fn))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == 42
@@ -0,0 +1,75 @@
+import pytest
+
+from wattmaven_solarnetwork_tools.core.compression import (
+    accept_encoding,
+    supported_encodings,
+)
+from wattmaven_solarnetwork_tools.core.pagination import DATUM_LIST_PATH
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import SolarNetworkClient
+
+PARAMS = {
+    "nodeId": 1,
+    "sourceId": "*/**",
+    "startDate": "2025-01-01",
+    "endDate": "2025-01-02",
+    "max": 500,
+}
+
+
+@pytest.mark.unit
+def test_accept_encoding():
+    assert supported_encodings()[:2] == ("gzip", "deflate")
+    assert accept_encoding() == ", ".join(supported_encodings())
+    assert accept_encoding(["deflate", "gzip"]) == "deflate, gzip"
+    assert accept_encoding([]) == "identity"
+    with pytest.raises(ValueError, match="compress"):
+        accept_encoding(["compress"])
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("compression", [["gzip"], ["deflate"], []])
+def test_responses_are_negotiated_and_decoded(stub_credentials, compression):
+    spans = []
+    with SolarNetworkClient(
+        stub_credentials, compression=compression, hooks=[spans.append]
+    ) as client:
+        response = client.request("GET", DATUM_LIST_PATH, PARAMS)
+        data = response.json()["data"]
+
+    assert len(data["results"]) == 500
+    assert response.request.headers["Accept-Encoding"] == accept_encoding(compression)
+    assert "accept-encoding;" in response.request.headers["Authorization"]
+    if compression:
+        assert response.headers["Content-Encoding"] == compression[0]
+        # The wire size is counted, not the decoded size
+        assert spans[0].bytes_received < len(response.content) / 4
+    else:
+        assert "Content-Encoding" not in response.headers
+        assert spans[0].bytes_received == len(response.content)
+
+
+@pytest.mark.unit
+def test_csv_is_decompressed_while_streaming(stub_credentials):
+    with SolarNetworkClient(stub_credentials, compression=["gzip"]) as client:
+        response = client.request(
+            "GET", DATUM_LIST_PATH, PARAMS, accept="text/csv", stream=True
+        )
+        assert response.headers["Content-Encoding"] == "gzip"
+        response.close()
+
+        rows = list(client.iter_csv(DATUM_LIST_PATH, PARAMS, chunk_size=1024))
+        json_rows = client.get_json(DATUM_LIST_PATH, PARAMS)["data"]["results"]
+
+    assert len(rows) == 500
+    assert [r["watts"] for r in rows] == [str(r["watts"]) for r in json_rows]
+
+
+@pytest.mark.unit
+def test_accept_encoding_is_signed(stub_credentials):
+    with SolarNetworkClient(stub_credentials, compression=["gzip"]) as client:
+        prepared = client._prepare_request("GET", DATUM_LIST_PATH, PARAMS).prepare()
+        prepared.headers["Accept-Encoding"] = "identity"
+        response = client._session.send(prepared)
+
+    assert response.status_code == 403
+    assert response.json()["message"] == "Invalid signature"
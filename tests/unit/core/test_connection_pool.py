@@ -0,0 +1,72 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.connection_pool import (
+    PoolOptions,
+    PoolStats,
+    create_session,
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"success": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.unit
+def test_reuses_connections(server_url):
+    stats = PoolStats()
+    session = create_session(PoolOptions(), stats)
+
+    for _ in range(5):
+        assert session.get(server_url).status_code == 200
+
+    assert stats.requests == 5
+    assert stats.connections_opened == 1
+    assert stats.connections_reused == 4
+    # Cookies are never stored, so the session has no shared mutable state
+    assert len(session.cookies) == 0
+
+
+@pytest.mark.unit
+def test_blocking_pool_bounds_connections_across_threads(server_url):
+    stats = PoolStats()
+    session = create_session(PoolOptions(pool_maxsize=2, pool_block=True), stats)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(
+            executor.map(lambda _: session.get(server_url).status_code, range(40))
+        )
+
+    assert statuses == [200] * 40
+    assert stats.requests == 40
+    assert stats.connections_opened <= 2
+
+
+@pytest.mark.unit
+def test_pool_options_timeout():
+    assert PoolOptions(connect_timeout=1.5, read_timeout=None).timeout == (1.5, None)
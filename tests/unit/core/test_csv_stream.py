@@ -0,0 +1,66 @@
+import io
+
+import pytest
+import requests
+
+from wattmaven_solarnetwork_tools.core.csv_stream import (
+    iter_csv_batches,
+    iter_csv_rows,
+)
+from wattmaven_solarnetwork_tools.core.exceptions import SolarNetworkError
+
+CSV = (
+    "created,nodeId,sourceId,watts\r\n"
+    "2025-01-01 00:00:00.000Z,1,/méter/1,100\r\n"
+    '2025-01-01 00:05:00.000Z,1,"/meter/\n2",200\r\n'
+    "2025-01-01 00:10:00.000Z,1,/meter/1,300\r\n"
+).encode("utf-8")
+
+
+def make_response(body, status_code=200):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(body)
+    return response
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_iter_csv_rows(chunk_size):
+    rows = list(iter_csv_rows(make_response(CSV), chunk_size=chunk_size))
+
+    assert [row["watts"] for row in rows] == ["100", "200", "300"]
+    assert rows[0]["sourceId"] == "/méter/1"
+    assert rows[1]["sourceId"] == "/meter/\n2"
+
+
+@pytest.mark.unit
+def test_iter_csv_batches():
+    batches = list(iter_csv_batches(make_response(CSV), batch_size=2, chunk_size=5))
+
+    assert batches == [
+        {
+            "created": ["2025-01-01 00:00:00.000Z", "2025-01-01 00:05:00.000Z"],
+            "nodeId": ["1", "1"],
+            "sourceId": ["/méter/1", "/meter/\n2"],
+            "watts": ["100", "200"],
+        },
+        {
+            "created": ["2025-01-01 00:10:00.000Z"],
+            "nodeId": ["1"],
+            "sourceId": ["/meter/1"],
+            "watts": ["300"],
+        },
+    ]
+
+
+@pytest.mark.unit
+def test_iter_csv_batches_empty_body():
+    assert list(iter_csv_batches(make_response(b""))) == []
+
+
+@pytest.mark.unit
+def test_iter_csv_rows_raises_on_unsuccessful_response():
+    with pytest.raises(SolarNetworkError) as e:
+        list(iter_csv_rows(make_response(b"", status_code=403)))
+    assert e.value.status_code == 403
@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from wattmaven_solarnetwork_tools.core.datum_frame import DatumFrame
+
+RECORDS = [
+    {
+        "created": "2025-01-01 00:00:00.000Z",
+        "nodeId": 1,
+        "sourceId": "/meter/1",
+        "localDate": "2025-01-01",
+        "watts": 100,
+        "wattHours": 1000.5,
+    },
+    {
+        "created": "2025-01-01 00:05:00.000Z",
+        "nodeId": 2,
+        "sourceId": "/meter/2",
+        "watts": 200,
+        "status": "OK",
+    },
+    {
+        "created": "2025-01-01 00:10:00.000Z",
+        "nodeId": 1,
+        "sourceId": "/meter/1",
+        "watts": 300,
+        "wattHours": 1010.5,
+    },
+]
+
+
+@pytest.mark.unit
+def test_from_records():
+    frame = DatumFrame.from_records(RECORDS)
+
+    assert len(frame) == 3
+    assert list(frame.columns) == ["watts", "wattHours"]
+    assert frame.timestamps.dtype == np.dtype("datetime64[ms]")
+    assert frame.timestamps[1] == np.datetime64("2025-01-01T00:05:00.000")
+    assert frame.sources == ["/meter/1", "/meter/2"]
+    assert list(frame.source_codes) == [0, 1, 0]
+    np.testing.assert_array_equal(frame["watts"], [100.0, 200.0, 300.0])
+    assert np.isnan(frame["wattHours"][1])
+
+
+@pytest.mark.unit
+def test_from_columns_matches_from_records():
+    batch = {
+        "created": [r["created"] for r in RECORDS],
+        "nodeId": [str(r["nodeId"]) for r in RECORDS],
+        "sourceId": [r["sourceId"] for r in RECORDS],
+        "localDate": ["2025-01-01"] * 3,
+        "watts": ["100", "200", "300"],
+        "wattHours": ["1000.5", "", "1010.5"],
+        "status": ["", "OK", ""],
+    }
+
+    frame = DatumFrame.from_columns(batch)
+    expected = DatumFrame.from_records(RECORDS)
+
+    assert list(frame.columns) == ["watts", "wattHours"]
+    np.testing.assert_array_equal(frame.timestamps, expected.timestamps)
+    np.testing.assert_array_equal(frame.node_ids, expected.node_ids)
+    np.testing.assert_array_equal(frame.source_ids, expected.source_ids)
+    for name in frame.columns:
+        np.testing.assert_array_equal(frame[name], expected[name])
+
+
+@pytest.mark.unit
+def test_select_and_between():
+    frame = DatumFrame.from_records(RECORDS)
+
+    assert list(frame.select(node_ids=[1]).node_ids) == [1, 1]
+    assert list(frame.select(source_ids=["/meter/2"])["watts"]) == [200.0]
+
+    window = frame.between(
+        datetime(2025, 1, 1, 0, 5, tzinfo=timezone.utc), "2025-01-01 00:10:00Z"
+    )
+    assert list(window["watts"]) == [200.0]
+
+
+@pytest.mark.unit
+def test_concat_merges_sources_and_columns():
+    first = DatumFrame.from_records(RECORDS[:2])
+    second = DatumFrame.from_records(
+        [
+            {
+                "created": "2025-01-01 00:15:00.000Z",
+                "nodeId": 3,
+                "sourceId": "/meter/3",
+                "volts": 240,
+            },
+            RECORDS[0],
+        ]
+    )
+
+    frame = DatumFrame.concat([first, DatumFrame.empty(), second])
+
+    assert len(frame) == 4
+    assert frame.sources == ["/meter/1", "/meter/2", "/meter/3"]
+    assert list(frame.source_ids) == ["/meter/1", "/meter/2", "/meter/3", "/meter/1"]
+    assert set(frame.columns) == {"watts", "wattHours", "volts"}
+    assert frame["volts"][2] == 240.0
+    assert np.isnan(frame["volts"][0])
+
+
+@pytest.mark.unit
+def test_to_records_round_trip():
+    frame = DatumFrame.from_records(RECORDS).sort()
+
+    records = frame.to_records()
+
+    assert records[0] == {
+        "created": "2025-01-01 00:00:00.000Z",
+        "nodeId": 1,
+        "sourceId": "/meter/1",
+        "watts": 100.0,
+        "wattHours": 1000.5,
+    }
+    assert "wattHours" not in records[1]
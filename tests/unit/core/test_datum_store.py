@@ -0,0 +1,130 @@
+import math
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.datum_store import DatumStore, to_epoch_ms
+
+START = datetime(2025, 1, 1)
+
+
+def minutes(n, offset=0):
+    return [START + timedelta(minutes=offset + i) for i in range(n)]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("index_interval", [1, 3, 1024])
+def test_query_range(tmp_path, index_interval):
+    store = DatumStore(str(tmp_path), index_interval=index_interval)
+    store.append(1, "/meter/1", minutes(10), {"watts": [float(i) for i in range(10)]})
+    store.append(
+        1, "/meter/1", minutes(10, 10), {"watts": [float(i) for i in range(10, 20)]}
+    )
+
+    result = store.query(
+        1, "/meter/1", START + timedelta(minutes=5), START + timedelta(minutes=15)
+    )
+
+    assert list(result.columns["watts"]) == [float(i) for i in range(5, 15)]
+    assert result.timestamps[0] == to_epoch_ms(START + timedelta(minutes=5))
+    assert len(store.query(1, "/meter/1")) == 20
+    assert len(store.query(1, "/meter/1", end=START)) == 0
+    assert len(store.query(2, "/meter/1")) == 0
+
+
+@pytest.mark.unit
+def test_append_datum_adds_properties(tmp_path):
+    store = DatumStore(str(tmp_path))
+    store.append_datum(
+        1,
+        "/meter/1",
+        [
+            {"created": "2025-01-01 00:00:00.000Z", "watts": 1, "localDate": "x"},
+            # Whole-second timestamps may have no fraction
+            {"created": "2025-01-01 00:01:00Z", "watts": 2},
+        ],
+    )
+    store.append_datum(
+        1, "/meter/1", [{"created": "2025-01-01 00:02:00.000Z", "volts": 240.5}]
+    )
+
+    result = store.query(1, "/meter/1")
+
+    assert list(result.columns) == ["watts", "volts"]
+    assert list(result.timestamps) == [
+        to_epoch_ms(datetime(2025, 1, 1, 0, minute)) for minute in range(3)
+    ]
+    assert list(result.columns["watts"])[:2] == [1.0, 2.0]
+    assert math.isnan(result.columns["watts"][2])
+    assert math.isnan(result.columns["volts"][0])
+    assert result.columns["volts"][2] == 240.5
+    assert store.streams() == [(1, "/meter/1")]
+
+
+@pytest.mark.unit
+def test_rejects_out_of_order_rows(tmp_path):
+    store = DatumStore(str(tmp_path))
+    store.append(1, "a", minutes(2, 5), {"watts": [1.0, 2.0]})
+
+    with pytest.raises(ValueError):
+        store.append(1, "a", minutes(1), {"watts": [0.0]})
+    with pytest.raises(ValueError):
+        store.append(1, "a", list(reversed(minutes(2, 10))), {"watts": [0.0, 1.0]})
+
+
+@pytest.mark.unit
+def test_readers_see_appends_and_keep_earlier_views(tmp_path):
+    writer = DatumStore(str(tmp_path), index_interval=2)
+    reader = DatumStore(str(tmp_path), index_interval=2)
+    writer.append(1, "a", minutes(3), {"watts": [0.0, 1.0, 2.0]})
+
+    before = reader.query(1, "a")
+    writer.append(1, "a", minutes(3, 3), {"watts": [3.0, 4.0, 5.0]})
+    after = reader.query(1, "a", START + timedelta(minutes=2))
+
+    assert list(before.columns["watts"]) == [0.0, 1.0, 2.0]
+    assert list(after.columns["watts"]) == [2.0, 3.0, 4.0, 5.0]
+
+
+@pytest.mark.unit
+def test_rebuild_index(tmp_path):
+    store = DatumStore(str(tmp_path), index_interval=4)
+    store.append(1, "a", minutes(10), {"watts": [float(i) for i in range(10)]})
+    index_path = os.path.join(str(tmp_path), "1", "a", "index.i64")
+    os.remove(index_path)
+
+    assert store.rebuild_index(1, "a") == 3
+    result = DatumStore(str(tmp_path), index_interval=4).query(
+        1, "a", START + timedelta(minutes=6)
+    )
+    assert list(result.columns["watts"]) == [6.0, 7.0, 8.0, 9.0]
+
+
+@pytest.mark.unit
+def test_to_epoch_ms_is_exact():
+    # A float timestamp of this time rounds 1 ms low
+    value = datetime(2038, 1, 30, 8, 31, 15, 621000, tzinfo=timezone.utc)
+
+    assert to_epoch_ms(value) == 2148453075621
+
+
+@pytest.mark.unit
+def test_new_properties_are_published_after_their_columns(tmp_path, monkeypatch):
+    store = DatumStore(str(tmp_path))
+    store.append(1, "/meter/1", [1, 2], {"watts": [1.0, 2.0]})
+
+    write_meta = DatumStore._write_meta
+    published = []
+
+    def spy(self, stream, properties):
+        published.append(
+            {p: os.path.getsize(stream.column_path(p)) // 8 for p in properties}
+        )
+        write_meta(self, stream, properties)
+
+    monkeypatch.setattr(DatumStore, "_write_meta", spy)
+    store.append(1, "/meter/1", [3], {"volts": [240.0]})
+
+    # Both columns already held every row, including the one being appended
+    assert published == [{"watts": 3, "volts": 3}]
@@ -0,0 +1,153 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.export import (
+    export_datum,
+    split_time_windows,
+)
+from wattmaven_solarnetwork_tools.core.retry import RetryPolicy
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import SolarNetworkError
+
+
+class FakeClient:
+    """Serves one datum per hour, failing the first attempt of some windows."""
+
+    def __init__(self, fail_once=(), retry=None, status=429):
+        self.fail_once = set(fail_once)
+        self.status = status
+        self.calls = []
+        # By default, a client that does not retry throttled requests itself
+        self.retry = retry if retry is not None else RetryPolicy(max_retries=0)
+
+    def iter_datum(self, params, page_size=1000, prefetch=1):
+        start = datetime.strptime(params["startDate"], "%Y-%m-%dT%H:%M")
+        end = datetime.strptime(params["endDate"], "%Y-%m-%dT%H:%M")
+        self.calls.append(params["startDate"])
+        if params["startDate"] in self.fail_once:
+            self.fail_once.remove(params["startDate"])
+            raise SolarNetworkError("Request failed", self.status)
+
+        hours = int((end - start) / timedelta(hours=1))
+        # Return each window in reverse order, to check it is sorted
+        for i in reversed(range(hours)):
+            created = start + timedelta(hours=i)
+            yield {
+                "created": created.strftime("%Y-%m-%d %H:%M:%S.000Z"),
+                "nodeId": params["nodeId"],
+            }
+
+
+@pytest.mark.unit
+def test_split_time_windows():
+    windows = split_time_windows(
+        datetime(2025, 1, 1), datetime(2025, 1, 1, 10), timedelta(hours=4)
+    )
+
+    assert windows == [
+        (datetime(2025, 1, 1, 0), datetime(2025, 1, 1, 4)),
+        (datetime(2025, 1, 1, 4), datetime(2025, 1, 1, 8)),
+        (datetime(2025, 1, 1, 8), datetime(2025, 1, 1, 10)),
+    ]
+
+    with pytest.raises(ValueError):
+        split_time_windows(datetime(2025, 1, 1), datetime(2025, 1, 2), timedelta(0))
+
+
+@pytest.mark.unit
+def test_export_datum_yields_in_timestamp_order():
+    client = FakeClient()
+
+    datum = list(
+        export_datum(
+            client,
+            {"nodeId": 1},
+            datetime(2025, 1, 1),
+            datetime(2025, 1, 3),
+            window=timedelta(hours=5),
+            max_workers=3,
+        )
+    )
+
+    created = [d["created"] for d in datum]
+    assert len(created) == 48
+    assert created == sorted(created)
+    assert len(client.calls) == 10
+
+
+@pytest.mark.unit
+def test_export_datum_retries_only_the_failed_window():
+    client = FakeClient(fail_once={"2025-01-01T06:00"})
+
+    datum = list(
+        export_datum(
+            client,
+            {"nodeId": 1},
+            datetime(2025, 1, 1),
+            datetime(2025, 1, 1, 12),
+            window=timedelta(hours=3),
+            retry_delay=0,
+        )
+    )
+
+    assert len(datum) == 12
+    assert sorted(client.calls) == [
+        "2025-01-01T00:00",
+        "2025-01-01T03:00",
+        "2025-01-01T06:00",
+        "2025-01-01T06:00",
+        "2025-01-01T09:00",
+    ]
+
+
+@pytest.mark.unit
+def test_export_datum_raises_after_retries():
+    client = FakeClient(fail_once={"2025-01-01T00:00"})
+
+    with pytest.raises(SolarNetworkError):
+        list(
+            export_datum(
+                client,
+                {"nodeId": 1},
+                datetime(2025, 1, 1),
+                datetime(2025, 1, 1, 3),
+                window=timedelta(hours=3),
+                retries=0,
+            )
+        )
+
+
+@pytest.mark.unit
+def test_export_datum_does_not_repeat_client_retries():
+    client = FakeClient(fail_once={"2025-01-01T00:00"}, retry=RetryPolicy())
+
+    with pytest.raises(SolarNetworkError):
+        list(
+            export_datum(
+                client,
+                {"nodeId": 1},
+                datetime(2025, 1, 1),
+                datetime(2025, 1, 1, 3),
+                window=timedelta(hours=3),
+                retry_delay=0,
+            )
+        )
+    assert client.calls == ["2025-01-01T00:00"]
+
+
+@pytest.mark.unit
+def test_export_datum_raises_client_errors_at_once():
+    client = FakeClient(fail_once={"2025-01-01T00:00"}, status=403)
+
+    with pytest.raises(SolarNetworkError):
+        list(
+            export_datum(
+                client,
+                {"nodeId": 1},
+                datetime(2025, 1, 1),
+                datetime(2025, 1, 1, 3),
+                window=timedelta(hours=3),
+                retry_delay=0,
+            )
+        )
+    assert client.calls == ["2025-01-01T00:00"]
@@ -0,0 +1,110 @@
+import pytest
+
+from wattmaven_solarnetwork_tools.core.instrumentation import (
+    MetricsRegistry,
+    RequestSpan,
+)
+from wattmaven_solarnetwork_tools.core.records import NODES_PATH
+from wattmaven_solarnetwork_tools.core.retry import RetryPolicy
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkError,
+)
+from wattmaven_solarnetwork_tools.testing.stub_server import StubServer
+
+
+@pytest.mark.unit
+def test_span_phases_and_retries():
+    span = RequestSpan("GET", "/nodes")
+    span.attempts = 3
+    span.add_phase("send", 0.25)
+    span.add_phase("send", 0.5)
+    span.record_connect(0.1)
+    span.finish()
+
+    assert span.retries == 2
+    assert span.phases == {"send": 0.75, "connect": 0.1}
+    assert span.connections_opened == 1
+    assert not span.connection_reused
+    assert span.duration >= 0
+
+
+@pytest.mark.unit
+def test_metrics_render():
+    metrics = MetricsRegistry(buckets=[0.1, 1.0])
+    span = RequestSpan("GET", "/nodes", duration=0.5, status_code=200, attempts=2)
+    span.bytes_received = 42
+    span.add_phase("send", 0.5)
+    metrics(span)
+    metrics(RequestSpan("GET", "/nodes", duration=2.0, error="Timeout", attempts=1))
+
+    text = metrics.render()
+
+    assert (
+        'solarnetwork_client_requests_total{method="GET",path="/nodes",status="200"} 1'
+        in text
+    )
+    assert (
+        'solarnetwork_client_requests_total{method="GET",path="/nodes",status="error"} 1'
+        in text
+    )
+    assert (
+        'solarnetwork_client_request_duration_seconds_bucket{path="/nodes",le="0.1"} 0'
+        in text
+    )
+    assert (
+        'solarnetwork_client_request_duration_seconds_bucket{path="/nodes",le="1.0"} 1'
+        in text
+    )
+    assert (
+        'solarnetwork_client_request_duration_seconds_bucket{path="/nodes",le="+Inf"} 2'
+        in text
+    )
+    assert 'solarnetwork_client_request_duration_seconds_count{path="/nodes"} 2' in text
+    assert (
+        'solarnetwork_client_request_phase_seconds_total{path="/nodes",phase="send"} 0.5'
+        in text
+    )
+    assert 'solarnetwork_client_response_bytes_total{path="/nodes"} 42' in text
+    assert 'solarnetwork_client_retries_total{path="/nodes"} 1' in text
+    assert 'solarnetwork_client_connections_total{state="reused"} 2' in text
+    assert "# TYPE solarnetwork_client_request_duration_seconds histogram" in text
+
+
+@pytest.mark.unit
+def test_client_hooks_report_spans(stub_credentials):
+    spans = []
+    with SolarNetworkClient(stub_credentials, hooks=[spans.append]) as client:
+        client.get_json(NODES_PATH)
+        client.get_json(NODES_PATH)
+
+    first, second = spans
+    assert first.method == "GET"
+    assert first.path == NODES_PATH
+    assert first.status_code == 200
+    assert first.attempts == 1
+    assert first.bytes_received > 0
+    assert first.connections_opened == 1
+    assert set(first.phases) == {"prepare", "connect", "send", "download", "parse"}
+    # The second request reuses the pooled connection
+    assert second.connection_reused
+    assert "connect" not in second.phases
+
+
+@pytest.mark.unit
+def test_client_hooks_report_retries_and_errors():
+    spans = []
+    with StubServer(throttle_rate=1.0, retry_after=0) as server:
+        with SolarNetworkClient(
+            server.credentials(),
+            retry=RetryPolicy(max_retries=2, backoff_factor=0),
+            hooks=[spans.append],
+        ) as client:
+            with pytest.raises(SolarNetworkError):
+                client.get_json(NODES_PATH)
+
+    (span,) = spans
+    assert span.attempts == 3
+    assert span.retries == 2
+    assert span.status_code == 429
+    assert span.error == "SolarNetworkError"
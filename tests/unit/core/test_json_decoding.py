@@ -0,0 +1,31 @@
+import pytest
+
+from wattmaven_solarnetwork_tools.core.json_decoding import (
+    JSON_DECODERS,
+    get_json_decoder,
+)
+
+PAYLOAD = b'{"success": true, "data": [1, 2.5, "a", null]}'
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("name", JSON_DECODERS)
+def test_decoders_agree(name):
+    if name != "json":
+        pytest.importorskip(name)
+    decode = get_json_decoder(name)
+
+    assert decode(PAYLOAD) == {"success": True, "data": [1, 2.5, "a", None]}
+    with pytest.raises(ValueError):
+        decode(b"{not json")
+
+
+@pytest.mark.unit
+def test_default_decoder_is_available():
+    assert get_json_decoder()(b"[1]") == [1]
+
+
+@pytest.mark.unit
+def test_unknown_decoder():
+    with pytest.raises(ValueError, match="simdjson"):
+        get_json_decoder("simdjson")
@@ -0,0 +1,103 @@
+import random
+import time
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.merge import (
+    datum_timestamp,
+    merge_pages,
+    merge_streams,
+)
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import SolarNetworkClient
+from wattmaven_solarnetwork_tools.core.sync import StreamKey
+
+
+def _pages(items, page_size, fetched=None):
+    for offset in range(0, len(items), page_size):
+        if fetched is not None:
+            fetched.append(offset)
+        yield items[offset : offset + page_size]
+
+
+@pytest.mark.unit
+def test_merge_pages_orders_items():
+    rng = random.Random(1)
+    streams = [sorted(rng.sample(range(1000), 50)) for _ in range(10)]
+
+    merged = list(merge_pages([_pages(s, 7) for s in streams], key=lambda x: x))
+
+    assert merged == sorted(x for s in streams for x in s)
+
+
+@pytest.mark.unit
+def test_merge_pages_breaks_ties_by_stream():
+    streams = [[(1, "a"), (2, "a")], [], [(1, "c"), (3, "c")], [(1, "b")]]
+
+    merged = list(merge_pages([_pages(s, 1) for s in streams], key=lambda x: x[0]))
+
+    assert merged == [(1, "a"), (1, "c"), (1, "b"), (2, "a"), (3, "c")]
+
+
+@pytest.mark.unit
+def test_datum_timestamp_orders_by_time():
+    # As text, the whole second sorts after its fraction
+    whole = {"created": "2025-01-01 00:00:00Z"}
+    fraction = {"created": "2025-01-01 00:00:00.500Z"}
+
+    assert datum_timestamp(whole) < datum_timestamp(fraction)
+
+
+@pytest.mark.unit
+def test_merge_pages_bounds_read_ahead():
+    fetched = []
+    items = list(range(100))
+    merged = merge_pages(
+        [_pages(items, 10, fetched)], key=lambda x: x, read_ahead=2, max_workers=4
+    )
+
+    assert next(merged) == 0
+    # The page being merged, and two more ahead of it
+    time.sleep(0.2)
+    assert fetched == [0, 10, 20]
+    merged.close()
+
+
+@pytest.mark.unit
+def test_merge_pages_raises_stream_errors():
+    def failing():
+        yield [1, 2]
+        raise RuntimeError("Page failed")
+
+    merged = merge_pages([failing(), _pages([0, 3], 1)], key=lambda x: x)
+
+    with pytest.raises(RuntimeError, match="Page failed"):
+        list(merged)
+
+
+@pytest.mark.unit
+def test_merge_pages_validates_arguments():
+    with pytest.raises(ValueError):
+        merge_pages([], key=lambda x: x, read_ahead=0)
+    with pytest.raises(ValueError):
+        merge_pages([], key=lambda x: x, max_workers=0)
+
+
+@pytest.mark.unit
+def test_merge_streams(stub_credentials):
+    streams = [
+        StreamKey(3, "/weather/1"),
+        StreamKey(1, "/meter/1"),
+        StreamKey(2, "/meter/1"),
+    ]
+    params = {"startDate": "2025-01-01", "endDate": "2025-01-02"}
+    with SolarNetworkClient(stub_credentials) as client:
+        merged = list(merge_streams(client, streams, params, page_size=50))
+
+    assert len(merged) == 3 * 288
+    created = [datum_timestamp(d) for d in merged]
+    assert created == sorted(created)
+    assert [(d["nodeId"], d["sourceId"]) for d in merged[:3]] == [
+        (3, "/weather/1"),
+        (1, "/meter/1"),
+        (2, "/meter/1"),
+    ]
@@ -0,0 +1,195 @@
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.metadata_cache import MetadataCache
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+)
+from wattmaven_solarnetwork_tools.testing.stub_server import REPORTING_START
+
+
+class FakeClient:
+    """Counts metadata requests, optionally blocking or failing them."""
+
+    def __init__(self):
+        self.credentials = SolarNetworkCredentials(token="token", secret="secret")
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail = False
+
+    def _call(self, *call):
+        self.calls.append(call)
+        self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("Unavailable")
+
+    def list_nodes(self):
+        self._call("nodes")
+        return [1, 2]
+
+    def list_source_ids(self, node_id):
+        self._call("sources", node_id)
+        return [f"/meter/{node_id}"]
+
+    def reporting_range(self, node_id, source_ids=None):
+        self._call("range", node_id, source_ids)
+        return {"nodeId": node_id, "startDate": "2025-01-01 00:00"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.mark.unit
+def test_serves_fresh_entries_from_memory():
+    client = FakeClient()
+    with MetadataCache(client) as cache:
+        assert cache.nodes() == [1, 2]
+        assert cache.nodes() == [1, 2]
+        assert cache.source_ids(1) == ["/meter/1"]
+        assert cache.reporting_range(1, ["/b", "/a"])["nodeId"] == 1
+        assert cache.reporting_range(1, ["/a", "/b"])["nodeId"] == 1
+
+    assert client.calls == [
+        ("nodes",),
+        ("sources", 1),
+        ("range", 1, ["/a", "/b"]),
+    ]
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+@pytest.mark.unit
+def test_stale_entries_are_refreshed_in_the_background():
+    client = FakeClient()
+    clock = Clock()
+    with MetadataCache(
+        client, ttls={"nodes": timedelta(minutes=1)}, clock=clock
+    ) as cache:
+        cache.nodes()
+        clock.now += 120
+
+        # Served stale without waiting for the blocked refresh
+        client.release.clear()
+        assert cache.nodes() == [1, 2]
+        assert cache.nodes() == [1, 2]
+        assert cache.stale_hits == 2
+        client.release.set()
+
+        _wait_for(lambda: cache.nodes() and cache.hits == 1)
+        assert client.calls == [("nodes",), ("nodes",)]
+
+
+@pytest.mark.unit
+def test_expired_entries_are_fetched():
+    client = FakeClient()
+    clock = Clock()
+    with MetadataCache(
+        client,
+        ttls={"nodes": timedelta(minutes=1)},
+        max_stale=timedelta(minutes=1),
+        clock=clock,
+    ) as cache:
+        cache.nodes()
+        clock.now += 180
+        cache.nodes()
+
+    assert cache.misses == 2
+    assert client.calls == [("nodes",), ("nodes",)]
+
+
+@pytest.mark.unit
+def test_failed_refresh_keeps_the_stale_entry():
+    client = FakeClient()
+    clock = Clock()
+    with MetadataCache(client, clock=clock) as cache:
+        cache.source_ids(1)
+        clock.now += 7200
+        client.fail = True
+
+        assert cache.source_ids(1) == ["/meter/1"]
+        _wait_for(lambda: len(client.calls) == 2 and not cache._refreshing)
+        assert cache.source_ids(1) == ["/meter/1"]
+
+
+@pytest.mark.unit
+def test_concurrent_misses_are_coalesced():
+    client = FakeClient()
+    client.release.clear()
+    with MetadataCache(client) as cache:
+        threads = [threading.Thread(target=cache.nodes) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: len(client.calls) == 1)
+        client.release.set()
+        for thread in threads:
+            thread.join()
+
+    assert client.calls == [("nodes",)]
+
+
+@pytest.mark.unit
+def test_snapshot_starts_warm(tmp_path):
+    path = str(tmp_path / "metadata.json")
+    with MetadataCache(FakeClient(), snapshot_path=path) as cache:
+        cache.prefetch(ranges=True)
+        assert len(cache) == 5
+
+    client = FakeClient()
+    with MetadataCache(client, snapshot_path=path) as cache:
+        assert cache.nodes() == [1, 2]
+        assert cache.source_ids(2) == ["/meter/2"]
+        assert cache.reporting_range(2)["nodeId"] == 2
+    assert client.calls == []
+
+    # Snapshots of other credentials are not used
+    client = FakeClient()
+    client.credentials.token = "other"
+    with MetadataCache(client, snapshot_path=path) as cache:
+        assert len(cache) == 0
+        cache.nodes()
+    assert client.calls == [("nodes",)]
+    with open(path) as f:
+        snapshot = f.read()
+    assert "other" not in snapshot
+    assert json.loads(snapshot)["identity"] == cache._identity()
+    if os.name == "posix":
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+
+@pytest.mark.unit
+def test_invalidate():
+    client = FakeClient()
+    with MetadataCache(client) as cache:
+        cache.nodes()
+        cache.source_ids(1)
+        cache.invalidate("sources")
+        assert len(cache) == 1
+        cache.invalidate()
+        assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_client_metadata_queries(stub_server):
+    with SolarNetworkClient(stub_server.credentials()) as client:
+        assert client.list_source_ids(1) == ["/inverter/1", "/meter/1"]
+        reporting_range = client.reporting_range(3, ["/meter/1"])
+
+    assert reporting_range["startDateMillis"] == REPORTING_START.timestamp() * 1000
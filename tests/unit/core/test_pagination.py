@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.pagination import iter_pages
+
+
+def make_fetcher(total, with_total=True):
+    calls = []
+
+    def fetch_page(offset, page_size=10):
+        calls.append(offset)
+        results = list(range(offset, min(offset + page_size, total)))
+        data = {"startingOffset": offset, "results": results}
+        if with_total:
+            data["totalResults"] = total
+        return data
+
+    return fetch_page, calls
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+@pytest.mark.parametrize("with_total", [True, False])
+def test_iter_pages(prefetch, with_total):
+    fetch_page, calls = make_fetcher(25, with_total)
+
+    pages = list(iter_pages(fetch_page, 10, prefetch))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [d for page in pages for d in page] == list(range(25))
+    assert calls == [0, 10, 20]
+
+
+@pytest.mark.unit
+def test_iter_pages_exact_multiple_of_page_size():
+    fetch_page, calls = make_fetcher(20)
+
+    assert sum(len(page) for page in iter_pages(fetch_page, 10)) == 20
+    assert calls == [0, 10]
+
+
+@pytest.mark.unit
+def test_iter_pages_stops_on_an_empty_page():
+    # The total over-reports, e.g. datum deleted during the query
+    def fetch_page(offset):
+        results = list(range(offset, min(offset + 10, 15)))
+        return {"results": results, "totalResults": 30}
+
+    pages = list(iter_pages(fetch_page, 10, prefetch=0))
+
+    assert [len(page) for page in pages] == [10, 5, 0]
+
+
+@pytest.mark.unit
+def test_iter_pages_propagates_errors():
+    def fetch_page(offset):
+        if offset > 0:
+            raise RuntimeError("boom")
+        return {"results": list(range(10))}
+
+    pages = iter_pages(fetch_page, 10, prefetch=2)
+    assert len(next(pages)) == 10
+    with pytest.raises(RuntimeError, match="boom"):
+        next(pages)
+
+
+@pytest.mark.unit
+def test_iter_pages_stops_worker_when_closed():
+    fetch_page, calls = make_fetcher(10_000)
+
+    pages = iter_pages(fetch_page, 10, prefetch=2)
+    next(pages)
+    pages.close()
+
+    for thread in threading.enumerate():
+        if thread.name == "datum-prefetch":
+            thread.join(timeout=1)
+            assert not thread.is_alive()
+    # Only the consumed page plus a bounded number of prefetched pages were fetched
+    assert len(calls) <= 4
+
+
+@pytest.mark.unit
+def test_iter_pages_validates_arguments():
+    fetch_page, _ = make_fetcher(1)
+
+    with pytest.raises(ValueError):
+        iter_pages(fetch_page, 0)
+    with pytest.raises(ValueError):
+        iter_pages(fetch_page, 10, prefetch=-1)
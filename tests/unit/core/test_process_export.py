@@ -0,0 +1,117 @@
+import multiprocessing
+import pickle
+from datetime import datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from wattmaven_solarnetwork_tools.core.datum_frame import DatumFrame
+from wattmaven_solarnetwork_tools.core.process_export import (
+    ClientSpec,
+    SharedFrame,
+    export_frames,
+)
+from wattmaven_solarnetwork_tools.core.retry import RetryPolicy
+
+RECORDS = [
+    {
+        "created": "2025-01-01 00:00:00.000Z",
+        "nodeId": 1,
+        "sourceId": "/meter/1",
+        "watts": 100,
+    },
+    {
+        "created": "2025-01-01 00:05:00.000Z",
+        "nodeId": 2,
+        "sourceId": "/meter/2",
+        "watts": 200,
+        "wattHours": 10.5,
+    },
+]
+
+
+def to_kilowatts(frame):
+    """A picklable transform run in the worker processes."""
+    frame.columns["watts"] = frame.columns["watts"] / 1000
+    return frame
+
+
+@pytest.mark.unit
+def test_shared_frame_round_trip():
+    frame = DatumFrame.from_records(RECORDS)
+
+    shared = SharedFrame.write(frame)
+    shared = pickle.loads(pickle.dumps(shared))
+    copy = shared.read()
+
+    assert copy.to_records() == frame.to_records()
+    assert copy.timestamps.dtype == frame.timestamps.dtype
+
+
+@pytest.mark.unit
+def test_shared_frame_empty():
+    shared = SharedFrame.write(DatumFrame.empty())
+
+    assert shared.name is None
+    assert len(shared.read()) == 0
+
+
+@pytest.mark.unit
+def test_client_spec_is_picklable(stub_credentials):
+    spec = ClientSpec(stub_credentials, retry=RetryPolicy(max_retries=1))
+
+    spec = pickle.loads(pickle.dumps(spec))
+    with spec.create_client() as client:
+        assert client.retry.max_retries == 1
+        assert client.list_nodes() == [1, 2, 3]
+
+
+@pytest.mark.unit
+# The default start method is fork on Linux, whose workers must not leave the
+# shared memory blocks to a resource tracker
+@pytest.mark.parametrize("start_method", [None, "spawn"])
+# The stub server runs on a thread, which Python warns of when forking
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")
+def test_export_frames(stub_credentials, start_method):
+    spec = ClientSpec(stub_credentials)
+    params = {"nodeId": 1, "sourceId": "/meter/1"}
+    start = datetime(2025, 1, 1)
+
+    windows = list(
+        export_frames(
+            spec,
+            params,
+            start,
+            start + timedelta(days=2),
+            window=timedelta(hours=12),
+            processes=2,
+            properties=["watts"],
+            transform=to_kilowatts,
+            mp_context=start_method and multiprocessing.get_context(start_method),
+        )
+    )
+
+    assert [w[0] for w in windows] == [
+        start + timedelta(hours=12 * i) for i in range(4)
+    ]
+    assert all(len(frame) == 144 for _, _, frame in windows)
+    frame = DatumFrame.concat(frame for _, _, frame in windows)
+    assert list(frame.columns) == ["watts"]
+    assert np.nanmax(frame["watts"]) < 10
+    timestamps = frame.timestamps.astype(np.int64)
+    assert (np.diff(timestamps) > 0).all()
+
+
+@pytest.mark.unit
+def test_export_frames_rejects_invalid_processes(stub_credentials):
+    with pytest.raises(ValueError):
+        next(
+            export_frames(
+                ClientSpec(stub_credentials),
+                {},
+                datetime(2025, 1, 1),
+                datetime(2025, 1, 2),
+                processes=0,
+            )
+        )
@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.query_planner import (
+    Density,
+    DensityKey,
+    DensityStore,
+    QueryPlanner,
+)
+
+
+class FakeClient:
+    """Serves datum at a fixed interval per source, in pages."""
+
+    def __init__(self, intervals):
+        self.intervals = intervals
+        self.windows = []
+
+    def iter_datum_pages(self, params, page_size=1000, prefetch=1):
+        start = datetime.strptime(params["startDate"], "%Y-%m-%dT%H:%M")
+        end = datetime.strptime(params["endDate"], "%Y-%m-%dT%H:%M")
+        self.windows.append((start, end))
+
+        interval = self.intervals[params["sourceId"]]
+        count = int((end - start) / interval)
+        datum = [
+            {
+                "created": (start + i * interval).strftime("%Y-%m-%d %H:%M:%S.000Z"),
+                "nodeId": params["nodeId"],
+                "sourceId": params["sourceId"],
+            }
+            for i in range(count)
+        ]
+        for offset in range(0, max(count, 1), page_size):
+            yield datum[offset : offset + page_size]
+
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.mark.unit
+def test_planner_sizes_windows_to_density():
+    client = FakeClient({"/fast": timedelta(seconds=10), "/slow": timedelta(hours=1)})
+    planner = QueryPlanner(client, page_size=100, target_pages=1)
+
+    fast = list(planner.iter_windows(1, "/fast", START, START + timedelta(days=1)))
+    # The first window is a guess, the rest hold one page each
+    assert fast[0].pages > 1
+    assert all(len(w.datum) == 100 for w in fast[1:-1])
+    assert sum(len(w.datum) for w in fast) == 8640
+
+    # Windows grow at most fourfold from the first guess
+    slow = list(planner.iter_windows(1, "/slow", START, START + timedelta(days=90)))
+    assert [len(w.datum) for w in slow[:3]] == [24, 96, 100]
+    assert all(len(w.datum) == 100 for w in slow[2:-1])
+    planner.close()
+
+
+@pytest.mark.unit
+def test_planner_uses_history():
+    client = FakeClient({"/meter": timedelta(minutes=1)})
+    store = DensityStore()
+    planner = QueryPlanner(client, store, page_size=60, target_pages=1)
+
+    list(planner.iter_windows(1, "/meter", START, START + timedelta(days=1)))
+    density = store.get(DensityKey(1, "/meter"))
+    assert density.rows_per_second == pytest.approx(1 / 60)
+
+    client.windows.clear()
+    list(planner.iter_windows(1, "/meter", START, START + timedelta(hours=3)))
+    assert client.windows[0] == (START, START + timedelta(hours=1))
+    assert len(client.windows) == 3
+    store.close()
+
+
+@pytest.mark.unit
+def test_planner_limits_growth_and_window_bounds():
+    planner = QueryPlanner(
+        FakeClient({}),
+        DensityStore(),
+        min_window=timedelta(minutes=10),
+        max_window=timedelta(days=7),
+        max_growth=2,
+    )
+    key = DensityKey(1, "/meter", "Hour")
+
+    assert planner.window_for(key) == timedelta(days=1)
+
+    planner.record(key, 0, timedelta(days=1))
+    assert planner.window_for(key) == timedelta(days=7)
+    assert planner.window_for(key, timedelta(days=1)) == timedelta(days=2)
+
+    planner.record(key, 10**9, timedelta(days=1))
+    assert planner.window_for(key) == timedelta(minutes=10)
+    planner.store.close()
+
+
+@pytest.mark.unit
+def test_density_observe_decays_history():
+    density = Density(0, 0).observe(100, 100, 0.5).observe(0, 100, 0.5)
+
+    assert density.rows == 50
+    assert density.seconds == 150
+
+
+@pytest.mark.unit
+def test_density_store_observe_is_atomic():
+    key = DensityKey(1, "/meter")
+    with DensityStore() as store:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # Without decay, a lost observation would show in the totals
+            for _ in range(200):
+                executor.submit(store.observe, key, 1, 1, 1)
+
+        assert store.get(key) == Density(200, 200)
+
+
+@pytest.mark.unit
+def test_density_store_persists(tmp_path):
+    path = str(tmp_path / "density.db")
+    key = DensityKey(1, "/meter", "Day")
+    with DensityStore(path) as store:
+        store.put(key, Density(10, 20))
+
+    with DensityStore(path) as store:
+        assert store.get(key) == Density(10, 20)
+        assert store.all() == {key: Density(10, 20)}
+        assert store.get(DensityKey(1, "/meter")) is None
+
+
+@pytest.mark.unit
+def test_planner_rejects_invalid_arguments():
+    with pytest.raises(ValueError):
+        QueryPlanner(FakeClient({}), decay=1)
+    with pytest.raises(ValueError):
+        QueryPlanner(FakeClient({}), min_window=timedelta(0))
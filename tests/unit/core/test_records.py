@@ -0,0 +1,129 @@
+import json
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.records import (
+    NODES_PATH,
+    Datum,
+    decode_datum,
+    decode_nodes,
+    decode_source_ids,
+    parse_created,
+)
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import SolarNetworkClient
+
+PARAMS = {
+    "nodeId": 1,
+    "sourceId": "*/**",
+    "startDate": "2025-01-01",
+    "endDate": "2025-01-02",
+}
+
+
+@pytest.mark.unit
+def test_parse_created():
+    expected = int(datetime(2025, 1, 1, 0, 5, tzinfo=timezone.utc).timestamp() * 1000)
+
+    assert parse_created("2025-01-01 00:05:00.000Z") == expected
+    assert parse_created("2025-01-01 00:05:00.250Z") == expected + 250
+    assert parse_created("2025-01-01 00:05:00Z") == expected
+    with pytest.raises(ValueError):
+        parse_created("yesterday")
+
+
+@pytest.mark.unit
+def test_decode_datum():
+    datum = [
+        {
+            "created": "2025-01-01 00:00:00.000Z",
+            "nodeId": 1,
+            "sourceId": "/meter/1",
+            "localDate": "2025-01-01",
+            "localTime": "13:00",
+            "watts": 5.0,
+            "wattHours": 100,
+        },
+        {
+            "created": "2025-01-01 00:00:00.000Z",
+            "nodeId": 1,
+            "sourceId": "/inverter/1",
+            "watts": 3.0,
+            "wattHours": 50,
+        },
+    ]
+
+    records = decode_datum(datum)
+
+    assert [r.source_id for r in records] == ["/meter/1", "/inverter/1"]
+    assert records[0].created == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    assert records[0]["watts"] == 5.0
+    assert records[1].get("wattHours") == 50
+    assert records[1].get("volts") is None
+    assert records[0].samples() == {"watts": 5.0, "wattHours": 100}
+    # Records with the same properties share one names tuple
+    assert records[0].names is records[1].names
+    with pytest.raises(KeyError):
+        records[0]["localDate"]
+    with pytest.raises(AttributeError):
+        records[0].extra = 1
+
+
+@pytest.mark.unit
+def test_records_are_smaller_than_dicts():
+    datum = {
+        "created": "2025-01-01 00:00:00.000Z",
+        "nodeId": 1,
+        "sourceId": "/meter/1",
+        "localDate": "2025-01-01",
+        "localTime": "13:00",
+        "watts": 5.0,
+        "wattHours": 100,
+    }
+    (record,) = decode_datum([datum])
+
+    assert sys.getsizeof(record) + sys.getsizeof(record.values) < sys.getsizeof(
+        json.loads(json.dumps(datum))
+    )
+
+
+@pytest.mark.unit
+def test_decode_nodes():
+    assert decode_nodes([1, 2]) == [1, 2]
+    with pytest.raises(ValueError):
+        decode_nodes({"results": []})
+
+
+@pytest.mark.unit
+def test_decode_source_ids():
+    assert decode_source_ids(["/a", {"nodeId": 1, "sourceId": "/b"}]) == ["/a", "/b"]
+    with pytest.raises(ValueError):
+        decode_source_ids([{"nodeId": 1}])
+
+
+@pytest.mark.unit
+def test_client_decodes_records(stub_credentials):
+    with SolarNetworkClient(stub_credentials) as client:
+        records = list(client.iter_datum_records(PARAMS, page_size=100))
+        datum = list(client.iter_datum(PARAMS, page_size=100))
+        nodes = client.list_nodes()
+
+    assert nodes == [1, 2, 3]
+    assert all(isinstance(r, Datum) for r in records)
+    assert records == decode_datum(datum)
+    assert len(records) == 2 * 288
+
+
+@pytest.mark.unit
+def test_client_uses_json_decoder(stub_credentials):
+    payloads = []
+
+    def decode(payload):
+        payloads.append(payload)
+        return json.loads(payload)
+
+    with SolarNetworkClient(stub_credentials, json_decoder=decode) as client:
+        assert client.get_json(NODES_PATH)["data"] == [1, 2, 3]
+
+    assert payloads == [b'{"success": true, "data": [1, 2, 3]}']
@@ -0,0 +1,135 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+import requests
+
+from wattmaven_solarnetwork_tools.core.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    is_immutable_query,
+)
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+)
+
+NOW = datetime(2025, 2, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "params,expected",
+    [
+        (None, False),
+        ({"nodeId": 1}, False),
+        ({"startDate": "2025-01-01"}, False),
+        ({"startDate": "2025-01-01", "endDate": "2025-02-01"}, True),
+        ({"endDate": "2025-02-01T11:30"}, False),
+        ({"endDate": "2025-02-01T10:30"}, True),
+        ({"localEndDate": "2025-02-01"}, False),
+        ({"localEndDate": "2025-01-30"}, True),
+        ({"endDate": "not a date"}, False),
+    ],
+)
+def test_is_immutable_query(params, expected):
+    assert is_immutable_query(params, now=NOW) is expected
+
+
+@pytest.mark.unit
+def test_put_and_get(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = ResponseCache.key("host", "token", "GET", "/path", {"a": 1}, "text/csv")
+
+    assert cache.get(key) is None
+    cache.put(key, CachedResponse(200, {"Content-Type": "text/csv"}, b"a,b\n1,2\n"))
+
+    cached = ResponseCache(str(tmp_path)).get(key)
+    assert cached == CachedResponse(200, {"Content-Type": "text/csv"}, b"a,b\n1,2\n")
+    assert cached.to_response("https://host/path").text == "a,b\n1,2\n"
+
+
+@pytest.mark.unit
+def test_evicts_least_recently_used(tmp_path):
+    content = bytes(range(256)) * 4  # Barely compressible
+    cache = ResponseCache(str(tmp_path))
+    cache.put("a", CachedResponse(200, {}, content))
+    entry_size = cache.total_bytes
+    cache.max_bytes = entry_size * 2
+
+    cache.put("b", CachedResponse(200, {}, content))
+    assert cache.get("a") is not None
+    cache.put("c", CachedResponse(200, {}, content))
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+@pytest.mark.unit
+def test_client_serves_hits_without_signing(tmp_path, monkeypatch):
+    client = SolarNetworkClient(
+        SolarNetworkCredentials(token="test_token", secret="test_secret"),
+        cache=ResponseCache(str(tmp_path)),
+    )
+    sent = []
+
+    def send(prepared, **kwargs):
+        sent.append(prepared)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"success": True, "data": []}).encode()
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    monkeypatch.setattr(client._session, "send", send)
+    params = {"nodeId": 1, "startDate": "2024-01-01", "endDate": "2024-02-01"}
+
+    first = client.request("GET", "/solarquery/api/v1/sec/datum/list", params)
+    monkeypatch.setattr(client._signer, "sign", pytest.fail)
+    second = client.request("GET", "/solarquery/api/v1/sec/datum/list", params)
+
+    assert len(sent) == 1
+    assert second.json() == first.json()
+    assert second.headers["content-type"] == "application/json"
+
+    # Ranges overlapping now are never served from the cache
+    monkeypatch.undo()
+    monkeypatch.setattr(client._session, "send", send)
+    client.request("GET", "/solarquery/api/v1/sec/datum/list", {"nodeId": 1})
+    client.request("GET", "/solarquery/api/v1/sec/datum/list", {"nodeId": 1})
+    assert len(sent) == 3
+
+
+@pytest.mark.unit
+def test_client_does_not_cache_unsuccessful_envelopes(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path))
+    client = SolarNetworkClient(
+        SolarNetworkCredentials(token="test_token", secret="test_secret"),
+        cache=cache,
+    )
+
+    def send(prepared, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"success": False, "message": "No"}).encode()
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    monkeypatch.setattr(client._session, "send", send)
+    params = {"nodeId": 1, "startDate": "2024-01-01", "endDate": "2024-02-01"}
+    client.request("GET", "/solarquery/api/v1/sec/datum/list", params)
+
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_get_of_an_evicted_file_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put("a", CachedResponse(200, {}, b"content"))
+    # As if another thread evicted the entry after the index lookup
+    (tmp_path / "a.z").unlink()
+
+    assert cache.get("a") is None
@@ -0,0 +1,215 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from wattmaven_solarnetwork_tools.core import solarnetwork_client
+from wattmaven_solarnetwork_tools.core.exceptions import SolarNetworkError
+from wattmaven_solarnetwork_tools.core.retry import (
+    AdaptiveRateLimiter,
+    RetryPolicy,
+    is_transient,
+)
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+)
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps({"success": status_code == 200}).encode()
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO()
+    return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(solarnetwork_client.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def make_client(responses, **kwargs):
+    client = SolarNetworkClient(
+        SolarNetworkCredentials(token="test_token", secret="test_secret"), **kwargs
+    )
+    sent = []
+
+    def send(prepared, **kwargs):
+        sent.append(prepared)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    client._session.send = send
+    return client, sent
+
+
+@pytest.mark.unit
+def test_backoff():
+    policy = RetryPolicy(backoff_factor=1.0, max_backoff=5.0, jitter=False)
+    assert [policy.backoff(a) for a in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+    policy = RetryPolicy(backoff_factor=1.0, max_backoff=5.0)
+    assert all(0 <= policy.backoff(3) <= 4.0 for _ in range(100))
+
+
+@pytest.mark.unit
+def test_handles():
+    policy = RetryPolicy()
+
+    assert policy.handles("GET", SolarNetworkError("Too many requests", 429))
+    assert policy.handles("GET", requests.ConnectionError())
+    assert policy.handles("POST", SolarNetworkError("Too many requests", 429))
+    assert not policy.handles("POST", SolarNetworkError("Server error", 500))
+    assert not policy.handles("GET", SolarNetworkError("Forbidden", 403))
+    assert not policy.handles("GET", ValueError("Bad JSON"))
+    assert not RetryPolicy(max_retries=0).handles("GET", requests.Timeout())
+
+
+@pytest.mark.unit
+def test_should_retry_again():
+    policy = RetryPolicy()
+
+    # An unsuccessful envelope in a 200 response is not retried by the client
+    assert policy.should_retry_again("GET", SolarNetworkError("Failed", 200))
+    assert not policy.should_retry_again("GET", SolarNetworkError("Throttled", 429))
+    assert policy.should_retry_again("POST", SolarNetworkError("Failed", 500))
+    assert not policy.should_retry_again("POST", SolarNetworkError("Denied", 403))
+    assert not is_transient(SolarNetworkError("Invalid", 422))
+    assert not is_transient(requests.exceptions.InvalidURL())
+
+
+@pytest.mark.unit
+def test_retry_after():
+    policy = RetryPolicy()
+    later = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    assert policy.retry_after(make_response(429, {"Retry-After": "7"})) == 7.0
+    assert (
+        25
+        < policy.retry_after(
+            make_response(429, {"Retry-After": format_datetime(later, usegmt=True)})
+        )
+        <= 30
+    )
+    assert policy.retry_after(make_response(429, {"Retry-After": "soon"})) is None
+    assert policy.retry_after(make_response(429, {"Retry-After": "86400"})) == 30.0
+    assert policy.retry_after(make_response(429)) is None
+
+
+@pytest.mark.unit
+def test_retries_throttled_requests_with_fresh_signatures(sleeps, monkeypatch):
+    client, sent = make_client(
+        [
+            make_response(429, {"Retry-After": "2"}),
+            make_response(503),
+            make_response(200),
+        ],
+        retry=RetryPolicy(jitter=False, backoff_factor=0.5),
+    )
+    signed = []
+    sign = client._signer.sign
+    monkeypatch.setattr(
+        client._signer, "sign", lambda *args: signed.append(args) or sign(*args)
+    )
+
+    response = client.request("GET", "/solarquery/api/v1/sec/nodes")
+
+    assert response.status_code == 200
+    assert len(sent) == 3
+    assert len(signed) == 3
+    assert sleeps == [2.0, 1.0]
+
+
+@pytest.mark.unit
+def test_retries_connection_errors(sleeps):
+    client, sent = make_client(
+        [requests.ConnectionError("reset"), make_response(200)],
+        retry=RetryPolicy(jitter=False),
+    )
+
+    assert client.request("GET", "/solarquery/api/v1/sec/nodes").status_code == 200
+    assert len(sleeps) == 1
+
+
+class CutShortBody(io.RawIOBase):
+    def read(self, size=-1):
+        raise requests.exceptions.ChunkedEncodingError("cut short")
+
+
+@pytest.mark.unit
+def test_retries_body_downloads_cut_short(sleeps):
+    cut_short = make_response(200)
+    cut_short._content = False
+    cut_short.raw = CutShortBody()
+    client, sent = make_client(
+        [cut_short, make_response(200)], retry=RetryPolicy(jitter=False)
+    )
+
+    response = client.request("GET", "/solarquery/api/v1/sec/nodes")
+
+    assert response.json() == {"success": True}
+    assert len(sent) == 2
+    assert len(sleeps) == 1
+
+
+@pytest.mark.unit
+def test_does_not_retry_non_idempotent_server_errors(sleeps):
+    client, sent = make_client([make_response(500), make_response(200)])
+
+    response = client.request("POST", "/solarquery/api/v1/sec/x", data={"a": 1})
+
+    assert response.status_code == 500
+    assert len(sent) == 1
+
+
+@pytest.mark.unit
+def test_gives_up_after_max_retries(sleeps):
+    client, sent = make_client(
+        [make_response(429) for _ in range(3)], retry=RetryPolicy(max_retries=2)
+    )
+
+    assert client.request("GET", "/solarquery/api/v1/sec/nodes").status_code == 429
+    assert len(sent) == 3
+
+
+@pytest.mark.unit
+def test_rate_limiter_adapts(sleeps):
+    limiter = AdaptiveRateLimiter(rate=10.0, min_rate=1.0, increase=1.0, cooldown=60)
+    client, _ = make_client(
+        [make_response(429), make_response(429), make_response(200)],
+        retry=RetryPolicy(jitter=False),
+        rate_limiter=limiter,
+    )
+
+    client.request("GET", "/solarquery/api/v1/sec/nodes")
+
+    # Two throttled responses within the cooldown halve the rate once
+    assert limiter.rate == 6.0
+
+
+@pytest.mark.unit
+def test_rate_limiter_paces_requests(monkeypatch):
+    clock = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr("time.monotonic", lambda: clock[0])
+    monkeypatch.setattr("time.sleep", sleep)
+    limiter = AdaptiveRateLimiter(rate=2.0, burst=1.0)
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert waits == [0.5, 0.5]
@@ -0,0 +1,165 @@
+from zoneinfo import ZoneInfo
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from wattmaven_solarnetwork_tools.core.datum_frame import DatumFrame
+from wattmaven_solarnetwork_tools.core.rollup import (
+    Rollup,
+    _local_ms,
+    bucket_starts,
+    is_accumulating,
+    rollup,
+)
+
+
+def _frame(rows):
+    return DatumFrame.from_records(
+        [
+            {
+                "created": created,
+                "nodeId": node_id,
+                "sourceId": source_id,
+                **samples,
+            }
+            for created, node_id, source_id, samples in rows
+        ]
+    )
+
+
+RAW = [
+    ("2025-01-01 00:00:00.000Z", 1, "/m/1", {"watts": 100, "wattHours": 1000}),
+    ("2025-01-01 00:30:00.000Z", 1, "/m/1", {"watts": 300, "wattHours": 1100}),
+    ("2025-01-01 01:00:00.000Z", 1, "/m/1", {"watts": 200, "wattHours": 1250}),
+    ("2025-01-01 00:15:00.000Z", 2, "/m/2", {"watts": 50}),
+]
+
+
+@pytest.mark.unit
+def test_is_accumulating():
+    assert is_accumulating("wattHours")
+    assert is_accumulating("wattHoursReverse")
+    assert not is_accumulating("watts")
+
+
+@pytest.mark.unit
+def test_rollup_statistics():
+    frame = rollup(_frame(RAW), "Hour")
+
+    assert frame.timestamps.astype(str).tolist() == [
+        "2025-01-01T00:00:00.000",
+        "2025-01-01T00:00:00.000",
+        "2025-01-01T01:00:00.000",
+    ]
+    assert frame.node_ids.tolist() == [1, 2, 1]
+    assert frame.source_ids.tolist() == ["/m/1", "/m/2", "/m/1"]
+    assert frame["watts"].tolist() == [200, 50, 200]
+    assert frame["watts_min"].tolist() == [100, 50, 200]
+    assert frame["watts_max"].tolist() == [300, 50, 200]
+    assert frame["watts_count"].tolist() == [2, 1, 1]
+
+    # The first reading has nothing to difference against
+    assert frame["wattHours"][0] == 100
+    assert frame["wattHours"][2] == 150
+    assert np.isnan(frame["wattHours"][1])
+    assert frame["wattHours_start"][0] == 1000
+    assert frame["wattHours_end"][0] == 1100
+
+
+@pytest.mark.unit
+def test_rollup_is_incremental():
+    engine = Rollup("Hour")
+    engine.update(_frame(RAW[:2]))
+    assert len(engine) == 1
+
+    # New rows extend the open bucket, and overlapping rows are skipped
+    assert engine.update(_frame(RAW)) == 2
+    incremental = engine.to_frame()
+    full = rollup(_frame(RAW), "Hour")
+
+    for name in full.columns:
+        np.testing.assert_array_equal(incremental[name], full[name])
+    assert engine.update(_frame(RAW)) == 0
+
+
+@pytest.mark.unit
+def test_rollup_orders_rows_within_an_update():
+    frame = rollup(_frame(list(reversed(RAW))), "Day")
+
+    assert frame["wattHours"].tolist()[0] == 250
+    assert frame["wattHours_start"].tolist()[0] == 1000
+
+
+@pytest.mark.unit
+def test_rollup_time_zone_days():
+    # Local midnight in Auckland (UTC+13 in January) is 11:00 UTC
+    frame = rollup(_frame(RAW), "Day", "Pacific/Auckland")
+
+    assert frame.timestamps.astype(str).tolist() == [
+        "2024-12-31T11:00:00.000",
+        "2024-12-31T11:00:00.000",
+    ]
+    assert frame["watts_count"].tolist() == [3, 1]
+
+
+@pytest.mark.unit
+def test_rollup_daylight_saving_day():
+    # New York springs forward on 2025-03-09, a 23 hour day
+    raw = [
+        ("2025-03-09 05:00:00.000Z", 1, "/m/1", {"watts": 1}),
+        ("2025-03-10 03:59:00.000Z", 1, "/m/1", {"watts": 1}),
+        ("2025-03-10 04:00:00.000Z", 1, "/m/1", {"watts": 1}),
+    ]
+    frame = rollup(_frame(raw), "Day", "America/New_York")
+
+    assert frame.timestamps.astype(str).tolist() == [
+        "2025-03-09T05:00:00.000",
+        "2025-03-10T04:00:00.000",
+    ]
+    assert frame["watts_count"].tolist() == [2, 1]
+
+
+@pytest.mark.unit
+def test_local_times_across_half_hour_daylight_saving():
+    # St. John's springs forward at 05:30 UTC, from UTC-3:30 to UTC-2:30
+    utc = np.array(["2025-03-09T05:15", "2025-03-09T05:45"], dtype="datetime64[ms]")
+    local = _local_ms(utc.astype(np.int64), ZoneInfo("America/St_Johns"))
+
+    assert local.astype("datetime64[ms]").astype(str).tolist() == [
+        "2025-03-09T01:45:00.000",
+        "2025-03-09T03:15:00.000",
+    ]
+
+
+@pytest.mark.unit
+def test_bucket_starts_calendar():
+    local = np.array(["2025-01-15T12:34", "2024-02-29T00:00"], dtype="datetime64[ms]")
+    local = local.astype(np.int64)
+
+    def starts(aggregation):
+        return (
+            bucket_starts(local, aggregation).astype("datetime64[ms]").astype(str)
+        ).tolist()
+
+    assert starts("FifteenMinute") == [
+        "2025-01-15T12:30:00.000",
+        "2024-02-29T00:00:00.000",
+    ]
+    # Weeks start on Monday
+    assert starts("Week") == ["2025-01-13T00:00:00.000", "2024-02-26T00:00:00.000"]
+    assert starts("Month") == ["2025-01-01T00:00:00.000", "2024-02-01T00:00:00.000"]
+    assert starts("Year") == ["2025-01-01T00:00:00.000", "2024-01-01T00:00:00.000"]
+
+
+@pytest.mark.unit
+def test_rollup_rejects_unknown_aggregation():
+    with pytest.raises(ValueError, match="Unsupported aggregation"):
+        Rollup("Fortnight")
+
+
+@pytest.mark.unit
+def test_rollup_empty():
+    engine = Rollup()
+    assert engine.update(DatumFrame.empty()) == 0
+    assert len(engine.to_frame()) == 0
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+    SolarNetworkError,
+)
+
+
+def make_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8")
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+@pytest.fixture
+def client():
+    with SolarNetworkClient(
+        SolarNetworkCredentials(token="test_token", secret="test_secret")
+    ) as client:
+        yield client
+
+
+@pytest.mark.unit
+def test_prepare_request_signs_the_sent_body(client):
+    prepared = client._prepare_request("POST", "/api/v1/data", data={"a": 1}).prepare()
+
+    assert prepared.body == b'{"a": 1}'
+    assert prepared.headers["Content-Type"] == "application/json"
+    assert prepared.headers["Authorization"].startswith(
+        "SNWS2 Credential=test_token,"
+        "SignedHeaders=accept;accept-encoding;host;x-sn-date,Signature="
+    )
+
+
+@pytest.mark.unit
+def test_iter_datum_pages_through_results(client, monkeypatch):
+    offsets = []
+
+    def send(prepared, **kwargs):
+        query = parse_qs(urlsplit(prepared.url).query)
+        offset, page_size = int(query["offset"][0]), int(query["max"][0])
+        offsets.append(offset)
+        results = [{"i": i} for i in range(offset, min(offset + page_size, 7))]
+        return make_response(
+            200,
+            {"success": True, "data": {"totalResults": 7, "results": results}},
+        )
+
+    monkeypatch.setattr(client._session, "send", send)
+
+    datum = list(client.iter_datum({"nodeId": 1}, page_size=3))
+
+    assert [d["i"] for d in datum] == list(range(7))
+    assert sorted(offsets) == [0, 3, 6]
+
+
+@pytest.mark.unit
+def test_iter_datum_raises_on_unsuccessful_response(client, monkeypatch):
+    monkeypatch.setattr(
+        client._session,
+        "send",
+        lambda prepared, **kwargs: make_response(
+            403, {"success": False, "message": "Access denied"}
+        ),
+    )
+
+    with pytest.raises(SolarNetworkError, match="Access denied") as e:
+        list(client.iter_datum({"nodeId": 1}))
+    assert e.value.status_code == 403
+
+
+@pytest.mark.unit
+def test_get_json_coalesces_identical_requests(monkeypatch):
+    client = SolarNetworkClient(
+        SolarNetworkCredentials(token="test_token", secret="test_secret"),
+        coalesce=True,
+    )
+    sent = []
+    release = threading.Event()
+
+    def send(prepared, **kwargs):
+        sent.append(prepared)
+        release.wait(timeout=5)
+        return make_response(200, {"success": True, "data": [1]})
+
+    monkeypatch.setattr(client._session, "send", send)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(client.get_json, "/nodes", {"a": 1, "b": 2}),
+            executor.submit(client.get_json, "/nodes", {"b": 2, "a": 1}),
+        ]
+        time.sleep(0.1)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert results[0] == {"success": True, "data": [1]}
+    assert results[1] is results[0]
+    assert len(sent) == 1
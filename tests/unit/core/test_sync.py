@@ -0,0 +1,143 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.records import parse_created
+from wattmaven_solarnetwork_tools.core.sync import (
+    CheckpointStore,
+    StreamKey,
+    SyncEngine,
+)
+
+STREAM = StreamKey(1, "/meter/1")
+
+
+class FakeClient:
+    """Serves one datum every 30 seconds from a fixed list."""
+
+    def __init__(self, count):
+        start = datetime(2025, 1, 1)
+        self.datum = [
+            {
+                "created": (start + timedelta(seconds=30 * i)).strftime(
+                    "%Y-%m-%d %H:%M:%S.000Z"
+                ),
+                "i": i,
+            }
+            for i in range(count)
+        ]
+        self.queries = []
+
+    def iter_datum_pages(self, params, page_size=1000, prefetch=1):
+        self.queries.append(params)
+        start = params["startDate"].replace("T", " ")
+        matching = [d for d in self.datum if d["created"] >= start]
+        for i in range(0, len(matching), page_size):
+            yield matching[i : i + page_size]
+
+
+@pytest.fixture
+def store():
+    with CheckpointStore(":memory:") as store:
+        yield store
+
+
+@pytest.mark.unit
+def test_sync_delivers_only_new_datum(store):
+    client = FakeClient(5)
+    delivered = []
+    engine = SyncEngine(
+        client,
+        store,
+        lambda stream, datum: delivered.extend(d["i"] for d in datum),
+        initial_start=datetime(2025, 1, 1),
+        page_size=2,
+    )
+
+    assert engine.sync([STREAM]) == {STREAM: 5}
+    assert store.get(STREAM) == parse_created("2025-01-01 00:02:00.000Z")
+
+    client.datum.extend(FakeClient(8).datum[5:])
+    assert engine.sync_stream(STREAM) == 3
+
+    assert delivered == list(range(8))
+    # The second sync started from the checkpoint's minute
+    assert client.queries[-1]["startDate"] == "2025-01-01T00:02"
+
+
+@pytest.mark.unit
+def test_sync_resumes_after_sink_failure(store):
+    client = FakeClient(6)
+    delivered = []
+
+    def failing_sink(stream, datum):
+        if datum[0]["i"] == 2:
+            raise RuntimeError("sink unavailable")
+        delivered.extend(d["i"] for d in datum)
+
+    engine = SyncEngine(
+        client, store, failing_sink, initial_start=datetime(2025, 1, 1), page_size=2
+    )
+
+    assert engine.sync([STREAM]) == {}
+    assert delivered == [0, 1]
+    assert store.get(STREAM) == parse_created("2025-01-01 00:00:30.000Z")
+
+    engine.sink = lambda stream, datum: delivered.extend(d["i"] for d in datum)
+    assert engine.sync([STREAM]) == {STREAM: 4}
+    assert delivered == list(range(6))
+
+
+@pytest.mark.unit
+def test_checkpoint_store_persists_and_never_moves_backwards(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+
+    with CheckpointStore(path) as store:
+        store.advance(STREAM, parse_created("2025-01-01 00:10:00.000Z"))
+        store.advance(STREAM, parse_created("2025-01-01 00:05:00.000Z"))
+
+    with CheckpointStore(path) as store:
+        assert store.all() == {STREAM: parse_created("2025-01-01 00:10:00.000Z")}
+
+
+@pytest.mark.unit
+def test_sync_orders_whole_seconds_before_their_fractions(store):
+    client = FakeClient(0)
+    # As text, "00:00:00Z" sorts after "00:00:00.500Z"
+    for created in [
+        "2025-01-01 00:00:00Z",
+        "2025-01-01 00:00:00.500Z",
+        "2025-01-01 00:00:01Z",
+    ]:
+        client.datum.append({"created": created, "i": len(client.datum)})
+    delivered = []
+    engine = SyncEngine(
+        client,
+        store,
+        lambda stream, datum: delivered.extend(d["i"] for d in datum),
+        initial_start=datetime(2025, 1, 1),
+        page_size=1,
+    )
+
+    assert engine.sync_stream(STREAM) == 3
+    assert delivered == [0, 1, 2]
+    assert store.get(STREAM) == parse_created("2025-01-01 00:00:01Z")
+
+
+@pytest.mark.unit
+def test_checkpoint_store_converts_string_checkpoints(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE checkpoints (node_id INTEGER NOT NULL, "
+            "source_id TEXT NOT NULL, last_created TEXT NOT NULL, "
+            "PRIMARY KEY (node_id, source_id))"
+        )
+        conn.execute(
+            "INSERT INTO checkpoints VALUES (1, '/meter/1', '2025-01-01 00:10:00Z')"
+        )
+    conn.close()
+
+    with CheckpointStore(path) as store:
+        assert store.all() == {STREAM: parse_created("2025-01-01 00:10:00Z")}
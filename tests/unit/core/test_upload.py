@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from wattmaven_solarnetwork_tools.core.retry import RetryPolicy
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+    SolarNetworkError,
+)
+from wattmaven_solarnetwork_tools.core.upload import (
+    encode_datum_chunks,
+    upload_datum,
+)
+from wattmaven_solarnetwork_tools.testing.stub_server import StubServer
+
+UPLOAD_PATH = "/solarin/api/v1/sec/datum"
+
+
+def make_datum(count):
+    return [
+        {
+            "nodeId": 1,
+            "sourceId": "/meter/1",
+            "created": f"2025-01-01 00:{i // 60:02d}:{i % 60:02d}.000Z",
+            "i": {"watts": i},
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+def test_encode_datum_chunks_bounds_chunk_size():
+    datum = make_datum(500)
+
+    chunks = list(encode_datum_chunks(datum, max_chunk_bytes=4096))
+
+    assert len(chunks) > 1
+    assert all(len(body) <= 4096 for _, body in chunks)
+    assert sum(count for count, _ in chunks) == 500
+    decoded = [d for _, body in chunks for d in json.loads(body)]
+    assert decoded == datum
+
+
+@pytest.mark.unit
+def test_encode_datum_chunks_sends_oversized_datum_alone():
+    datum = [{"a": 1}, {"a": "x" * 100}, {"a": 2}]
+
+    chunks = list(encode_datum_chunks(datum, max_chunk_bytes=20))
+
+    assert [count for count, _ in chunks] == [1, 1, 1]
+    assert list(encode_datum_chunks([], 20)) == []
+    with pytest.raises(ValueError):
+        list(encode_datum_chunks(datum, 0))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("compress", [True, False])
+def test_upload_datum(stub_server, stub_credentials, compress):
+    datum = make_datum(2000)
+
+    with SolarNetworkClient(stub_credentials) as client:
+        result = upload_datum(
+            client,
+            UPLOAD_PATH,
+            iter(datum),
+            max_chunk_bytes=16 * 1024,
+            compress=compress,
+            max_workers=3,
+        )
+
+    assert result.datum == 2000
+    assert result.chunks == len(stub_server.uploads) > 1
+    if compress:
+        assert result.bytes_sent < result.bytes_encoded / 4
+    else:
+        assert result.bytes_sent == result.bytes_encoded
+
+    received = sorted(
+        (d for path, chunk in stub_server.uploads for d in chunk),
+        key=lambda d: d["i"]["watts"],
+    )
+    assert received == datum
+    assert {path for path, _ in stub_server.uploads} == {UPLOAD_PATH}
+
+
+@pytest.mark.unit
+def test_upload_datum_retries_failed_chunks():
+    datum = make_datum(1000)
+
+    with StubServer(error_rate=0.3, seed=3) as server:
+        with SolarNetworkClient(
+            server.credentials(), retry=RetryPolicy(max_retries=0)
+        ) as client:
+            result = upload_datum(
+                client,
+                UPLOAD_PATH,
+                datum,
+                max_chunk_bytes=8 * 1024,
+                retries=10,
+                retry_delay=0,
+            )
+
+    assert result.datum == 1000
+    assert server.request_count > result.chunks
+    received = {d["created"] for _, chunk in server.uploads for d in chunk}
+    assert len(received) == 1000
+
+
+@pytest.mark.unit
+def test_upload_datum_raises_after_retries():
+    with StubServer(error_rate=1.0) as server:
+        with SolarNetworkClient(server.credentials()) as client:
+            with pytest.raises(SolarNetworkError):
+                upload_datum(
+                    client, UPLOAD_PATH, make_datum(10), retries=1, retry_delay=0
+                )
+
+    assert server.request_count == 2
+
+
+@pytest.mark.unit
+def test_upload_datum_does_not_repeat_client_retries():
+    with StubServer(throttle_rate=1.0, retry_after=0) as server:
+        retry = RetryPolicy(max_retries=2, backoff_factor=0, jitter=False)
+        with SolarNetworkClient(server.credentials(), retry=retry) as client:
+            with pytest.raises(SolarNetworkError):
+                upload_datum(
+                    client, UPLOAD_PATH, make_datum(10), retries=5, retry_delay=0
+                )
+
+    # The client retried the throttled chunk; the upload did not again
+    assert server.request_count == 3
+
+
+@pytest.mark.unit
+def test_upload_datum_does_not_resend_rejected_chunks():
+    with StubServer() as server:
+        credentials = server.credentials()
+        credentials = SolarNetworkCredentials(
+            token=credentials.token,
+            secret="wrong",
+            host=credentials.host,
+            scheme=credentials.scheme,
+        )
+        with SolarNetworkClient(credentials) as client:
+            with pytest.raises(SolarNetworkError) as e:
+                upload_datum(client, UPLOAD_PATH, make_datum(10), retry_delay=0)
+
+    assert 400 <= e.value.status_code < 500
+    assert server.request_count == 1
@@ -0,0 +1,93 @@
+import pytest
+
+from wattmaven_solarnetwork_tools.core.pagination import DATUM_LIST_PATH
+from wattmaven_solarnetwork_tools.core.records import NODES_PATH
+from wattmaven_solarnetwork_tools.core.retry import RetryPolicy
+from wattmaven_solarnetwork_tools.core.solarnetwork_client import (
+    SolarNetworkClient,
+    SolarNetworkCredentials,
+)
+from wattmaven_solarnetwork_tools.testing.stub_server import StubServer
+
+PARAMS = {
+    "nodeId": 1,
+    "sourceId": "*/**",
+    "startDate": "2025-01-01",
+    "endDate": "2025-01-02",
+}
+
+
+@pytest.mark.unit
+def test_get_nodes(stub_credentials):
+    with SolarNetworkClient(stub_credentials) as client:
+        response = client.request("GET", NODES_PATH)
+
+    assert response.status_code == 200
+    assert response.json() == {"success": True, "data": [1, 2, 3]}
+
+
+@pytest.mark.unit
+def test_rejects_invalid_signatures(stub_server):
+    credentials = SolarNetworkCredentials(
+        token="test-token", secret="wrong", host=stub_server.host, scheme="http"
+    )
+
+    with SolarNetworkClient(credentials) as client:
+        response = client.request("GET", NODES_PATH)
+
+    assert response.status_code == 403
+    assert response.json()["message"] == "Invalid signature"
+
+
+@pytest.mark.unit
+def test_datum_list_paginates(stub_credentials):
+    with SolarNetworkClient(stub_credentials) as client:
+        datum = list(client.iter_datum(PARAMS, page_size=100))
+        page = client.request("GET", DATUM_LIST_PATH, {**PARAMS, "max": 10}).json()
+
+    # Two sources, one datum every 5 minutes for a day
+    assert len(datum) == 2 * 288
+    assert page["data"]["totalResults"] == 2 * 288
+    assert [d["created"] for d in datum[:4]] == [
+        "2025-01-01 00:00:00.000Z",
+        "2025-01-01 00:00:00.000Z",
+        "2025-01-01 00:05:00.000Z",
+        "2025-01-01 00:05:00.000Z",
+    ]
+    assert {d["sourceId"] for d in datum} == {"/meter/1", "/inverter/1"}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("prefetch", [0, 1])
+def test_datum_list_pages_past_a_capped_page_size(prefetch):
+    with StubServer(max_page_size=50) as server:
+        with SolarNetworkClient(server.credentials()) as client:
+            pages = list(client.iter_datum_pages(PARAMS, 100, prefetch=prefetch))
+
+    # Short pages are not the last while the total says more remain
+    assert [len(page) for page in pages[:2]] == [50, 50]
+    assert sum(len(page) for page in pages) == 2 * 288
+
+
+@pytest.mark.unit
+def test_datum_list_csv(stub_credentials):
+    with SolarNetworkClient(stub_credentials) as client:
+        rows = list(client.iter_csv(DATUM_LIST_PATH, {**PARAMS, "max": 5}))
+        json_rows = client.request("GET", DATUM_LIST_PATH, {**PARAMS, "max": 5}).json()[
+            "data"
+        ]["results"]
+
+    assert len(rows) == 5
+    assert [r["watts"] for r in rows] == [str(r["watts"]) for r in json_rows]
+
+
+@pytest.mark.unit
+def test_injected_throttling_is_retried():
+    with StubServer(throttle_rate=0.5, retry_after=0, seed=1) as server:
+        with SolarNetworkClient(
+            server.credentials(), retry=RetryPolicy(max_retries=10, backoff_factor=0)
+        ) as client:
+            for _ in range(5):
+                assert client.request("GET", NODES_PATH).status_code == 200
+
+    assert server.request_count > 5